@@ -0,0 +1,30 @@
+import argparse
+import sys
+
+from girman_asgmt_app.benchmarks.run import BENCHMARKS, DEFAULT_SIZES, compare, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m girman_asgmt_app.benchmarks",
+        description="Microbenchmarks of the app's hooks against an in-process frappe stub.",
+    )
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative wall-time growth")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc (cleaner timings)")
+    args = parser.parse_args(argv)
+
+    results = run(sizes=args.sizes, only=args.only, output=args.output, memory=not args.no_memory)
+    if args.compare:
+        regressions = compare(args.compare, results, time_threshold=args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
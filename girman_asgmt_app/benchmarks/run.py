@@ -0,0 +1,280 @@
+"""
+Benchmark runner for the payroll, tax regime and Employee lifecycle hooks.
+
+Each benchmark is a (setup, body) pair; only the body is measured. For every workforce
+size the runner records wall time, the number of database queries and (optionally) the
+peak Python memory allocated during the body, and can write the results as JSON so runs
+can be compared with `compare`.
+
+Stub mode (no site needed):
+    python -m girman_asgmt_app.benchmarks --sizes 1000 10000 --output bench.json
+
+Site mode (synthetic data is inserted and rolled back afterwards):
+    bench --site <site> execute girman_asgmt_app.benchmarks.run.run_on_site \
+        --kwargs "{'sizes': [1000], 'output': '/tmp/bench.json'}"
+"""
+import datetime
+import json
+import platform
+import time
+import tracemalloc
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+
+# ----------------------------
+# Benchmarks
+# ----------------------------
+def _slip_docs(ctx):
+    import frappe
+
+    return [frappe.get_doc(dict(ss)) for ss in ctx.workforce["slips"]]
+
+
+def _employee_docs(ctx):
+    import frappe
+
+    return [frappe.get_doc(dict(e)) for e in ctx.workforce["employees"]]
+
+
+def bench_adjust_salary_slip_with_investments(ctx, slips):
+    from girman_asgmt_app.events.payroll import adjust_salary_slip_with_investments
+
+    for ss in slips:
+        adjust_salary_slip_with_investments(ss)
+
+
+def bench_set_salary_structure_for_employee(ctx, slips):
+    from girman_asgmt_app.events.tax_regime import set_salary_structure_for_employee
+
+    for ss in slips:
+        set_salary_structure_for_employee(ss)
+
+
+def bench_salary_slip_hook_chain(ctx, slips):
+    """validate + before_save for every slip, validated twice as a re-save would."""
+    from girman_asgmt_app.events.payroll import adjust_salary_slip_with_investments
+    from girman_asgmt_app.events.tax_regime import (
+        ensure_salary_structure_matches_regime,
+        set_salary_structure_for_employee,
+    )
+
+    for ss in slips:
+        for _ in range(2):
+            ss.salary_structure = None
+            ensure_salary_structure_matches_regime(ss)
+            adjust_salary_slip_with_investments(ss)
+        set_salary_structure_for_employee(ss)
+
+
+def bench_ensure_payroll_slips_match_regime(ctx, payroll_doc):
+    from girman_asgmt_app.events.tax_regime import ensure_payroll_slips_match_regime
+
+    ensure_payroll_slips_match_regime(payroll_doc)
+
+
+def _payroll_doc(ctx):
+    import frappe
+
+    return frappe.get_doc({
+        "doctype": "Payroll Entry",
+        "name": ctx.workforce["payroll_entry"],
+        "company": ctx.workforce["company"],
+        "employees": [{"employee": e["name"]} for e in ctx.workforce["employees"]],
+    })
+
+
+def bench_employee_lifecycle_hooks(ctx, employees):
+    from girman_asgmt_app.events.employee import (
+        on_employee_after_insert,
+        on_employee_after_save,
+        on_employee_on_update,
+    )
+
+    for doc in employees:
+        on_employee_after_insert(doc)
+        on_employee_on_update(doc)
+        on_employee_after_save(doc)
+
+
+def bench_tax_regime_comparison(ctx, filters):
+    from girman_asgmt_app.girman_asgmt_app.report.tax_regime_comparison.tax_regime_comparison import execute
+
+    execute(filters)
+
+
+def _comparison_filters(ctx):
+    return {
+        "from_date": ctx.workforce["start_date"],
+        "to_date": ctx.workforce["end_date"],
+        "company": ctx.workforce["company"],
+    }
+
+
+BENCHMARKS = {
+    "adjust_salary_slip_with_investments": (_slip_docs, bench_adjust_salary_slip_with_investments),
+    "set_salary_structure_for_employee": (_slip_docs, bench_set_salary_structure_for_employee),
+    "salary_slip_hook_chain": (_slip_docs, bench_salary_slip_hook_chain),
+    "ensure_payroll_slips_match_regime": (_payroll_doc, bench_ensure_payroll_slips_match_regime),
+    "employee_lifecycle_hooks": (_employee_docs, bench_employee_lifecycle_hooks),
+    "tax_regime_comparison.execute": (_comparison_filters, bench_tax_regime_comparison),
+}
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+class _Context(dict):
+    __getattr__ = dict.get
+
+
+def _query_counter(mode):
+    """Return (read_count, restore) for the active backend."""
+    if mode == "stub":
+        from girman_asgmt_app.benchmarks import stub
+
+        return (lambda: stub.STATS["queries"]), (lambda: None)
+
+    import frappe
+
+    count = [0]
+    original = frappe.db.sql
+
+    def counting_sql(*args, **kwargs):
+        count[0] += 1
+        return original(*args, **kwargs)
+
+    frappe.db.sql = counting_sql
+
+    def restore():
+        frappe.db.sql = original
+
+    return (lambda: count[0]), restore
+
+
+def measure(body, ctx, state, read_queries, memory=True):
+    """Run body once and return wall time, query count and peak traced memory."""
+    if memory:
+        tracemalloc.start()
+    queries_before = read_queries()
+    started = time.perf_counter()
+    try:
+        body(ctx, state)
+    finally:
+        wall = time.perf_counter() - started
+        queries = read_queries() - queries_before
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+        if memory:
+            tracemalloc.stop()
+
+    size = ctx.workforce["size"]
+    return {
+        "wall_time_s": round(wall, 6),
+        "per_employee_ms": round(wall * 1000 / size, 6) if size else None,
+        "queries": queries,
+        "queries_per_employee": round(queries / size, 4) if size else None,
+        "peak_memory_kb": round(peak / 1024, 1) if peak is not None else None,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, mode="stub", only=None, output=None, memory=True, seed=42):
+    """
+    Run the selected benchmarks (all by default) for each workforce size.
+    Returns the results dict and writes it to `output` when given.
+    """
+    if mode == "stub":
+        from girman_asgmt_app.benchmarks import stub
+
+        stub.install()
+    elif mode != "site":
+        raise ValueError(f"Unknown benchmark mode: {mode}")
+
+    from girman_asgmt_app.benchmarks import workforce as wf
+
+    selected = {k: v for k, v in BENCHMARKS.items() if not only or k in only}
+    results = {
+        "mode": mode,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "memory_traced": memory,
+        "sizes": {},
+    }
+
+    for size in sizes:
+        workforce = wf.generate(int(size), seed=seed)
+        size_results = results["sizes"][str(size)] = {}
+        for name, (setup, body) in selected.items():
+            ctx = _Context(workforce=workforce, mode=mode)
+            if mode == "stub":
+                wf.load_into_stub(workforce)
+            else:
+                wf.load_into_site(workforce)
+            read_queries, restore = _query_counter(mode)
+            try:
+                state = setup(ctx)
+                size_results[name] = measure(body, ctx, state, read_queries, memory=memory)
+            finally:
+                restore()
+                if mode == "site":
+                    import frappe
+
+                    frappe.db.rollback()
+                    frappe.clear_cache()
+            print(f"{size:>7} {name:<40} {_fmt(size_results[name])}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=1, default=str)
+    return results
+
+
+def run_on_site(sizes=(1000,), only=None, output=None, memory=True, seed=42):
+    """
+    Entry point for `bench execute`. Synthetic rows are inserted without committing and
+    rolled back after every benchmark; commits issued by the hooks are suppressed.
+    """
+    import frappe
+
+    original_commit = frappe.db.commit
+    frappe.db.commit = lambda *args, **kwargs: None
+    try:
+        return run(sizes=sizes, mode="site", only=only, output=output, memory=memory, seed=seed)
+    finally:
+        frappe.db.commit = original_commit
+        frappe.db.rollback()
+
+
+def _fmt(m):
+    mem = f"{m['peak_memory_kb']:>10.1f} KiB" if m["peak_memory_kb"] is not None else ""
+    return f"{m['wall_time_s']:>10.3f}s {m['queries']:>9} queries {mem}"
+
+
+# ----------------------------
+# Comparison
+# ----------------------------
+def compare(baseline, current, time_threshold=0.10):
+    """
+    Compare two result files (paths or dicts). Reports a regression when wall time grows by
+    more than time_threshold (relative) or when the query count grows at all.
+    Returns a list of human-readable regression lines (empty when there are none).
+    """
+    def load(x):
+        if isinstance(x, dict):
+            return x
+        with open(x) as f:
+            return json.load(f)
+
+    baseline, current = load(baseline), load(current)
+    regressions = []
+    for size, benches in current["sizes"].items():
+        for name, now in benches.items():
+            before = baseline.get("sizes", {}).get(size, {}).get(name)
+            if not before:
+                continue
+            if before["wall_time_s"] and now["wall_time_s"] > before["wall_time_s"] * (1 + time_threshold):
+                regressions.append(
+                    f"{name} @ {size}: wall time {before['wall_time_s']:.3f}s -> {now['wall_time_s']:.3f}s"
+                )
+            if now["queries"] > before["queries"]:
+                regressions.append(f"{name} @ {size}: queries {before['queries']} -> {now['queries']}")
+    return regressions
@@ -0,0 +1,753 @@
+"""
+In-process stand-in for the parts of the frappe API the app's hooks and reports call.
+
+It is only meant for fast microbenchmarks: tables live in dicts, every call that would
+hit the database increments STATS["queries"], and equality filters are served from
+lazily built per-field indexes so lookups cost roughly what an indexed query would.
+Raw SQL (frappe.db.sql) is counted but not interpreted and returns no rows.
+
+install() registers the stub as `frappe` in sys.modules and must run before any
+girman_asgmt_app module is imported.
+"""
+import datetime
+import json
+import math
+import sys
+import types
+from collections import defaultdict
+
+STATS = {"queries": 0, "commits": 0}
+
+
+class _dict(dict):
+    def __getattr__(self, key):
+        if key.startswith("__"):
+            raise AttributeError(key)
+        return self.get(key)
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        del self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        return self
+
+    def copy(self):
+        return _dict(self)
+
+
+class ValidationError(Exception):
+    pass
+
+
+class PermissionError(Exception):
+    pass
+
+
+class UniqueValidationError(ValidationError):
+    pass
+
+
+class DoesNotExistError(ValidationError):
+    pass
+
+
+# ----------------------------
+# frappe.utils
+# ----------------------------
+def getdate(value=None):
+    if value is None or value == "":
+        return datetime.date.today()
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def add_days(value, days):
+    return getdate(value) + datetime.timedelta(days=days)
+
+
+def add_months(value, months):
+    d = getdate(value)
+    month = d.month - 1 + months
+    year = d.year + month // 12
+    month = month % 12 + 1
+    return datetime.date(year, month, min(d.day, _days_in_month(year, month)))
+
+
+def _days_in_month(year, month):
+    nxt = datetime.date(year + month // 12, month % 12 + 1, 1)
+    return (nxt - datetime.timedelta(days=1)).day
+
+
+def add_to_date(value, days=0, minutes=0, **kwargs):
+    value = value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(str(value))
+    return value + datetime.timedelta(days=days, minutes=minutes)
+
+
+def get_last_day(value):
+    d = getdate(value)
+    return datetime.date(d.year, d.month, _days_in_month(d.year, d.month))
+
+
+def flt(value, precision=None):
+    try:
+        value = float(value or 0)
+    except (TypeError, ValueError):
+        value = 0.0
+    return round(value, precision) if precision is not None else value
+
+
+def cint(value):
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def rounded(value, precision=0):
+    return round(flt(value), precision)
+
+
+def nowdate():
+    return datetime.date.today().isoformat()
+
+
+def today():
+    return nowdate()
+
+
+def now():
+    return datetime.datetime.now().isoformat(sep=" ")
+
+
+def fmt_money(value, *args, **kwargs):
+    return f"{flt(value):,.2f}"
+
+
+# ----------------------------
+# Storage
+# ----------------------------
+class Table:
+    """Rows of one doctype keyed by name, with lazily built equality indexes."""
+
+    def __init__(self):
+        self.rows = {}
+        self.indexes = {}
+
+    def index(self, field):
+        if field not in self.indexes:
+            idx = defaultdict(set)
+            for name, row in self.rows.items():
+                idx[row.get(field)].add(name)
+            self.indexes[field] = idx
+        return self.indexes[field]
+
+    def put(self, row):
+        old = self.rows.get(row["name"])
+        for field, idx in self.indexes.items():
+            if old is not None:
+                idx[old.get(field)].discard(row["name"])
+            idx[row.get(field)].add(row["name"])
+        self.rows[row["name"]] = row
+
+    def update(self, name, values):
+        row = self.rows.get(name)
+        if row is None:
+            return
+        for field, value in values.items():
+            if field in self.indexes:
+                self.indexes[field][row.get(field)].discard(name)
+                self.indexes[field][value].add(name)
+            row[field] = value
+
+    def remove(self, name):
+        row = self.rows.pop(name, None)
+        if row is not None:
+            for field, idx in self.indexes.items():
+                idx[row.get(field)].discard(name)
+
+
+class Store:
+    def __init__(self):
+        self.tables = defaultdict(Table)
+        self.singles = defaultdict(_dict)
+        self.counter = 0
+
+    def table(self, doctype):
+        return self.tables[doctype]
+
+    def insert(self, doctype, row):
+        row = _dict(row)
+        if not row.get("name"):
+            self.counter += 1
+            row["name"] = f"{doctype}-{self.counter:08d}"
+        self.table(doctype).put(row)
+        return row
+
+
+store = Store()
+
+
+def reset():
+    """Drop all data and counters (between benchmark sizes)."""
+    global store
+    store = Store()
+    _cache.clear()
+    _doc_cache.clear()
+    flags.clear()
+    STATS.update(queries=0, commits=0)
+
+
+# ----------------------------
+# Query engine
+# ----------------------------
+def _normalize_filters(filters):
+    if not filters:
+        return []
+    if isinstance(filters, dict):
+        out = []
+        for field, cond in filters.items():
+            if isinstance(cond, list | tuple) and len(cond) == 2 and isinstance(cond[0], str):
+                out.append((field, cond[0], cond[1]))
+            else:
+                out.append((field, "=", cond))
+        return out
+    out = []
+    for f in filters:
+        f = list(f)
+        if len(f) == 4:
+            f = f[1:]
+        out.append(tuple(f))
+    return out
+
+
+def _is_set(value):
+    return value not in (None, "")
+
+
+def _match(row, field, op, value):
+    current = row.get(field)
+    op = op.lower()
+    if op == "=":
+        return current == value
+    if op == "!=":
+        return current != value
+    if op == "in":
+        return current in value
+    if op == "not in":
+        return current not in value
+    if op == "is":
+        return _is_set(current) if value == "set" else not _is_set(current)
+    if op == "like":
+        needle = str(value).strip("%")
+        return needle in str(current or "")
+    if current is None:
+        return False
+    current, value = _comparable(current, value)
+    if op == ">":
+        return current > value
+    if op == "<":
+        return current < value
+    if op == ">=":
+        return current >= value
+    if op == "<=":
+        return current <= value
+    if op == "between":
+        lo, hi = (_comparable(current, v)[1] for v in value)
+        return lo <= current <= hi
+    raise NotImplementedError(op)
+
+
+def _comparable(current, value):
+    if isinstance(current, datetime.date) and not isinstance(value, list | tuple):
+        return current, getdate(value)
+    if isinstance(current, str) and isinstance(value, datetime.date):
+        return getdate(current), value
+    return current, value
+
+
+def _candidates(table, conditions):
+    """Rows that can match, taken from the most selective equality / IN index."""
+    best = None
+    for field, op, value in conditions:
+        if op == "=":
+            names = table.index(field).get(value, set())
+        elif op == "in":
+            idx = table.index(field)
+            names = set().union(*(idx.get(v, set()) for v in set(value))) if value else set()
+        else:
+            continue
+        if best is None or len(names) < len(best):
+            best = names
+    if best is None:
+        return list(table.rows.values())
+    return [table.rows[n] for n in best]
+
+
+def _parse_field(field):
+    field = field.strip()
+    alias = None
+    if " as " in field:
+        field, alias = (p.strip() for p in field.split(" as ", 1))
+    agg = None
+    if "(" in field:
+        agg, field = field[:-1].split("(", 1)
+        agg = agg.lower()
+    return field, alias or field, agg
+
+
+def get_all(
+    doctype,
+    filters=None,
+    fields=None,
+    or_filters=None,
+    order_by=None,
+    group_by=None,
+    limit_page_length=None,
+    limit=None,
+    pluck=None,
+    as_list=False,
+    **kwargs,
+):
+    STATS["queries"] += 1
+    table = store.table(doctype)
+    conditions = _normalize_filters(filters)
+    rows = [r for r in _candidates(table, conditions) if all(_match(r, *c) for c in conditions)]
+    if or_filters:
+        ors = _normalize_filters(or_filters)
+        rows = [r for r in rows if any(_match(r, *c) for c in ors)]
+
+    if pluck:
+        fields = [pluck]
+    if fields == ["*"]:
+        rows = [_dict(r) for r in rows]
+        fields = None
+        parsed = []
+    else:
+        parsed = [_parse_field(f) for f in (fields or ["name"])]
+
+    if group_by or any(agg for _f, _a, agg in parsed):
+        groups = defaultdict(list)
+        for r in rows:
+            groups[r.get(group_by) if group_by else None].append(r)
+        out = []
+        for members in groups.values():
+            res = _dict()
+            for field, alias, agg in parsed:
+                if agg == "sum":
+                    res[alias] = sum(flt(m.get(field)) for m in members)
+                elif agg == "count":
+                    res[alias] = len(members)
+                else:
+                    res[alias] = members[0].get(field)
+            out.append(res)
+        rows = out
+    elif parsed:
+        rows = [_dict({alias: r.get(field) for field, alias, _agg in parsed}) for r in rows]
+
+    if order_by:
+        key, _sep, direction = order_by.partition(" ")
+        rows.sort(key=lambda r: (r.get(key) is None, r.get(key)), reverse=direction.strip().lower() == "desc")
+
+    limit = limit_page_length or limit
+    if limit:
+        rows = rows[: int(limit)]
+    if pluck:
+        return [r[pluck] for r in rows]
+    if as_list:
+        return [tuple(r.values()) for r in rows]
+    return rows
+
+
+class _Callbacks(list):
+    def add(self, fn):
+        self.append(fn)
+
+    def run(self):
+        while self:
+            self.pop(0)()
+
+
+class Database:
+    db_type = "mariadb"
+
+    def __init__(self):
+        self.after_commit = _Callbacks()
+        self.before_commit = _Callbacks()
+        self.after_rollback = _Callbacks()
+
+    def sql(self, query, values=None, as_dict=False, **kwargs):
+        STATS["queries"] += 1
+        return []
+
+    def _filters(self, doctype, filters):
+        if isinstance(filters, str):
+            return {"name": filters}
+        return filters
+
+    def get_value(self, doctype, filters=None, fieldname="name", as_dict=False, **kwargs):
+        STATS["queries"] += 1
+        conditions = _normalize_filters(self._filters(doctype, filters))
+        candidates = _candidates(store.table(doctype), conditions)
+        row = next((r for r in candidates if all(_match(r, *c) for c in conditions)), None)
+        if row is None:
+            return None
+        if isinstance(fieldname, list | tuple):
+            values = _dict({f: row.get(f) for f in fieldname})
+            return values if as_dict else tuple(values.values())
+        return row.get(fieldname)
+
+    def get_single_value(self, doctype, field):
+        STATS["queries"] += 1
+        return store.singles[doctype].get(field)
+
+    def exists(self, doctype, filters=None):
+        return self.get_value(doctype, filters, "name")
+
+    def set_value(self, doctype, name, field, value=None, update_modified=True):
+        STATS["queries"] += 1
+        values = field if isinstance(field, dict) else {field: value}
+        store.table(doctype).update(name, values)
+
+    def bulk_update(self, doctype, doc_updates, chunk_size=100, update_modified=True, **kwargs):
+        STATS["queries"] += math.ceil(len(doc_updates) / chunk_size) if doc_updates else 0
+        for name, values in doc_updates.items():
+            store.table(doctype).update(name, values)
+
+    def bulk_insert(self, doctype, fields, values, ignore_duplicates=False, *, chunk_size=10_000):
+        values = list(values)
+        STATS["queries"] += math.ceil(len(values) / chunk_size) if values else 0
+        for row in values:
+            store.insert(doctype, dict(zip(fields, row, strict=True)))
+
+    def delete(self, doctype, filters=None):
+        STATS["queries"] += 1
+        conditions = _normalize_filters(filters)
+        table = store.table(doctype)
+        for row in [r for r in _candidates(table, conditions) if all(_match(r, *c) for c in conditions)]:
+            table.remove(row["name"])
+
+    def get_table_columns(self, doctype):
+        STATS["queries"] += 1
+        columns = set()
+        for row in store.table(doctype).rows.values():
+            columns.update(row)
+        return list(columns)
+
+    def has_column(self, doctype, column):
+        return column in self.get_table_columns(doctype)
+
+    def commit(self):
+        STATS["commits"] += 1
+        self.before_commit.run()
+        self.after_commit.run()
+        self.after_rollback.clear()
+
+    def rollback(self):
+        self.after_commit.clear()
+        self.before_commit.clear()
+        self.after_rollback.run()
+
+    def get_global(self, key):
+        return get_default(key)
+
+    def set_global(self, key, value):
+        store.singles["__defaults"][key] = value
+
+
+def get_default(key):
+    STATS["queries"] += 1
+    return store.singles["__defaults"].get(key)
+
+
+db = Database()
+
+
+# ----------------------------
+# Documents
+# ----------------------------
+TABLE_FIELDS = {
+    "Salary Slip": ("earnings", "deductions"),
+    "Salary Structure": ("earnings", "deductions"),
+    "Payroll Entry": ("employees",),
+}
+
+
+class Document(_dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for field in TABLE_FIELDS.get(self.get("doctype"), ()):
+            self[field] = [self._child(field, r) for r in self.get(field) or []]
+        dict.__setitem__(self, "flags", _dict())
+
+    def _child(self, field, row):
+        row = row if isinstance(row, Document) else Document(row)
+        row.setdefault("doctype", "Salary Detail")
+        row["parent"] = self.get("name")
+        row["parentfield"] = field
+        row["parenttype"] = self.get("doctype")
+        return row
+
+    def set(self, field, value):
+        if field in TABLE_FIELDS.get(self.get("doctype"), ()):
+            value = [self._child(field, r) for r in value or []]
+        self[field] = value
+
+    def append(self, field, row=None):
+        row = self._child(field, row or {})
+        self.setdefault(field, []).append(row)
+        return row
+
+    def as_dict(self):
+        return _dict({k: v for k, v in self.items() if k != "flags"})
+
+    @property
+    def meta(self):
+        return get_meta(self.get("doctype"))
+
+    def db_set(self, field, value=None, update_modified=True, **kwargs):
+        values = field if isinstance(field, dict) else {field: value}
+        self.update(values)
+        db.set_value(self.doctype, self.name, values)
+
+    def db_insert(self, *args, **kwargs):
+        STATS["queries"] += 1
+        store.insert(self.doctype, self.as_dict())
+
+    def insert(self, ignore_permissions=False, **kwargs):
+        STATS["queries"] += 1
+        row = store.insert(self.doctype, self.as_dict())
+        self["name"] = row["name"]
+        return self
+
+    def save(self, *args, **kwargs):
+        STATS["queries"] += 1
+        store.table(self.doctype).put(_dict(self.as_dict()))
+        return self
+
+    def delete(self, *args, **kwargs):
+        db.delete(self.doctype, {"name": self.name})
+
+    def get_doc_before_save(self):
+        return None
+
+    def is_permitted(self):
+        return True
+
+
+class Meta(_dict):
+    def get_field(self, fieldname):
+        return _dict(fieldname=fieldname, label=fieldname.replace("_", " ").title())
+
+
+def get_meta(doctype):
+    return Meta(name=doctype, fields=[])
+
+
+def get_doc(arg, name=None, **kwargs):
+    if isinstance(arg, dict):
+        return Document(arg)
+    doctype = arg
+    STATS["queries"] += 1
+    row = store.table(doctype).rows.get(name)
+    if row is None:
+        raise DoesNotExistError(f"{doctype} {name} not found")
+    doc = Document(row)
+    if doctype in TABLE_FIELDS:
+        for field in TABLE_FIELDS[doctype]:
+            doc[field] = [
+                doc._child(field, r)
+                for r in get_all("Salary Detail", filters={"parent": name, "parentfield": field}, fields=["*"])
+            ]
+    return doc
+
+
+_doc_cache = {}
+
+
+def get_cached_doc(doctype, name):
+    key = (doctype, name)
+    if key not in _doc_cache:
+        _doc_cache[key] = get_doc(doctype, name)
+    return _doc_cache[key]
+
+
+def get_single(doctype):
+    STATS["queries"] += 1
+    return Document(store.singles[doctype], doctype=doctype, name=doctype)
+
+
+def get_value(*args, **kwargs):
+    return db.get_value(*args, **kwargs)
+
+
+# ----------------------------
+# Cache
+# ----------------------------
+_cache = {}
+
+
+class Cache:
+    def get_value(self, key, generator=None, **kwargs):
+        if key not in _cache and generator:
+            _cache[key] = generator()
+        return _cache.get(key)
+
+    def set_value(self, key, value, **kwargs):
+        _cache[key] = value
+
+    def delete_value(self, keys):
+        for key in keys if isinstance(keys, list | tuple) else [keys]:
+            _cache.pop(key, None)
+
+    def delete_keys(self, pattern):
+        prefix = pattern.rstrip("*")
+        for key in [k for k in _cache if k.startswith(prefix)]:
+            _cache.pop(key)
+
+    def hget(self, name, key, generator=None):
+        h = _cache.setdefault(name, {})
+        if key not in h and generator:
+            h[key] = generator()
+        return h.get(key)
+
+    def hset(self, name, key, value, **kwargs):
+        _cache.setdefault(name, {})[key] = value
+
+    def hdel(self, name, key):
+        _cache.get(name, {}).pop(key, None)
+
+    def hgetall(self, name):
+        return {k.encode(): v for k, v in _cache.get(name, {}).items()}
+
+    def publish(self, *args, **kwargs):
+        pass
+
+
+_cache_instance = Cache()
+
+
+def cache():
+    return _cache_instance
+
+
+# ----------------------------
+# Misc API
+# ----------------------------
+flags = _dict()
+conf = _dict()
+local = _dict(flags=flags, site="stub", conf=conf)
+session = _dict(user="Administrator")
+error_log = []
+
+
+def _(msg, *args, **kwargs):
+    return msg
+
+
+def throw(msg, exc=ValidationError, *args, **kwargs):
+    raise exc(msg)
+
+
+def msgprint(*args, **kwargs):
+    pass
+
+
+def log_error(message=None, title=None, *args, **kwargs):
+    error_log.append((title, message))
+
+
+def get_traceback(*args, **kwargs):
+    import traceback
+
+    return traceback.format_exc()
+
+
+def whitelist(*args, **kwargs):
+    if args and callable(args[0]):
+        return args[0]
+    return lambda fn: fn
+
+
+def parse_json(value):
+    return json.loads(value) if isinstance(value, str) else value
+
+
+def has_permission(*args, **kwargs):
+    return True
+
+
+def only_for(*args, **kwargs):
+    pass
+
+
+def safe_decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def generate_hash(txt=None, length=None):
+    import secrets
+
+    return secrets.token_hex(length or 10)[: length or 20]
+
+
+def enqueue(method, *args, **kwargs):
+    pass
+
+
+def connect_replica():
+    return False
+
+
+def read_only():
+    # no replica configured: the framework decorator leaves the call on the primary
+    def decorator(fn):
+        return fn
+
+    return decorator
+
+
+def get_print(*args, **kwargs):
+    return b"%PDF-stub"
+
+
+def _cache_source(fn):
+    return fn
+
+
+def install():
+    """Register this module as `frappe` (plus the submodules the app imports)."""
+    if "frappe" in sys.modules and sys.modules["frappe"] is not sys.modules[__name__]:
+        if not getattr(sys.modules["frappe"], "_is_benchmark_stub", False):
+            raise RuntimeError("A real frappe is already imported; the stub cannot be installed.")
+
+    this = sys.modules[__name__]
+    this._is_benchmark_stub = True
+
+    utils = types.ModuleType("frappe.utils")
+    for fn in (getdate, add_days, add_to_date, add_months, get_last_day, flt, cint, rounded, nowdate, today, now, fmt_money):
+        setattr(utils, fn.__name__, fn)
+    dashboard = types.ModuleType("frappe.utils.dashboard")
+    dashboard.cache_source = _cache_source
+    utils.dashboard = dashboard
+
+    model = types.ModuleType("frappe.model")
+    document = types.ModuleType("frappe.model.document")
+    document.Document = Document
+    model.document = document
+
+    this.utils = utils
+    this.model = model
+    sys.modules.update({
+        "frappe": this,
+        "frappe.utils": utils,
+        "frappe.utils.dashboard": dashboard,
+        "frappe.model": model,
+        "frappe.model.document": document,
+    })
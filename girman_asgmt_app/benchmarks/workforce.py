@@ -0,0 +1,184 @@
+"""
+Synthetic workforce generation for the benchmark suite.
+
+A workforce is a deterministic (seeded) set of Employees with regimes, investment
+declarations, one draft Salary Slip each inside a single Payroll Entry, and the demo
+salary structures/components shipped in this app's fixtures. It can be loaded into the
+in-process stub or bulk-inserted into a bench site.
+"""
+import datetime
+import json
+import os
+import random
+
+COMPANY = "Bench Co"
+PAYROLL_ENTRY = "BENCH-PE-0001"
+EMPLOYEE_PREFIX = "BENCH-EMP-"
+SLIP_PREFIX = "BENCH-SS-"
+REGIMES = ("Old Regime", "New Regime")
+INVESTMENT_COMPONENT = "Investment Exemption"
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "synced_fixtures")
+
+
+def _load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def _fiscal_year(d):
+    start = d.year if d.month >= 4 else d.year - 1
+    return f"{start}-{start + 1}"
+
+
+def generate(size, seed=42, as_of=None):
+    """
+    Build a workforce of `size` employees. Returns a dict with employees, declarations,
+    slips (each with earnings/deductions rows), structures, components and metadata.
+    """
+    rng = random.Random(seed)
+    as_of = as_of or datetime.date.today()
+    start_date = as_of.replace(day=1)
+    end_date = (start_date + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+    fiscal_year = _fiscal_year(start_date)
+
+    structures = {s["name"]: s for s in _load_fixture("salary_structure.json")}
+    regime_structure = {regime: f"DEMO - Salary Structure - {regime}" for regime in REGIMES}
+
+    employees, declarations, slips = [], [], []
+    for i in range(size):
+        name = f"{EMPLOYEE_PREFIX}{i:06d}"
+        regime = rng.choice(REGIMES)
+        doj = as_of - datetime.timedelta(days=rng.randint(0, 3650))
+        employees.append({
+            "doctype": "Employee",
+            "name": name,
+            "employee_name": f"Bench Employee {i}",
+            "first_name": f"Bench{i}",
+            "company": COMPANY,
+            "status": "Active",
+            "gender": rng.choice(("Male", "Female")),
+            "date_of_birth": datetime.date(1985, 1, 1) + datetime.timedelta(days=rng.randint(0, 5000)),
+            "date_of_joining": doj,
+            "tax_regime_preference": regime,
+            # a few confirmations exercise the lifecycle handlers; exits are left out
+            # because PDF rendering would dominate every measurement
+            "lifecycle_status": "Confirmed" if rng.random() < 0.05 else "Probation",
+        })
+
+        if rng.random() < 0.6:
+            a = round(rng.uniform(0, 150000), 2)
+            b = round(rng.uniform(0, 50000), 2)
+            c = round(rng.uniform(0, 20000), 2)
+            declarations.append({
+                "doctype": "Employee Investment Declaration",
+                "name": f"{name}-{fiscal_year}",
+                "employee": name,
+                "employee_name": f"Bench Employee {i}",
+                "fiscal_year": fiscal_year,
+                "declaration_date": start_date,
+                "section_80c_amount": a,
+                "section_80d_amount": b,
+                "other_exemptions": c,
+                "total_exemption": round(a + b + c, 2),
+            })
+
+        # 80% already on the regime-correct structure, the rest need correcting
+        structure = regime_structure[regime]
+        if rng.random() < 0.2:
+            structure = regime_structure[REGIMES[1 - REGIMES.index(regime)]]
+        template = structures[structure]
+        deductions = [dict(salary_component=r["salary_component"], abbr=r.get("abbr"), amount=r.get("amount") or 0)
+                      for r in template.get("deductions", [])]
+        if rng.random() < 0.5:
+            deductions.append(dict(salary_component=INVESTMENT_COMPONENT, abbr="INV_EXEMPT", amount=1000.0))
+        slips.append({
+            "doctype": "Salary Slip",
+            "name": f"{SLIP_PREFIX}{i:06d}",
+            "employee": name,
+            "employee_name": f"Bench Employee {i}",
+            "company": COMPANY,
+            "payroll_entry": PAYROLL_ENTRY,
+            "posting_date": end_date,
+            "start_date": start_date,
+            "end_date": end_date,
+            "salary_structure": structure,
+            "docstatus": 0,
+            "earnings": [dict(salary_component=r["salary_component"], abbr=r.get("abbr"), amount=r.get("amount") or 0)
+                         for r in template.get("earnings", [])],
+            "deductions": deductions,
+        })
+
+    return {
+        "size": size,
+        "company": COMPANY,
+        "fiscal_year": fiscal_year,
+        "start_date": start_date,
+        "end_date": end_date,
+        "payroll_entry": PAYROLL_ENTRY,
+        "employees": employees,
+        "declarations": declarations,
+        "slips": slips,
+        "structures": list(structures.values()),
+        "components": _load_fixture("salary_component.json"),
+    }
+
+
+def load_into_stub(workforce):
+    """Populate the stub's in-memory tables with workforce."""
+    from girman_asgmt_app.benchmarks import stub
+
+    stub.reset()
+    s = stub.store
+    s.singles["HR Settings"].update(default_probation_days=90)
+    for c in workforce["components"]:
+        s.insert("Salary Component", c)
+    for st in workforce["structures"]:
+        s.insert("Salary Structure", {k: v for k, v in st.items() if k not in ("earnings", "deductions")})
+        for field in ("earnings", "deductions"):
+            for r in st.get(field, []):
+                s.insert("Salary Detail", {**r, "name": None, "parent": st["name"], "parentfield": field,
+                                           "parenttype": "Salary Structure"})
+    for e in workforce["employees"]:
+        s.insert("Employee", e)
+    for d in workforce["declarations"]:
+        s.insert("Employee Investment Declaration", d)
+    for ss in workforce["slips"]:
+        s.insert("Salary Slip", {k: v for k, v in ss.items() if k not in ("earnings", "deductions")})
+    s.insert("Payroll Entry", {"name": workforce["payroll_entry"], "company": workforce["company"]})
+    # a migrated site has a published master-data snapshot (see girman_asgmt_app.bootstrap)
+    from girman_asgmt_app.bootstrap import bootstrap
+
+    bootstrap()
+    stub.STATS.update(queries=0, commits=0)
+
+
+def load_into_site(workforce, chunk_size=5000):
+    """
+    Bulk-insert employees, declarations and draft slip headers into the current site.
+    Meant to run inside a transaction that the caller rolls back.
+    """
+    import frappe
+
+    now = frappe.utils.now()
+    base = {"creation": now, "modified": now, "owner": "Administrator", "modified_by": "Administrator"}
+
+    def insert(doctype, rows, fields):
+        if not rows:
+            return
+        fields = [*base, *fields]
+        values = [tuple({**base, **r}.get(f) for f in fields) for r in rows]
+        frappe.db.bulk_insert(doctype, fields, values, chunk_size=chunk_size)
+
+    insert("Employee", workforce["employees"], [
+        "name", "employee_name", "first_name", "company", "status", "gender", "date_of_birth",
+        "date_of_joining", "tax_regime_preference", "lifecycle_status",
+    ])
+    insert("Employee Investment Declaration", workforce["declarations"], [
+        "name", "employee", "employee_name", "fiscal_year", "declaration_date",
+        "section_80c_amount", "section_80d_amount", "other_exemptions", "total_exemption",
+    ])
+    insert("Salary Slip", workforce["slips"], [
+        "name", "employee", "employee_name", "company", "payroll_entry", "posting_date",
+        "start_date", "end_date", "salary_structure", "docstatus",
+    ])
@@ -0,0 +1,110 @@
+"""
+Master-data bootstrap registry.
+
+The prerequisites the hooks rely on (the Investment Exemption salary component, the
+default probation period from HR Settings and the regime -> salary structure mapping)
+are verified or created once by `bootstrap` at install/migrate time. Hooks read them
+through `get_master_data`, which memoizes a snapshot per worker and site.
+
+Cross-worker invalidation: the snapshot is published to Redis together with a version
+token. `invalidate_master_data` (hooked on the documents the snapshot is built from)
+replaces the token after commit; every worker compares its memoized token with the
+shared one and reloads on mismatch. In steady state an access costs no database query.
+"""
+import frappe
+
+MASTER_DATA_KEY = "girman_asgmt_app:master_data"
+MASTER_DATA_VERSION_KEY = "girman_asgmt_app:master_data_version"
+
+# {site: snapshot}, lives for the lifetime of the worker process
+_memo = {}
+
+
+def _read_probation_days() -> int:
+    from girman_asgmt_app.events.employee import DEFAULT_PROBATION_DAYS
+
+    try:
+        hr = frappe.get_single("HR Settings")
+        val = hr.get("default_probation_days") or hr.get("probation_period")
+        return int(val) if val else DEFAULT_PROBATION_DAYS
+    except Exception:
+        return DEFAULT_PROBATION_DAYS
+
+
+def _load(version):
+    """Build a snapshot from the database."""
+    from girman_asgmt_app.events.payroll import INVESTMENT_COMPONENT
+    from girman_asgmt_app.events.tax_regime import REGIME_TO_STRUCTURE
+
+    return frappe._dict(
+        version=version,
+        investment_component_exists=bool(
+            frappe.db.exists("Salary Component", {"salary_component": INVESTMENT_COMPONENT})
+        ),
+        default_probation_days=_read_probation_days(),
+        regime_to_structure=dict(REGIME_TO_STRUCTURE),
+    )
+
+
+def get_master_data():
+    """Return the memoized master-data snapshot, reloading it only when another worker invalidated it."""
+    version = frappe.cache().get_value(MASTER_DATA_VERSION_KEY)
+    data = _memo.get(frappe.local.site)
+    if data and version and data.version == version:
+        return data
+
+    data = frappe.cache().get_value(MASTER_DATA_KEY)
+    if not data or not version or data.get("version") != version:
+        data = _publish(version)
+    data = frappe._dict(data)
+    _memo[frappe.local.site] = data
+    return data
+
+
+def _publish(version=None):
+    """Load a snapshot and share it with the other workers under version (a new token if None)."""
+    if not version:
+        version = frappe.generate_hash(length=10)
+        frappe.cache().set_value(MASTER_DATA_VERSION_KEY, version)
+    data = _load(version)
+    frappe.cache().set_value(MASTER_DATA_KEY, data)
+    return data
+
+
+def invalidate_master_data(doc=None, method=None):
+    """
+    Hook: HR Settings on_update, Investment Exemption Salary Component on_update / on_trash.
+    Workers reload the snapshot on their next access once the change is committed.
+    """
+    from girman_asgmt_app.events.payroll import INVESTMENT_COMPONENT
+
+    if doc and doc.doctype == "Salary Component" and doc.name != INVESTMENT_COMPONENT:
+        return
+
+    def _invalidate():
+        _memo.pop(frappe.local.site, None)
+        frappe.cache().delete_value([MASTER_DATA_VERSION_KEY, MASTER_DATA_KEY])
+
+    frappe.db.after_commit.add(_invalidate)
+
+
+def bootstrap():
+    """Hook: after_install / after_migrate. Verify or create prerequisites, then publish a fresh snapshot."""
+    from girman_asgmt_app.events.payroll import create_investment_component
+    from girman_asgmt_app.events.tax_regime import REGIME_TO_STRUCTURE
+
+    create_investment_component()
+
+    existing = set(frappe.get_all(
+        "Salary Structure", filters={"name": ("in", list(REGIME_TO_STRUCTURE.values()))}, pluck="name"
+    ))
+    missing = [ss for ss in REGIME_TO_STRUCTURE.values() if ss not in existing]
+    if missing:
+        frappe.log_error(
+            message=f"Salary structures mapped to tax regimes are missing: {', '.join(missing)}",
+            title="Tax Regime Mapping Missing",
+        )
+
+    frappe.db.commit()
+    _memo.pop(frappe.local.site, None)
+    return _publish()
@@ -0,0 +1,39 @@
+import click
+from frappe.commands import get_site, pass_context
+
+
+@click.command("rebuild-applicant-source-rollup")
+@pass_context
+def rebuild_applicant_source_rollup(context):
+    """Recompute the Applicant Source Rollup table from Job Applicant"""
+    import frappe
+
+    from girman_asgmt_app.events.job_applicant import rebuild_applicant_source_rollup as rebuild
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        rebuild()
+    finally:
+        frappe.destroy()
+
+
+@click.command("export-girman-fixtures")
+@pass_context
+def export_girman_fixtures(context):
+    """Export Letter Head, Salary Component and DEMO Salary Structure records to synced_fixtures/"""
+    import frappe
+
+    from girman_asgmt_app.fixture_sync import export_fixtures
+
+    site = get_site(context)
+    frappe.init(site=site)
+    frappe.connect()
+    try:
+        export_fixtures()
+    finally:
+        frappe.destroy()
+
+
+commands = [rebuild_applicant_source_rollup, export_girman_fixtures]
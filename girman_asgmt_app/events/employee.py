@@ -1,24 +1,28 @@
 import frappe
-from frappe.utils import add_days, getdate, nowdate
+from frappe import _
+from frappe.utils import add_days, add_to_date, getdate, now, nowdate
 
 # ----------------------------
 # Configuration / constants
 # ----------------------------
 DEFAULT_PROBATION_DAYS = 90
 DEFAULT_PRINT_FORMAT = "Experience Letter"
+BULK_PROBATION_CHUNK_SIZE = 500
+OUTBOX_DOCTYPE = "Employee Lifecycle Outbox"
+OUTBOX_JOB_ID = "girman_asgmt_app:lifecycle_outbox"
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_ATTEMPTS = 3
+OUTBOX_STALE_MINUTES = 30
 
 
 # ----------------------------
 # Helpers
 # ----------------------------
 def _get_default_probation_days() -> int:
-    """Return probation days from HR Settings, or fallback to DEFAULT_PROBATION_DAYS."""
-    try:
-        hr = frappe.get_single("HR Settings")
-        val = hr.get("default_probation_days") or hr.get("probation_period")
-        return int(val) if val else DEFAULT_PROBATION_DAYS
-    except Exception:
-        return DEFAULT_PROBATION_DAYS
+    """Return probation days from HR Settings (via the bootstrap snapshot), or DEFAULT_PROBATION_DAYS."""
+    from girman_asgmt_app.bootstrap import get_master_data
+
+    return get_master_data().default_probation_days or DEFAULT_PROBATION_DAYS
 
 
 def _compute_probation_dates(doj, probation_days: int):
@@ -47,12 +51,100 @@ def _safe_db_set(doc, field: str, value):
             frappe.log_error(frappe.get_traceback(), "employee._safe_db_set")
 
 
+# ----------------------------
+# Bulk import fast path
+# ----------------------------
+def _in_bulk_import() -> bool:
+    """True while Data Import is inserting Employees (but not during migrate fixture sync)."""
+    return bool(frappe.flags.in_import and not frappe.flags.in_migrate)
+
+
+def _queue_probation_update(doc):
+    """
+    Compute probation dates in memory and queue them for a multi-row UPDATE.
+    HR Settings is read once per import; the queue is flushed every
+    BULK_PROBATION_CHUNK_SIZE rows and at the end of the import job/request.
+    """
+    if frappe.flags.girman_bulk_probation_days is None:
+        frappe.flags.girman_bulk_probation_days = _get_default_probation_days()
+    days = frappe.flags.girman_bulk_probation_days
+
+    ps, pe, conf = _compute_probation_dates(doc.get("date_of_joining"), days)
+    values = {"probation_start": ps, "probation_end": pe}
+    if not doc.get("final_confirmation_date"):
+        values["final_confirmation_date"] = conf
+
+    # keep the in-memory doc consistent so on_update does not recompute
+    doc.update(values)
+    doc.flags.girman_probation_queued = True
+
+    pending = frappe.flags.girman_pending_probation
+    if pending is None:
+        pending = frappe.flags.girman_pending_probation = {}
+    pending[doc.name] = values
+    _track_uncommitted_probation(doc.name)
+
+    if len(pending) >= BULK_PROBATION_CHUNK_SIZE:
+        _flush_pending_probation()
+
+
+def _track_uncommitted_probation(name):
+    """Remember rows queued in the current transaction so a rollback can drop them."""
+    uncommitted = frappe.flags.girman_uncommitted_probation
+    if not uncommitted:
+        uncommitted = frappe.flags.girman_uncommitted_probation = set()
+        frappe.db.after_commit.add(_forget_uncommitted_probation)
+        frappe.db.after_rollback.add(_discard_uncommitted_probation)
+    uncommitted.add(name)
+
+
+def _forget_uncommitted_probation():
+    frappe.flags.girman_uncommitted_probation = None
+
+
+def _discard_uncommitted_probation():
+    """The transaction rolled back: its Employees no longer exist, so drop their queued dates."""
+    pending = frappe.flags.girman_pending_probation or {}
+    for name in frappe.flags.girman_uncommitted_probation or ():
+        pending.pop(name, None)
+    frappe.flags.girman_uncommitted_probation = None
+
+
+def _flush_pending_probation() -> int:
+    """Write queued probation dates with one multi-row UPDATE per chunk. Returns rows written."""
+    pending = frappe.flags.girman_pending_probation
+    if not pending:
+        return 0
+    frappe.flags.girman_pending_probation = {}
+    frappe.db.bulk_update("Employee", pending, chunk_size=BULK_PROBATION_CHUNK_SIZE)
+    return len(pending)
+
+
+def flush_bulk_probation_updates():
+    """
+    Hook: after_job / after_request.
+    Flush any probation dates still queued by a bulk import and commit them,
+    since the framework has already committed by the time these hooks run.
+    """
+    try:
+        if _flush_pending_probation():
+            frappe.db.commit()
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "employee.flush_bulk_probation_updates")
+    finally:
+        frappe.flags.girman_bulk_probation_days = None
+
+
 # ----------------------------
 # Event handlers
 # ----------------------------
 def on_employee_after_insert(doc, method=None):
     """Populate probation fields when an Employee is created."""
     try:
+        if _in_bulk_import():
+            _queue_probation_update(doc)
+            return
+
         days = _get_default_probation_days()
         ps, pe, conf = _compute_probation_dates(doc.get("date_of_joining"), days)
         _safe_db_set(doc, "probation_start", ps)
@@ -70,10 +162,14 @@ def on_employee_on_update(doc, method=None):
       - Respond to lifecycle transitions: Confirmed / Exited.
     """
     try:
-        prev = frappe.get_doc(doc.doctype, doc.name)
+        if doc.flags.get("girman_probation_queued"):
+            # freshly imported row: probation dates are written by the bulk flush
+            doj_changed = probation_missing = False
+        else:
+            prev = frappe.get_doc(doc.doctype, doc.name)
 
-        doj_changed = bool(prev and prev.get("date_of_joining") != doc.get("date_of_joining"))
-        probation_missing = not (doc.get("probation_start") and doc.get("probation_end") and doc.get("final_confirmation_date"))
+            doj_changed = bool(prev and prev.get("date_of_joining") != doc.get("date_of_joining"))
+            probation_missing = not (doc.get("probation_start") and doc.get("probation_end") and doc.get("final_confirmation_date"))
 
         if doj_changed or probation_missing:
             days = _get_default_probation_days()
@@ -83,11 +179,7 @@ def on_employee_on_update(doc, method=None):
             if doj_changed or not doc.get("final_confirmation_date"):
                 _safe_db_set(doc, "final_confirmation_date", conf)
 
-        new_status = doc.get("lifecycle_status")
-        if new_status == "Confirmed":
-            _handle_confirmed(doc)
-        elif new_status == "Exited":
-            _handle_exited(doc)
+        _record_lifecycle_transition(doc)
 
     except Exception:
         frappe.log_error(frappe.get_traceback(), "employee.on_employee_on_update")
@@ -95,45 +187,165 @@ def on_employee_on_update(doc, method=None):
 
 def on_employee_after_save(doc, method=None):
     """
-    Safety net for workflows: ensure confirmation/exit handlers applied
+    Safety net for workflows: ensure confirmation/exit handlers are queued
     when states have already changed via workflow actions.
     """
     try:
-        if doc.get("lifecycle_status") == "Confirmed" and not doc.get("final_confirmation_date"):
-            _handle_confirmed(doc)
-
-        if doc.get("lifecycle_status") == "Exited" and not doc.get("relieving_date"):
-            _handle_exited(doc)
+        _record_lifecycle_transition(doc)
     except Exception:
         frappe.log_error(frappe.get_traceback(), "employee.on_employee_after_save")
 
 
+# ----------------------------
+# Lifecycle outbox
+# ----------------------------
+def _transition_pending(doc, state) -> bool:
+    """True when the handler for state still has work to do on doc (or the state just changed)."""
+    before = doc.get_doc_before_save() if hasattr(doc, "get_doc_before_save") else None
+    if before and before.get("lifecycle_status") != state:
+        return True
+    if state == "Confirmed":
+        return not doc.get("final_confirmation_date") or doc.get("status") != "Active"
+    return not doc.get("relieving_date") or doc.get("status") != "Left"
+
+
+def _record_lifecycle_transition(doc):
+    """
+    Write (employee, lifecycle_status) to the outbox in the current transaction. Rows are
+    keyed by employee and target state, so repeated hooks and saves collapse into one
+    pending row; the outbox is processed by a worker once the transaction commits.
+    """
+    state = doc.get("lifecycle_status")
+    if state not in LIFECYCLE_HANDLERS or not doc.get("name"):
+        return
+
+    key = f"{doc.name}::{state}"
+    recorded = frappe.flags.girman_lifecycle_outbox
+    if recorded is None:
+        recorded = frappe.flags.girman_lifecycle_outbox = set()
+    if key in recorded or not _transition_pending(doc, state):
+        return
+    if not recorded:
+        # first row of this transaction: kick the worker once it commits, forget the rows if it rolls back
+        frappe.db.after_commit.add(_kick_lifecycle_outbox)
+        frappe.db.after_rollback.add(_forget_lifecycle_transitions)
+    recorded.add(key)
+
+    # MariaDB applies the assignments left to right, so attempts is reset before status changes
+    frappe.db.sql(
+        """
+        insert into `tabEmployee Lifecycle Outbox`
+            (name, employee, target_state, status, attempts, creation, modified, owner, modified_by, docstatus)
+        values (%(name)s, %(employee)s, %(state)s, 'Pending', 0, now(), now(), %(user)s, %(user)s, 0)
+        on duplicate key update
+            attempts = if(status in ('Done', 'Failed'), 0, attempts),
+            status = 'Pending',
+            modified = now()
+        """,
+        {"name": key, "employee": doc.name, "state": state, "user": frappe.session.user},
+    )
+
+
+def _forget_lifecycle_transitions():
+    frappe.flags.girman_lifecycle_outbox = None
+
+
+def _kick_lifecycle_outbox():
+    _forget_lifecycle_transitions()
+    frappe.enqueue(
+        "girman_asgmt_app.events.employee.process_lifecycle_outbox",
+        queue="short",
+        job_id=OUTBOX_JOB_ID,
+        deduplicate=True,
+    )
+
+
+def _claim(name) -> bool:
+    """Move one outbox row from Pending to Processing; the row lock lets only one worker win."""
+    claimed = frappe.db.get_value(OUTBOX_DOCTYPE, name, "status", for_update=True) == "Pending"
+    if claimed:
+        # modified doubles as the claim time checked by the stale-row reset
+        frappe.db.set_value(OUTBOX_DOCTYPE, name, "status", "Processing")
+    frappe.db.commit()
+    return claimed
+
+
+def process_lifecycle_outbox():
+    """
+    Background job (after commit, and every minute as a fallback): run the lifecycle
+    handler for each pending outbox row exactly once. Rows stuck in Processing for
+    OUTBOX_STALE_MINUTES (a worker died) are returned to Pending first.
+    """
+    frappe.db.sql(
+        "update `tabEmployee Lifecycle Outbox` set status = 'Pending' where status = 'Processing' and modified < %s",
+        (add_to_date(now(), minutes=-OUTBOX_STALE_MINUTES),),
+    )
+    frappe.db.commit()
+
+    rows = frappe.get_all(
+        OUTBOX_DOCTYPE,
+        filters={"status": "Pending"},
+        fields=["name", "employee", "target_state", "attempts"],
+        order_by="modified asc",
+        limit=OUTBOX_BATCH_SIZE,
+    )
+    for row in rows:
+        if not _claim(row.name):
+            continue
+        try:
+            doc = frappe.get_doc("Employee", row.employee)
+            # the employee may have moved on since the row was written
+            if doc.get("lifecycle_status") == row.target_state:
+                LIFECYCLE_HANDLERS[row.target_state](doc)
+            _finish_outbox_row(row.name, "Done")
+        except Exception:
+            frappe.db.rollback()
+            attempts = row.attempts + 1
+            _finish_outbox_row(
+                row.name,
+                "Failed" if attempts >= OUTBOX_MAX_ATTEMPTS else "Pending",
+                attempts=attempts,
+                last_error=frappe.get_traceback(),
+            )
+
+
+def _finish_outbox_row(name, status, **values):
+    """Set the row's final status unless a newer transition re-queued it meanwhile."""
+    values = {"status": status, "modified": now(), **values}
+    assignments = ", ".join(f"`{k}` = %({k})s" for k in values)
+    frappe.db.sql(
+        f"update `tabEmployee Lifecycle Outbox` set {assignments} where name = %(name)s and status = 'Processing'",
+        {**values, "name": name},
+    )
+    frappe.db.commit()
+
+
 # ----------------------------
 # Lifecycle handlers
 # ----------------------------
+# Handlers raise on failure so the outbox retries the row (up to OUTBOX_MAX_ATTEMPTS).
 def _handle_confirmed(doc):
     """Actions to run when employee is confirmed."""
-    try:
-        if not doc.get("final_confirmation_date"):
-            _safe_db_set(doc, "final_confirmation_date", nowdate())
-        _safe_db_set(doc, "status", "Active")
-    except Exception:
-        frappe.log_error(frappe.get_traceback(), "employee._handle_confirmed")
+    values = {"status": "Active"}
+    if not doc.get("final_confirmation_date"):
+        values["final_confirmation_date"] = nowdate()
+    doc.db_set(values)
 
 
 def _handle_exited(doc):
     """Actions to run when employee exits."""
-    try:
-        if not doc.get("relieving_date"):
-            _safe_db_set(doc, "relieving_date", nowdate())
-        _safe_db_set(doc, "status", "Left")
+    values = {"status": "Left"}
+    if not doc.get("relieving_date"):
+        values["relieving_date"] = nowdate()
+    doc.db_set(values)
 
-        file_doc = _generate_experience_letter_and_attach(doc)
-        if file_doc:
-            _safe_db_set(doc, "experience_letter", file_doc.file_url)
+    file_doc = _generate_experience_letter_and_attach(doc)
+    if not file_doc:
+        raise frappe.ValidationError(_("Experience letter could not be generated for Employee {0}").format(doc.name))
+    doc.db_set("experience_letter", file_doc.file_url)
 
-    except Exception:
-        frappe.log_error(frappe.get_traceback(), "employee._handle_exited")
+
+LIFECYCLE_HANDLERS = {"Confirmed": _handle_confirmed, "Exited": _handle_exited}
 
 
 # ----------------------------
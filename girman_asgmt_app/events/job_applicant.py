@@ -0,0 +1,72 @@
+import frappe
+from frappe.utils import getdate
+
+ROLLUP_DOCTYPE = "Applicant Source Rollup"
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+def _period(dt) -> str:
+    """Rollup bucket for a creation timestamp: 'YYYY-MM'."""
+    return getdate(dt).strftime("%Y-%m")
+
+
+def _rollup_name(source, period) -> str:
+    return f"{period}::{source or ''}"
+
+
+def _bump(source, period, delta: int):
+    """Add delta to the (source, period) counter, creating the row on first use."""
+    frappe.db.sql(
+        """
+        insert into `tabApplicant Source Rollup`
+            (name, source, period, applicant_count, creation, modified, owner, modified_by, docstatus)
+        values (%(name)s, %(source)s, %(period)s, %(delta)s, now(), now(), 'Administrator', 'Administrator', 0)
+        on duplicate key update applicant_count = greatest(applicant_count + %(delta)s, 0), modified = now()
+        """,
+        {"name": _rollup_name(source, period), "source": source or None, "period": period, "delta": delta},
+    )
+
+
+# ----------------------------
+# Event handlers
+# ----------------------------
+def on_job_applicant_after_insert(doc, method=None):
+    """Count the new applicant against its source and creation month."""
+    _bump(doc.get("source"), _period(doc.creation), 1)
+
+
+def on_job_applicant_on_update(doc, method=None):
+    """Move the applicant between sources when source changes."""
+    before = doc.get_doc_before_save()
+    if not before or before.get("source") == doc.get("source"):
+        return
+    period = _period(doc.creation)
+    _bump(before.get("source"), period, -1)
+    _bump(doc.get("source"), period, 1)
+
+
+def on_job_applicant_on_trash(doc, method=None):
+    _bump(doc.get("source"), _period(doc.creation), -1)
+
+
+# ----------------------------
+# Rebuild
+# ----------------------------
+def rebuild_applicant_source_rollup():
+    """Recompute the whole rollup from Job Applicant in one statement (fixes any drift)."""
+    frappe.db.delete(ROLLUP_DOCTYPE)
+    frappe.db.sql(
+        """
+        insert into `tabApplicant Source Rollup`
+            (name, source, period, applicant_count, creation, modified, owner, modified_by, docstatus)
+        select
+            concat(date_format(creation, '%Y-%m'), '::', ifnull(source, '')),
+            source, date_format(creation, '%Y-%m'), count(*),
+            now(), now(), 'Administrator', 'Administrator', 0
+        from `tabJob Applicant`
+        group by source, date_format(creation, '%Y-%m')
+        """
+    )
+    frappe.db.commit()
@@ -1,26 +1,31 @@
-import frappe
+import time
 from datetime import date
-from frappe.utils import getdate
+
+import frappe
 from frappe import _
+from frappe.utils import flt, getdate
+
+from girman_asgmt_app.bootstrap import get_master_data
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+    get_total_exemptions,
+)
+from girman_asgmt_app.slip_context import get_slip_context
 
 INVESTMENT_COMPONENT = "Investment Exemption"
+PENDING_SLIP_REFRESH_KEY = "girman_asgmt_app:pending_investment_slip_refresh"
+CLAIMED_SLIP_REFRESH_KEY = "girman_asgmt_app:claimed_investment_slip_refresh"
+SLIP_REFRESH_DEBOUNCE_SECONDS = 60
 
 
 def get_total_declarations(employee: str, fiscal_year: str) -> float:
     """Return total exemption for employee and fiscal_year (sum of total_exemption)."""
     if not employee or not fiscal_year:
         return 0.0
-    res = frappe.get_all(
-        "Employee Investment Declaration",
-        filters={"employee": employee, "fiscal_year": fiscal_year},
-        fields=["total_exemption"]
-    )
-    total = res and res[0].get("total_exemption") or 0.0
-    return float(total or 0.0)
+    return get_total_exemptions(employee, fiscal_year).get(employee, 0.0)
 
 
-def ensure_investment_component_exists():
-    """Create the Salary Component if it doesn't exist."""
+def create_investment_component():
+    """Create the Salary Component if it doesn't exist. Runs from bootstrap; does not commit."""
     if frappe.db.exists("Salary Component", {"salary_component": INVESTMENT_COMPONENT}):
         return
     doc = frappe.get_doc({
@@ -32,7 +37,17 @@ def ensure_investment_component_exists():
         "default_amount": 0
     })
     doc.insert(ignore_permissions=True)
-    frappe.db.commit()
+
+
+def ensure_investment_component_exists():
+    """
+    Make sure the Salary Component exists, answering from the bootstrap snapshot (no query
+    in steady state). If it was deleted since, recreate it inside the caller's transaction.
+    """
+    if get_master_data().investment_component_exists:
+        return
+    # the Salary Component on_update hook invalidates the snapshot once this commits
+    create_investment_component()
 
 
 def _fiscal_year_from_date(dt) -> str:
@@ -98,6 +113,14 @@ def months_remaining_in_fiscal(slip_start_date, fiscal_year=None) -> int:
     return months
 
 
+def prorate_investment_total(total, slip_start_date, fiscal_year=None) -> float:
+    """Spread the declared total evenly over the months left in the fiscal year (incl. the slip's month)."""
+    if not total or float(total) <= 0:
+        return 0.0
+    months = months_remaining_in_fiscal(slip_start_date, fiscal_year) or 12
+    return round(float(total) / float(months), 2)
+
+
 def remove_existing_investment_row(salary_slip):
     """Remove any existing Investment Exemption rows from salary_slip.deductions to avoid duplication."""
     if not getattr(salary_slip, "get", None):
@@ -140,35 +163,156 @@ def adjust_salary_slip_with_investments(salary_slip, method=None):
     """
     Hook: runs on Salary Slip validate.
     Behavior:
-      - Reads Employee Investment Declaration total for the employee & fiscal_year (derived if needed)
+      - Reads Employee Investment Declaration total for the employee & fiscal_year from the shared slip context
       - Ensures the Salary Component exists
       - Removes previous Investment Exemption row (if any)
       - Pro-rates the total across remaining months in the fiscal year and adds per_month amount as a deduction
     """
     try:
-        employee = salary_slip.get("employee") if hasattr(salary_slip, "get") else getattr(salary_slip, "employee", None)
-        start_date = salary_slip.get("start_date") if hasattr(salary_slip, "get") else getattr(salary_slip, "start_date", None)
-        fiscal_year = salary_slip.get("fiscal_year") if hasattr(salary_slip, "get") else getattr(salary_slip, "fiscal_year", None)
-        
-        if not employee:
+        if not salary_slip.get("employee"):
             return
 
-        if not fiscal_year:
-            fiscal_year = _fiscal_year_from_date(start_date)
-        total = get_total_declarations(employee, fiscal_year)
+        ctx = get_slip_context(salary_slip)
 
         ensure_investment_component_exists()
 
         remove_existing_investment_row(salary_slip)
 
-        if not total or float(total) <= 0:
+        if not ctx.per_month_investment:
             return
-        months = months_remaining_in_fiscal(start_date, fiscal_year) or 12
-        per_month = float(total) / float(months)
-        per_month = round(per_month, 2)
 
-        add_investment_deduction_row(salary_slip, per_month)
+        add_investment_deduction_row(salary_slip, ctx.per_month_investment)
 
     except Exception as err:
         frappe.log_error(message=frappe.get_traceback(), title="adjust_salary_slip_with_investments")
         raise
+
+
+# ----------------------------
+# Draft slip refresh after declaration changes
+# ----------------------------
+def queue_draft_slip_refresh(doc, method=None):
+    """
+    Hook: on_update / on_trash of Employee Investment Declaration.
+    Marks the employee's draft slips as stale; process_pending_slip_refreshes picks
+    them up once no further edit has arrived for SLIP_REFRESH_DEBOUNCE_SECONDS.
+    """
+    if doc.get("employee"):
+        mark_draft_slips_stale([doc.employee])
+
+
+def mark_draft_slips_stale(employees):
+    """Record (or push back) the last-edit time for each employee once the transaction commits."""
+    employees = [e for e in set(employees or []) if e]
+    if not employees:
+        return
+
+    def _mark():
+        now = time.time()
+        for emp in employees:
+            frappe.cache().hset(PENDING_SLIP_REFRESH_KEY, emp, now)
+
+    frappe.db.after_commit.add(_mark)
+
+
+def process_pending_slip_refreshes():
+    """
+    Scheduler (every minute): refresh employees whose last declaration edit is older than
+    the debounce window, so a burst of edits results in a single recompute.
+
+    The pending hash is claimed with one atomic RENAME, so an edit marked while this runs
+    lands in a fresh pending hash for the next run instead of being cleared unprocessed.
+    Entries that are not due yet go back unless a newer mark has arrived meanwhile. A claim
+    left behind by a worker that died is finished by the next run.
+    """
+    cache = frappe.cache()
+    claimed_key = cache.make_key(CLAIMED_SLIP_REFRESH_KEY)
+    if not cache.exists(claimed_key):
+        pending_key = cache.make_key(PENDING_SLIP_REFRESH_KEY)
+        if not cache.exists(pending_key):
+            return
+        cache.rename(pending_key, claimed_key)
+
+    cutoff = time.time() - SLIP_REFRESH_DEBOUNCE_SECONDS
+    due = []
+    for emp, edited_at in (cache.hgetall(CLAIMED_SLIP_REFRESH_KEY) or {}).items():
+        emp = frappe.safe_decode(emp)
+        if flt(edited_at) <= cutoff:
+            due.append(emp)
+        elif not cache.hexists(PENDING_SLIP_REFRESH_KEY, emp):
+            cache.hset(PENDING_SLIP_REFRESH_KEY, emp, edited_at)
+
+    try:
+        if due:
+            refresh_draft_slip_investments(due)
+            frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(message=frappe.get_traceback(), title="process_pending_slip_refreshes")
+    finally:
+        cache.delete(claimed_key)
+
+
+def refresh_draft_slip_investments(employees):
+    """
+    Re-apply the Investment Exemption row on the draft Salary Slips of employees, using the
+    same proration as adjust_salary_slip_with_investments. Earnings and the other
+    deductions are not recalculated; the totals derived from them are.
+    Returns the number of slips changed.
+    """
+    slips = frappe.get_all(
+        "Salary Slip",
+        filters={"employee": ("in", list(employees)), "docstatus": 0},
+        fields=["name", "employee", "start_date"],
+    )
+    if not slips:
+        return 0
+
+    by_fiscal_year = {}
+    for ss in slips:
+        by_fiscal_year.setdefault(_fiscal_year_from_date(ss.start_date), set()).add(ss.employee)
+    totals = {
+        fy: get_total_exemptions(list(emps), fy) for fy, emps in by_fiscal_year.items()
+    }
+
+    changed = 0
+    for ss in slips:
+        fy = _fiscal_year_from_date(ss.start_date)
+        per_month = prorate_investment_total(totals[fy].get(ss.employee), ss.start_date, fy)
+        if _set_slip_investment_amount(ss.name, per_month):
+            changed += 1
+    return changed
+
+
+def _set_slip_investment_amount(slip_name, per_month) -> bool:
+    """
+    Set the Investment Exemption row of one draft slip to per_month, then let the slip
+    recompute what depends on its deductions (total deduction, net and rounded pay, their
+    base_* amounts, amounts in words and the year/month-to-date figures) through its own
+    calculation, without re-running the full validate.
+    """
+    slip = frappe.get_doc("Salary Slip", slip_name)
+    row = next((d for d in slip.get("deductions") or [] if d.salary_component == INVESTMENT_COMPONENT), None)
+    if not flt(per_month - flt(row.amount if row else 0.0), 2):
+        return False
+
+    if row and per_month:
+        row.amount = per_month
+    elif row:
+        slip.remove(row)
+        frappe.db.delete("Salary Detail", {"name": row.name})
+    else:
+        ensure_investment_component_exists()
+        row = slip.append("deductions", {
+            "salary_component": INVESTMENT_COMPONENT,
+            "abbr": "INV_EXEMPT",
+            "amount": per_month
+        })
+        row.db_insert()
+
+    slip.set_net_pay()
+    slip.compute_year_to_date()
+    slip.compute_month_to_date()
+    slip.compute_component_wise_year_to_date()
+    slip.db_update_all()
+    return True
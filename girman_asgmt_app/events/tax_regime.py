@@ -1,11 +1,15 @@
 import frappe
 from frappe import _
 
+from girman_asgmt_app.slip_context import get_slip_context
+
 REGIME_TO_STRUCTURE = {
     "Old Regime": "DEMO - Salary Structure - Old Regime",
     "New Regime": "DEMO - Salary Structure - New Regime"
 }
 ALLOWED_STRUCTURES = set(REGIME_TO_STRUCTURE.values())
+DEFAULT_REGIME = "Old Regime"
+REGIME_STRUCTURE_CACHE_KEY = "girman_asgmt_app:regime_structure_map"
 
 def get_employee_regime(employee):
     """Return the value of tax_regime_preference for employee, fallback to Old Regime."""
@@ -21,9 +25,8 @@ def set_salary_structure_for_employee(doc, method=None):
     """
     if not getattr(doc, "employee", None):
         return
-    regime = get_employee_regime(doc.employee)
-
-    expected_structure = REGIME_TO_STRUCTURE.get(regime)
+    ctx = get_slip_context(doc)
+    regime, expected_structure = ctx.regime, ctx.expected_structure
 
     if not expected_structure:
         frappe.log_error(message=f"Unknown mapping for tax regime: {regime}", title="Tax Regime Mapping Missing")
@@ -41,8 +44,6 @@ def set_salary_structure_for_employee(doc, method=None):
                 doc.deductions = []
         except Exception as e:
             frappe.log_error(message=str(e), title="Error Clearing Salary Slip Tables")
-    else:
-        frappe.log_error(message="Salary structure already correct. No changes made.", title="Salary Structure Already Correct")
 
 
 def ensure_salary_structure_matches_regime(doc, method=None):
@@ -50,8 +51,8 @@ def ensure_salary_structure_matches_regime(doc, method=None):
     if not getattr(doc, "employee", None):
         return
 
-    regime = get_employee_regime(doc.employee)
-    expected_structure = REGIME_TO_STRUCTURE.get(regime)
+    ctx = get_slip_context(doc)
+    regime, expected_structure = ctx.regime, ctx.expected_structure
 
     if expected_structure and doc.get("salary_structure") and doc.get("salary_structure") != expected_structure:
         frappe.throw(_("Salary Structure '{0}' does not match employee {1}'s Tax Regime Preference ({2}). Expected: {3}")
@@ -60,23 +61,31 @@ def ensure_salary_structure_matches_regime(doc, method=None):
 
 def ensure_payroll_slips_match_regime(payroll_doc, method=None):
     """
-    Iterate payroll entries' employee list (or created Salary Slips) and ensure salary_structure set.
-    This runs before Payroll Entry submit — it attempts to update any not-yet-created or pre-created slips.
+    Hook: before_submit on Payroll Entry. Point every draft slip of the entry at its
+    employee's regime structure: regimes are resolved with one query and only slips on
+    the wrong structure are written.
     """
+    from girman_asgmt_app.payroll_shards import resolve_structures
+
     emp_list = []
     if hasattr(payroll_doc, "employees"):
         emp_list = [r.employee for r in getattr(payroll_doc, "employees") or []]
     elif getattr(payroll_doc, "employee", None):
         emp_list = [payroll_doc.employee]
+    if not emp_list:
+        return
 
-    for emp in emp_list:
-        regime = get_employee_regime(emp)
-        expected = REGIME_TO_STRUCTURE.get(regime)
-        ss_list = frappe.get_all("Salary Slip",
-                                filters={"employee": emp, "docstatus": 0, "payroll_entry": payroll_doc.name},
-                                fields=["name"])
-        for ss in ss_list:
-            frappe.db.set_value("Salary Slip", ss.name, "salary_structure", expected)
+    resolved = resolve_structures(emp_list)
+    slips = frappe.get_all("Salary Slip",
+                           filters={"employee": ("in", emp_list), "docstatus": 0, "payroll_entry": payroll_doc.name},
+                           fields=["name", "employee", "salary_structure"])
+    updates = {}
+    for ss in slips:
+        expected = resolved.get(ss.employee, (None, None))[1]
+        if expected and ss.salary_structure != expected:
+            updates[ss.name] = {"salary_structure": expected}
+    if updates:
+        frappe.db.bulk_update("Salary Slip", updates)
 
 
 def validate_salary_structure_assignment(doc, method=None):
@@ -94,3 +103,54 @@ def validate_salary_structure_assignment(doc, method=None):
             _("Salary Structure Assignment may only reference salary structures for Old/New tax regimes. "
               "Found: {ss}. Please choose one of: {allowed}").format(ss=ss, allowed=allowed_list)
         )
+
+
+def get_regime_structure_map():
+    """
+    Cached {regime: [salary structure names]} limited to mapped structures that are
+    submitted and active. Cleared by clear_regime_structure_cache on Salary Structure changes.
+    """
+    def build():
+        active = set(frappe.get_all(
+            "Salary Structure",
+            filters={"name": ("in", list(ALLOWED_STRUCTURES)), "docstatus": 1, "is_active": "Yes"},
+            pluck="name",
+        ))
+        return {regime: [ss] if ss in active else [] for regime, ss in REGIME_TO_STRUCTURE.items()}
+
+    return frappe.cache().get_value(REGIME_STRUCTURE_CACHE_KEY, generator=build)
+
+
+def clear_regime_structure_cache(doc=None, method=None):
+    """Hook: Salary Structure on_update / on_update_after_submit / on_cancel / on_trash."""
+    frappe.cache().delete_value(REGIME_STRUCTURE_CACHE_KEY)
+
+
+@frappe.whitelist()
+def get_allowed_salary_structures(employee=None, employees=None):
+    """
+    Salary structures an employee may be assigned, based on tax_regime_preference.
+
+    employee: single employee -> list of structure names
+    employees: list (or JSON list) of employees -> {employee: [structure names]}, resolved
+    with one Employee query regardless of how many are passed.
+    """
+    frappe.has_permission("Salary Structure Assignment", "read", throw=True)
+
+    names = [employee] if employee else (frappe.parse_json(employees) or [])
+    names = [n for n in names if n]
+    if not names:
+        return [] if employee else {}
+
+    regimes = dict(frappe.get_all(
+        "Employee",
+        filters={"name": ("in", names)},
+        fields=["name", "tax_regime_preference"],
+        as_list=True,
+    ))
+    structure_map = get_regime_structure_map()
+    allowed = {
+        n: structure_map.get(regimes.get(n) or DEFAULT_REGIME, [])
+        for n in names if n in regimes
+    }
+    return allowed.get(employee, []) if employee else allowed
@@ -0,0 +1,102 @@
+"""
+Incremental sync of this app's fixtures.
+
+The framework re-imports every file under `<app>/fixtures` on each migrate, which
+re-saves every Letter Head, Salary Component and demo Salary Structure. The app's
+fixtures therefore live in `synced_fixtures/` instead and are synced here: each record's
+content hash is stored as a global default, and only records whose hash changed (or
+that are missing from the site) are re-imported.
+
+Export with `bench --site <site> export-girman-fixtures` (replaces `export-fixtures`).
+"""
+import hashlib
+import json
+import os
+
+import frappe
+
+# (doctype, export filters, file name) in import order: components before the structures using them
+SYNCED_FIXTURES = (
+    ("Letter Head", None, "letter_head.json"),
+    ("Salary Component", None, "salary_component.json"),
+    ("Salary Structure", [["name", "like", "DEMO -%"]], "salary_structure.json"),
+)
+HASH_PREFIX = "girman_asgmt_app.fixture_hash::"
+# fields that change on every export/save without changing the record
+VOLATILE_FIELDS = {"modified", "creation", "owner", "modified_by"}
+CHILD_ROW_FIELDS = {"name", "parent", "parentfield", "parenttype"}
+
+
+def get_fixtures_path(*parts):
+    return frappe.get_app_path("girman_asgmt_app", "synced_fixtures", *parts)
+
+
+def _strip(value, top=True):
+    if isinstance(value, dict):
+        drop = VOLATILE_FIELDS if top else VOLATILE_FIELDS | CHILD_ROW_FIELDS
+        return {k: _strip(v, top=False) for k, v in value.items() if k not in drop}
+    if isinstance(value, list):
+        return [_strip(v, top=False) for v in value]
+    return value
+
+
+def content_hash(doc) -> str:
+    """Stable hash of a fixture record, ignoring timestamps and child row identities."""
+    payload = json.dumps(_strip(doc), sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _hash_key(doctype, name):
+    return f"{HASH_PREFIX}{doctype}::{name}"
+
+
+def _stored_hashes():
+    """All stored fixture hashes in one query: {defkey: hash}."""
+    return dict(frappe.get_all(
+        "DefaultValue",
+        filters={"parent": "__global", "defkey": ("like", f"{HASH_PREFIX}%")},
+        fields=["defkey", "defvalue"],
+        as_list=True,
+    ))
+
+
+def sync_fixtures():
+    """Hook: after_install / after_migrate. Re-import only fixture records whose content changed."""
+    from frappe.modules.import_file import import_doc
+
+    stored = _stored_hashes()
+    imported = skipped = 0
+
+    for doctype, _filters, fname in SYNCED_FIXTURES:
+        path = get_fixtures_path(fname)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            docs = json.load(f)
+        if isinstance(docs, dict):
+            docs = [docs]
+
+        existing = set(frappe.get_all(doctype, filters={"name": ("in", [d["name"] for d in docs])}, pluck="name"))
+        for doc in docs:
+            digest = content_hash(doc)
+            key = _hash_key(doctype, doc["name"])
+            if doc["name"] in existing and stored.get(key) == digest:
+                skipped += 1
+                continue
+
+            import_doc(frappe._dict(doc), data_import=True)
+            frappe.db.set_global(key, digest)
+            imported += 1
+
+    frappe.db.commit()
+    if imported:
+        print(f"girman_asgmt_app: re-imported {imported} fixture record(s), {skipped} unchanged")
+
+
+def export_fixtures():
+    """Write the app's fixture records to synced_fixtures/ in the framework's export format."""
+    from frappe.core.doctype.data_import.data_import import export_json
+
+    os.makedirs(get_fixtures_path(), exist_ok=True)
+    for doctype, filters, fname in SYNCED_FIXTURES:
+        export_json(doctype, get_fixtures_path(fname), filters=filters, order_by="name asc")
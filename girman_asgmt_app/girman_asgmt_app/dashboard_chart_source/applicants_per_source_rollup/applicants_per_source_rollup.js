@@ -0,0 +1,17 @@
+frappe.provide("frappe.dashboards.chart_sources");
+
+frappe.dashboards.chart_sources["Applicants per Source Rollup"] = {
+	method: "girman_asgmt_app.girman_asgmt_app.dashboard_chart_source.applicants_per_source_rollup.applicants_per_source_rollup.get",
+	filters: [
+		{
+			fieldname: "from_period",
+			label: __("From Period (YYYY-MM)"),
+			fieldtype: "Data",
+		},
+		{
+			fieldname: "to_period",
+			label: __("To Period (YYYY-MM)"),
+			fieldtype: "Data",
+		},
+	],
+};
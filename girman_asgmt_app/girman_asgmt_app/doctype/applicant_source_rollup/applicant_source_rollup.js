@@ -0,0 +1,8 @@
+// Copyright (c) 2025, Aditya and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Applicant Source Rollup", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,84 @@
+# Copyright (c) 2025, Aditya and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.events.job_applicant import (
+	ROLLUP_DOCTYPE,
+	_bump,
+	_rollup_name,
+	rebuild_applicant_source_rollup,
+)
+
+SOURCE = "_Test Rollup Source"
+OTHER_SOURCE = "_Test Rollup Other Source"
+PERIOD = "2025-10"
+
+
+def make_source(name):
+	if not frappe.db.exists("Job Applicant Source", name):
+		frappe.get_doc({"doctype": "Job Applicant Source", "source_name": name}).insert()
+	return name
+
+
+def make_applicant(email, source):
+	return frappe.get_doc(
+		{
+			"doctype": "Job Applicant",
+			"applicant_name": email.split("@")[0],
+			"email_id": email,
+			"source": source,
+		}
+	).insert()
+
+
+def get_counts(*sources):
+	rows = frappe.get_all(
+		ROLLUP_DOCTYPE,
+		filters={"source": ("in", sources)},
+		fields=["name", "source", "period", "applicant_count"],
+	)
+	return {r.name: (r.source, r.period, r.applicant_count) for r in rows}
+
+
+class TestApplicantSourceRollup(FrappeTestCase):
+	def setUp(self):
+		make_source(SOURCE)
+		make_source(OTHER_SOURCE)
+
+	def count(self, source=SOURCE):
+		return frappe.db.get_value(ROLLUP_DOCTYPE, _rollup_name(source, PERIOD), "applicant_count")
+
+	def test_bump_increments_and_decrements(self):
+		_bump(SOURCE, PERIOD, 1)
+		self.assertEqual(self.count(), 1)
+		_bump(SOURCE, PERIOD, 1)
+		self.assertEqual(self.count(), 2)
+		_bump(SOURCE, PERIOD, -1)
+		self.assertEqual(self.count(), 1)
+
+	def test_bump_never_goes_below_zero(self):
+		_bump(SOURCE, PERIOD, 1)
+		_bump(SOURCE, PERIOD, -1)
+		_bump(SOURCE, PERIOD, -1)
+		self.assertEqual(self.count(), 0)
+
+	def test_rebuild_matches_incremental_counts(self):
+		moved = make_applicant("rollup-a@example.com", SOURCE)
+		make_applicant("rollup-b@example.com", SOURCE)
+		trashed = make_applicant("rollup-c@example.com", OTHER_SOURCE)
+		moved.source = OTHER_SOURCE
+		moved.save()
+		trashed.delete()
+
+		incremental = get_counts(SOURCE, OTHER_SOURCE)
+		period = frappe.utils.getdate(moved.creation).strftime("%Y-%m")
+		self.assertEqual(incremental[_rollup_name(SOURCE, period)][2], 1)
+		self.assertEqual(incremental[_rollup_name(OTHER_SOURCE, period)][2], 1)
+
+		with patch.object(frappe.db, "commit"):
+			rebuild_applicant_source_rollup()
+		self.assertEqual(get_counts(SOURCE, OTHER_SOURCE), incremental)
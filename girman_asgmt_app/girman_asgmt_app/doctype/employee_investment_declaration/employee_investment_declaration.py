@@ -1,12 +1,14 @@
+import math
+
 import frappe
-from frappe.model.document import Document
 from frappe import _
-from frappe.utils import fmt_money
-
+from frappe.model.document import Document
+from frappe.utils import flt, fmt_money, getdate
 
 DEFAULT_80C_CAP = 150000
 DEFAULT_80D_CAP = 50000
 ENFORCE_CAPS = True
+UNIQUE_CONSTRAINT = "unique_employee_fiscal_year"
 
 class EmployeeInvestmentDeclaration(Document):
     def validate(self):
@@ -15,12 +17,13 @@ class EmployeeInvestmentDeclaration(Document):
          - required fields exist (DocType UI also enforces)
          - numeric fields are non-negative
          - compute total_exemption
-         - prevent duplicates for same employee + fiscal_year (unless this doc is the same)
          - enforce statutory caps (configurable)
+        Duplicates for the same employee + fiscal_year are rejected by the database on insert
+        (see db_insert), so saving costs no extra lookup.
         """
         self._ensure_non_negative_amounts()
         self._compute_total_exemption()
-        self._prevent_duplicate_declaration()
+        self._require_employee_and_fiscal_year()
         self._enforce_statutory_caps()
 
     def _ensure_non_negative_amounts(self):
@@ -38,29 +41,36 @@ class EmployeeInvestmentDeclaration(Document):
         total = (self.section_80c_amount or 0.0) + (self.section_80d_amount or 0.0) + (self.other_exemptions or 0.0)
         self.total_exemption = frappe.utils.flt(total, 2)
 
-    def _prevent_duplicate_declaration(self):
-        """
-        Prevent more than one declaration record for the same employee + fiscal_year
-        unless the current doc is the same record (i.e., updating).
-        """
+    def _require_employee_and_fiscal_year(self):
         if not (self.employee and self.fiscal_year):
             frappe.throw(_("Both Employee and Fiscal Year are required"))
 
-        existing = frappe.get_all(
+    def db_insert(self, *args, **kwargs):
+        """
+        Only one declaration may exist per employee + fiscal_year. The name is built from
+        both, so a second one fails on the primary key; turn that into a readable message.
+        """
+        try:
+            return super().db_insert(*args, **kwargs)
+        except frappe.DuplicateEntryError:
+            self._throw_duplicate(self.name)
+
+    def show_unique_validation_message(self, e):
+        """A renamed declaration can still collide on the (employee, fiscal_year) unique index."""
+        if frappe.db.db_type != "postgres" and UNIQUE_CONSTRAINT not in str(e):
+            return super().show_unique_validation_message(e)
+
+        self._throw_duplicate(frappe.db.get_value(
             "Employee Investment Declaration",
-            filters={
-                "employee": self.employee,
-                "fiscal_year": self.fiscal_year,
-                "name": ("!=", self.name or "")
-            },
-            fields=["name", "owner", "creation"],
-            limit=1
-        )
-        if existing:
-            frappe.throw(_(
-                "A declaration already exists for employee {0} in fiscal year {1}. "
-                "Open {2} to update or delete it before creating a new one."
-            ).format(self.employee, self.fiscal_year, existing[0].name))
+            {"employee": self.employee, "fiscal_year": self.fiscal_year},
+            "name",
+        ))
+
+    def _throw_duplicate(self, existing):
+        frappe.throw(_(
+            "A declaration already exists for employee {0} in fiscal year {1}. "
+            "Open {2} to update or delete it before creating a new one."
+        ).format(self.employee, self.fiscal_year, existing), frappe.UniqueValidationError)
 
     def _enforce_statutory_caps(self):
         """
@@ -98,3 +108,216 @@ class EmployeeInvestmentDeclaration(Document):
                 frappe.msgprint(w, title=_("Warning"), indicator="orange")
 
 
+def on_doctype_update():
+    """
+    (employee, fiscal_year) is unique and backs duplicate detection and per-employee lookups;
+    (fiscal_year, employee, total_exemption) lets the SUM lookups below be answered from the index.
+    """
+    frappe.db.add_unique(
+        "Employee Investment Declaration", ["employee", "fiscal_year"], constraint_name=UNIQUE_CONSTRAINT
+    )
+    frappe.db.add_index("Employee Investment Declaration", ["fiscal_year", "employee", "total_exemption"])
+
+
+def get_total_exemptions(employees, fiscal_year: str) -> dict:
+    """
+    Return {employee: total_exemption} for one employee (str) or many (list) in fiscal_year,
+    using a single aggregated query. Employees without a declaration and cancelled
+    declarations are omitted.
+    """
+    if not employees or not fiscal_year:
+        return {}
+    if isinstance(employees, str):
+        employees = [employees]
+
+    rows = frappe.get_all(
+        "Employee Investment Declaration",
+        filters={"fiscal_year": fiscal_year, "employee": ("in", list(set(employees))), "docstatus": ("!=", 2)},
+        fields=["employee", "sum(total_exemption) as total"],
+        group_by="employee",
+    )
+    return {r.employee: flt(r.total) for r in rows}
+
+
+AMOUNT_FIELDS = ("section_80c_amount", "section_80d_amount", "other_exemptions")
+STATUTORY_CAPS = {"section_80c_amount": DEFAULT_80C_CAP, "section_80d_amount": DEFAULT_80D_CAP}
+BULK_CHUNK_SIZE = 1000
+
+
+def _to_amount(value):
+    """Coerce a spreadsheet cell to float; returns None when it is not a (finite) number."""
+    if value in (None, ""):
+        return 0.0
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _to_date(value):
+    """Coerce a spreadsheet cell to a date; returns None when it is not a date."""
+    mute_messages = frappe.flags.mute_messages
+    # getdate reports a bad string with frappe.throw, which would also queue a message
+    frappe.flags.mute_messages = True
+    try:
+        return getdate(value)
+    except Exception:
+        return None
+    finally:
+        frappe.flags.mute_messages = mute_messages
+
+
+def _cell(row, fieldname) -> str:
+    value = row.get(fieldname)
+    return "" if value is None else str(value).strip()
+
+
+@frappe.whitelist()
+def bulk_upsert_declarations(declarations):
+    """
+    Insert or update many declarations in one call (e.g. the start-of-year spreadsheet load).
+
+    declarations: list of dicts (or its JSON) with employee, fiscal_year and optional
+    declaration_date / section_80c_amount / section_80d_amount / other_exemptions.
+
+    Checks are applied column-wise to the whole batch instead of running validate() per row:
+    amounts and dates are coerced and range-checked per column, caps are compared per column, and
+    existing (employee, fiscal_year) keys, employees and fiscal years are each fetched with
+    one query. Valid rows are written with multi-row INSERT / UPDATE statements.
+
+    Returns {"inserted": int, "updated": int, "errors": [{"row": idx, "message": str}]}
+    where idx is the 0-based position in the input list. A malformed row is reported there
+    and skipped; it never aborts the rest of the batch.
+    """
+    doctype = "Employee Investment Declaration"
+    frappe.has_permission(doctype, "create", throw=True)
+    frappe.has_permission(doctype, "write", throw=True)
+
+    rows = frappe.parse_json(declarations) or []
+    if not isinstance(rows, list):
+        frappe.throw(_("declarations must be a list"))
+
+    meta = frappe.get_meta(doctype)
+    labels = {fn: meta.get_field(fn).label for fn in AMOUNT_FIELDS}
+    errors = {}
+
+    def reject(idx, message):
+        errors.setdefault(idx, message)
+
+    for idx, r in enumerate(rows):
+        if not isinstance(r, dict):
+            reject(idx, _("Row must be an object with employee and fiscal_year"))
+    rows = [r if isinstance(r, dict) else {} for r in rows]
+
+    employees = [_cell(r, "employee") for r in rows]
+    fiscal_years = [_cell(r, "fiscal_year") for r in rows]
+    for idx, (emp, fy) in enumerate(zip(employees, fiscal_years, strict=True)):
+        if not (emp and fy):
+            reject(idx, _("Both Employee and Fiscal Year are required"))
+
+    declaration_dates = []
+    for idx, r in enumerate(rows):
+        value = r.get("declaration_date")
+        parsed = _to_date(value) if value not in (None, "") else None
+        if value not in (None, "") and parsed is None:
+            reject(idx, _("Declaration Date {0} is not a valid date").format(value))
+        declaration_dates.append(parsed)
+
+    # numeric columns
+    amounts = {}
+    for fn in AMOUNT_FIELDS:
+        column = [_to_amount(r.get(fn)) for r in rows]
+        for idx, value in enumerate(column):
+            if value is None:
+                reject(idx, _("{0} must be a number").format(labels[fn]))
+            elif value < 0:
+                reject(idx, _("{0} cannot be negative").format(labels[fn]))
+        amounts[fn] = [flt(v or 0.0, 2) for v in column]
+
+    if ENFORCE_CAPS:
+        for fn, cap in STATUTORY_CAPS.items():
+            if cap is None:
+                continue
+            for idx, value in enumerate(amounts[fn]):
+                if value > cap:
+                    reject(idx, _("{0} declared amount ({1}) exceeds the cap of {2}.").format(
+                        labels[fn], fmt_money(value), fmt_money(cap)
+                    ))
+
+    totals = [flt(a + b + c, 2) for a, b, c in zip(*(amounts[fn] for fn in AMOUNT_FIELDS), strict=True)]
+
+    # reference data: one query each
+    wanted_employees = {e for e in employees if e}
+    wanted_years = {fy for fy in fiscal_years if fy}
+    employee_names = dict(frappe.get_all(
+        "Employee", filters={"name": ("in", list(wanted_employees))}, fields=["name", "employee_name"], as_list=True
+    )) if wanted_employees else {}
+    known_years = set(frappe.get_all(
+        "Fiscal Year", filters={"name": ("in", list(wanted_years))}, pluck="name"
+    )) if wanted_years else set()
+    existing = {
+        (r.employee, r.fiscal_year): r.name
+        for r in frappe.get_all(
+            doctype,
+            filters={"employee": ("in", list(wanted_employees)), "fiscal_year": ("in", list(wanted_years))},
+            fields=["name", "employee", "fiscal_year"],
+        )
+    } if wanted_employees and wanted_years else {}
+
+    seen = {}
+    for idx, key in enumerate(zip(employees, fiscal_years, strict=True)):
+        if idx in errors:
+            continue
+        if key[0] not in employee_names:
+            reject(idx, _("Employee {0} not found").format(key[0]))
+        elif key[1] not in known_years:
+            reject(idx, _("Fiscal Year {0} not found").format(key[1]))
+        elif key in seen:
+            reject(idx, _("Duplicate of row {0} for employee {1} in fiscal year {2}").format(
+                seen[key], key[0], key[1]
+            ))
+        else:
+            seen[key] = idx
+
+    now = frappe.utils.now()
+    today = frappe.utils.today()
+    user = frappe.session.user
+    insert_fields = [
+        "name", "owner", "modified_by", "creation", "modified", "docstatus",
+        "employee", "employee_name", "fiscal_year", "declaration_date",
+        *AMOUNT_FIELDS, "total_exemption",
+    ]
+    inserts = []
+    updates = {}
+    for (emp, fy), idx in seen.items():
+        values = {fn: amounts[fn][idx] for fn in AMOUNT_FIELDS}
+        values["total_exemption"] = totals[idx]
+        declaration_date = declaration_dates[idx]
+        if (emp, fy) in existing:
+            if declaration_date:
+                values["declaration_date"] = declaration_date
+            updates[existing[(emp, fy)]] = values
+        else:
+            inserts.append((
+                f"{emp}-{fy}", user, user, now, now, 0,
+                emp, employee_names.get(emp), fy, declaration_date or today,
+                *(values[fn] for fn in AMOUNT_FIELDS), values["total_exemption"],
+            ))
+
+    if inserts:
+        frappe.db.bulk_insert(doctype, insert_fields, inserts, chunk_size=BULK_CHUNK_SIZE)
+    if updates:
+        frappe.db.bulk_update(doctype, updates, chunk_size=BULK_CHUNK_SIZE)
+    if inserts or updates:
+        from girman_asgmt_app.events.payroll import mark_draft_slips_stale
+        from girman_asgmt_app.tax.self_service import invalidate_employees
+
+        mark_draft_slips_stale([emp for emp, _fy in seen])
+        invalidate_employees([emp for emp, _fy in seen])
+
+    return {
+        "inserted": len(inserts),
+        "updated": len(updates),
+        "errors": [{"row": idx, "message": msg} for idx, msg in sorted(errors.items())],
+    }
@@ -1,9 +1,183 @@
 # Copyright (c) 2025, Aditya and Contributors
 # See license.txt
 
-# import frappe
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
 from frappe.tests.utils import FrappeTestCase
 
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+	bulk_upsert_declarations,
+	get_total_exemptions,
+)
+
+FISCAL_YEAR = "2025-2026"
+
+
+def make_fiscal_year(name=FISCAL_YEAR):
+	if not frappe.db.exists("Fiscal Year", name):
+		start = int(name[:4])
+		frappe.get_doc(
+			{
+				"doctype": "Fiscal Year",
+				"year": name,
+				"year_start_date": f"{start}-04-01",
+				"year_end_date": f"{start + 1}-03-31",
+			}
+		).insert()
+	return name
+
+
+def make_declaration(employee, fiscal_year=FISCAL_YEAR, **amounts):
+	return frappe.get_doc(
+		{
+			"doctype": "Employee Investment Declaration",
+			"employee": employee,
+			"fiscal_year": fiscal_year,
+			"declaration_date": f"{fiscal_year[:4]}-04-01",
+			**amounts,
+		}
+	).insert()
+
 
 class TestEmployeeInvestmentDeclaration(FrappeTestCase):
-	pass
+	def setUp(self):
+		make_fiscal_year()
+		self.employee = make_employee("investment-declaration@example.com")
+		self.other_employee = make_employee("investment-declaration-2@example.com")
+		frappe.db.delete(
+			"Employee Investment Declaration", {"employee": ("in", [self.employee, self.other_employee])}
+		)
+
+	def get_declaration(self, employee):
+		return frappe.db.get_value(
+			"Employee Investment Declaration",
+			{"employee": employee, "fiscal_year": FISCAL_YEAR},
+			["section_80c_amount", "section_80d_amount", "other_exemptions", "total_exemption"],
+			as_dict=True,
+		)
+
+	def test_duplicate_declaration_is_rejected(self):
+		first = make_declaration(self.employee, section_80c_amount=1000)
+		with self.assertRaises(frappe.UniqueValidationError) as raised:
+			make_declaration(self.employee, section_80c_amount=2000)
+		self.assertIn(first.name, str(raised.exception))
+		self.assertEqual(self.get_declaration(self.employee).section_80c_amount, 1000)
+
+	def test_resaving_a_declaration_is_not_a_duplicate(self):
+		doc = make_declaration(self.employee, section_80c_amount=1000)
+		doc.section_80c_amount = 3000
+		doc.save()
+		self.assertEqual(self.get_declaration(self.employee).total_exemption, 3000)
+
+	def test_total_exemptions_by_fiscal_year(self):
+		make_fiscal_year("2024-2025")
+		make_declaration(self.employee, section_80c_amount=1000, other_exemptions=500)
+		make_declaration(self.employee, "2024-2025", section_80c_amount=9000)
+		make_declaration(self.other_employee, section_80d_amount=2000)
+
+		self.assertEqual(
+			get_total_exemptions([self.employee, self.other_employee, "_T-No-Declaration"], FISCAL_YEAR),
+			{self.employee: 1500, self.other_employee: 2000},
+		)
+		self.assertEqual(get_total_exemptions(self.employee, "2024-2025"), {self.employee: 9000})
+		self.assertEqual(get_total_exemptions([], FISCAL_YEAR), {})
+
+	def test_total_exemptions_skip_cancelled_declarations(self):
+		doc = make_declaration(self.employee, section_80c_amount=1000)
+		frappe.db.set_value(doc.doctype, doc.name, "docstatus", 2)
+		self.assertEqual(get_total_exemptions(self.employee, FISCAL_YEAR), {})
+
+	def test_bulk_upsert_reports_row_errors(self):
+		result = bulk_upsert_declarations(
+			[
+				{"employee": "", "fiscal_year": "2025-2026"},
+				{"employee": "_T-EMP-1", "fiscal_year": "", "section_80c_amount": -1},
+				{"employee": "_T-EMP-1", "fiscal_year": "", "section_80d_amount": "abc"},
+			]
+		)
+		self.assertEqual(result["inserted"], 0)
+		self.assertEqual(result["updated"], 0)
+		self.assertEqual([e["row"] for e in result["errors"]], [0, 1, 2])
+
+	def test_bulk_upsert_inserts_new_declarations(self):
+		result = bulk_upsert_declarations(
+			[
+				{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": "1000.5"},
+				{
+					"employee": self.other_employee,
+					"fiscal_year": FISCAL_YEAR,
+					"section_80d_amount": 2000,
+					"other_exemptions": 300,
+				},
+			]
+		)
+		self.assertEqual(result, {"inserted": 2, "updated": 0, "errors": []})
+		self.assertEqual(self.get_declaration(self.employee).total_exemption, 1000.5)
+		other = self.get_declaration(self.other_employee)
+		self.assertEqual((other.section_80d_amount, other.other_exemptions), (2000, 300))
+		self.assertEqual(other.total_exemption, 2300)
+
+	def test_bulk_upsert_updates_existing_declaration(self):
+		make_declaration(self.employee, section_80c_amount=1000)
+		result = bulk_upsert_declarations(
+			[{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": 5000, "other_exemptions": 50}]
+		)
+		self.assertEqual(result, {"inserted": 0, "updated": 1, "errors": []})
+		stored = self.get_declaration(self.employee)
+		self.assertEqual((stored.section_80c_amount, stored.total_exemption), (5000, 5050))
+
+	def test_bulk_upsert_enforces_caps(self):
+		result = bulk_upsert_declarations(
+			[
+				{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": 150001},
+				{"employee": self.other_employee, "fiscal_year": FISCAL_YEAR, "section_80d_amount": 50000},
+			]
+		)
+		self.assertEqual((result["inserted"], result["updated"]), (1, 0))
+		self.assertEqual([e["row"] for e in result["errors"]], [0])
+		self.assertIn("exceeds the cap", result["errors"][0]["message"])
+		self.assertIsNone(self.get_declaration(self.employee))
+		self.assertEqual(self.get_declaration(self.other_employee).total_exemption, 50000)
+
+	def test_bulk_upsert_rejects_duplicates_within_batch(self):
+		result = bulk_upsert_declarations(
+			[
+				{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": 100},
+				{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": 200},
+			]
+		)
+		self.assertEqual(result["inserted"], 1)
+		self.assertEqual([e["row"] for e in result["errors"]], [1])
+		self.assertIn("Duplicate of row 0", result["errors"][0]["message"])
+		self.assertEqual(self.get_declaration(self.employee).section_80c_amount, 100)
+
+	def test_bulk_upsert_skips_one_malformed_row(self):
+		result = bulk_upsert_declarations(
+			[
+				{"employee": self.employee, "fiscal_year": FISCAL_YEAR, "declaration_date": "not-a-date"},
+				{"employee": self.other_employee, "fiscal_year": FISCAL_YEAR, "section_80c_amount": "1e999"},
+				"not a row",
+				{
+					"employee": self.employee,
+					"fiscal_year": FISCAL_YEAR,
+					"declaration_date": "2025-05-02",
+					"section_80c_amount": 700,
+				},
+			]
+		)
+		self.assertEqual(result["inserted"], 1)
+		self.assertEqual([e["row"] for e in result["errors"]], [0, 1, 2])
+		self.assertIn("not-a-date", result["errors"][0]["message"])
+		self.assertIn("must be a number", result["errors"][1]["message"])
+		self.assertEqual(self.get_declaration(self.employee).section_80c_amount, 700)
+		self.assertEqual(
+			str(
+				frappe.db.get_value(
+					"Employee Investment Declaration",
+					{"employee": self.employee, "fiscal_year": FISCAL_YEAR},
+					"declaration_date",
+				)
+			),
+			"2025-05-02",
+		)
+		self.assertIsNone(self.get_declaration(self.other_employee))
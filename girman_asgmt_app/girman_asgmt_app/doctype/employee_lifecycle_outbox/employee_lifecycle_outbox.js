@@ -0,0 +1,8 @@
+// Copyright (c) 2025, Aditya and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Employee Lifecycle Outbox", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,110 @@
+# Copyright (c) 2025, Aditya and Contributors
+# See license.txt
+
+from unittest.mock import MagicMock, patch
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.events import employee as lifecycle
+from girman_asgmt_app.events.employee import (
+	OUTBOX_DOCTYPE,
+	OUTBOX_MAX_ATTEMPTS,
+	_record_lifecycle_transition,
+	process_lifecycle_outbox,
+)
+
+STATE = "Confirmed"
+
+
+class Transition(frappe._dict):
+	"""Minimal stand-in for a saved Employee whose lifecycle_status just changed."""
+
+	def get_doc_before_save(self):
+		return frappe._dict(lifecycle_status=None)
+
+
+class TestEmployeeLifecycleOutbox(FrappeTestCase):
+	def setUp(self):
+		frappe.flags.girman_lifecycle_outbox = None
+		self.employee = make_employee("lifecycle-outbox@example.com")
+		frappe.db.set_value("Employee", self.employee, "lifecycle_status", STATE)
+		self.key = f"{self.employee}::{STATE}"
+
+	def tearDown(self):
+		frappe.flags.girman_lifecycle_outbox = None
+
+	def record(self):
+		frappe.flags.girman_lifecycle_outbox = None
+		_record_lifecycle_transition(Transition(name=self.employee, lifecycle_status=STATE))
+
+	def row(self):
+		return frappe.db.get_value(OUTBOX_DOCTYPE, self.key, ["status", "attempts"], as_dict=True)
+
+	def process(self, handler):
+		with (
+			patch.dict(lifecycle.LIFECYCLE_HANDLERS, {STATE: handler}),
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe.db, "rollback"),
+		):
+			process_lifecycle_outbox()
+
+	def calls(self, handler):
+		"""Handler calls for this test's employee (other pending rows may be processed too)."""
+		return sum(1 for c in handler.call_args_list if c.args[0].name == self.employee)
+
+	def test_repeated_transitions_collapse_into_one_row(self):
+		self.record()
+		self.record()
+		self.assertEqual(frappe.db.count(OUTBOX_DOCTYPE, {"employee": self.employee}), 1)
+		self.assertEqual(self.row(), {"status": "Pending", "attempts": 0})
+
+	def test_requeue_resets_attempts_of_finished_row(self):
+		self.record()
+		frappe.db.set_value(OUTBOX_DOCTYPE, self.key, {"status": "Failed", "attempts": OUTBOX_MAX_ATTEMPTS})
+		self.record()
+		self.assertEqual(self.row(), {"status": "Pending", "attempts": 0})
+
+	def test_requeue_keeps_attempts_of_pending_row(self):
+		self.record()
+		frappe.db.set_value(OUTBOX_DOCTYPE, self.key, "attempts", 1)
+		self.record()
+		self.assertEqual(self.row(), {"status": "Pending", "attempts": 1})
+
+	def test_rollback_forgets_recorded_transitions(self):
+		frappe.flags.girman_lifecycle_outbox = {self.key}
+		frappe.db.after_rollback.add(lifecycle._forget_lifecycle_transitions)
+		frappe.db.after_rollback.run()
+		self.assertIsNone(frappe.flags.girman_lifecycle_outbox)
+
+	def test_handler_runs_once(self):
+		self.record()
+		handler = MagicMock()
+		self.process(handler)
+		self.process(handler)
+		self.assertEqual(self.calls(handler), 1)
+		self.assertEqual(self.row().status, "Done")
+
+	def test_failing_handler_is_retried(self):
+		self.record()
+		self.process(MagicMock(side_effect=frappe.ValidationError))
+		self.assertEqual(self.row(), {"status": "Pending", "attempts": 1})
+
+		handler = MagicMock()
+		self.process(handler)
+		self.assertEqual(self.calls(handler), 1)
+		self.assertEqual(self.row().status, "Done")
+
+	def test_row_fails_after_max_attempts(self):
+		self.record()
+		handler = MagicMock(side_effect=frappe.ValidationError)
+		for _attempt in range(OUTBOX_MAX_ATTEMPTS):
+			self.process(handler)
+
+		self.assertEqual(self.calls(handler), OUTBOX_MAX_ATTEMPTS)
+		self.assertEqual(self.row(), {"status": "Failed", "attempts": OUTBOX_MAX_ATTEMPTS})
+		self.assertTrue(frappe.db.get_value(OUTBOX_DOCTYPE, self.key, "last_error"))
+
+		self.process(handler)
+		self.assertEqual(self.calls(handler), OUTBOX_MAX_ATTEMPTS)
@@ -47,6 +47,18 @@ frappe.query_reports["Tax Regime Comparison"] = {
             }
             report.refresh();
         });
+
+        const stream_export = function(file_format) {
+            const f = report.get_values();
+            if (!f || !f.from_date || !f.to_date) {
+                frappe.msgprint({ title: __("Missing dates"), message: __("Please select both From Date and To Date before exporting."), indicator: "red" });
+                return;
+            }
+            const args = new URLSearchParams({ filters: JSON.stringify(f), file_format: file_format });
+            window.open("/api/method/girman_asgmt_app.girman_asgmt_app.report.tax_regime_comparison.tax_regime_comparison.export_comparison?" + args.toString());
+        };
+        report.page.add_inner_button(__("CSV"), () => stream_export("CSV"), __("Export (Streamed)"));
+        report.page.add_inner_button(__("Excel"), () => stream_export("XLSX"), __("Export (Streamed)"));
     },
 
     formatter: function(value, row, column, data, default_formatter) {
@@ -2,14 +2,14 @@ import frappe
 from frappe import _
 from frappe.utils import flt, getdate
 
-FALLBACK_REGIME_TO_STRUCTURE = {
-    "Old Regime": "DEMO - Salary Structure - Old Regime",
-    "New Regime": "DEMO - Salary Structure - New Regime",
-}
+from girman_asgmt_app.bootstrap import get_master_data
+from girman_asgmt_app.replica import write_guard
+from girman_asgmt_app.tax.components import INCOME_TAX, get_component_classes
+
 
 def get_mapping_from_settings():
-    mapping = FALLBACK_REGIME_TO_STRUCTURE.copy()
-    return mapping
+    """Regime -> salary structure mapping from the bootstrap snapshot (memoized per worker)."""
+    return get_master_data().regime_to_structure
 
 def _safe_get_amount_from_deduction_row(d):
     if isinstance(d, dict):
@@ -90,31 +90,32 @@ def compute_tax_for_employee(employee, salary_structure_name, start_date, end_da
         frappe.log_error(message=f"Failed to construct in-memory Salary Slip for {employee} / {salary_structure_name}: {e}", title="Tax Regime Report: doc creation failed")
         return 0.0
 
+    classes = get_component_classes()
     tax_amount = 0.0
     for d in getattr(ss, "deductions", []) or []:
-        comp_name = (_safe_get_salary_component_name(d) or "").lower()
-        amt = _safe_get_amount_from_deduction_row(d)
-        if any(k in comp_name for k in ("tax", "tds", "income tax", "professional tax")):
-            tax_amount += flt(amt)
-
-    if flt(tax_amount) == 0.0:
-        for d in getattr(ss, "deductions", []) or []:
-            comp_name = (_safe_get_salary_component_name(d) or "").lower()
-            if "income" in comp_name:
-                tax_amount += _safe_get_amount_from_deduction_row(d)
+        if classes.get(_safe_get_salary_component_name(d)) == INCOME_TAX:
+            tax_amount += _safe_get_amount_from_deduction_row(d)
 
     return flt(tax_amount)
 
 
-def execute(filters=None):
-    """
-    Script report entrypoint called by ERPNext.
-    Filters required: from_date, to_date
-    Optional filters: company, employee, department
-    """
-    if filters is None:
-        filters = {}
+EMPLOYEE_PAGE_SIZE = 1000
+EXPORT_FORMATS = ("CSV", "XLSX")
 
+
+def get_columns():
+    return [
+        _("Employee") + ":Link/Employee:120",
+        _("Employee Name") + "::160",
+        _("Company") + ":Link/Company:140",
+        _("Tax (Old)") + ":Currency:120",
+        _("Tax (New)") + ":Currency:120",
+        _("Difference (Old - New)") + ":Currency:120",
+        _("Recommended") + "::120",
+    ]
+
+
+def _validate_dates(filters):
     if not filters.get("from_date") or not filters.get("to_date"):
         frappe.throw(_("Please select From Date and To Date (both are mandatory)."))
 
@@ -127,40 +128,174 @@ def execute(filters=None):
     if from_date > to_date:
         frappe.throw(_("From Date cannot be after To Date."))
 
+    return from_date, to_date
+
+
+def iter_rows(filters, limit=None):
+    """
+    Yield report rows one employee at a time. Employees are read in name-ordered pages of
+    EMPLOYEE_PAGE_SIZE, so memory stays flat however many employees match.
+    """
+    from_date, to_date = _validate_dates(filters)
+
     mapping = get_mapping_from_settings()
     old_structure = mapping.get("Old Regime")
     new_structure = mapping.get("New Regime")
 
-    columns = [
-        _("Employee") + ":Link/Employee:120",
-        _("Employee Name") + "::160",
-        _("Company") + ":Link/Company:140",
-        _("Tax (Old)") + ":Currency:120",
-        _("Tax (New)") + ":Currency:120",
-        _("Difference (Old - New)") + ":Currency:120",
-        _("Recommended") + "::120",
-    ]
-
-    emp_filters = {}
+    emp_filters = []
     if filters.get("company"):
-        emp_filters["company"] = filters.get("company")
+        emp_filters.append(["company", "=", filters.get("company")])
     if filters.get("employee"):
-        emp_filters["name"] = filters.get("employee")
+        emp_filters.append(["name", "=", filters.get("employee")])
     if filters.get("department"):
-        emp_filters["department"] = filters.get("department")
+        emp_filters.append(["department", "=", filters.get("department")])
 
-    employees = frappe.get_all("Employee", filters=emp_filters, fields=["name", "employee_name", "company"], limit_page_length=1000)
+    last_name = ""
+    produced = 0
+    while True:
+        page_size = EMPLOYEE_PAGE_SIZE if limit is None else min(EMPLOYEE_PAGE_SIZE, limit - produced)
+        if page_size <= 0:
+            return
+        employees = frappe.get_all(
+            "Employee",
+            filters=[*emp_filters, ["name", ">", last_name]],
+            fields=["name", "employee_name", "company"],
+            order_by="name asc",
+            limit_page_length=page_size,
+        )
 
-    data = []
-    for e in employees:
-        try:
-            old_tax = compute_tax_for_employee(e["name"], old_structure, from_date, to_date)
-            new_tax = compute_tax_for_employee(e["name"], new_structure, from_date, to_date)
-            diff = flt(old_tax) - flt(new_tax)
-            recommended = "New Regime" if diff > 0 else "Old Regime"
-            data.append([e["name"], e.get("employee_name"), e.get("company"), old_tax, new_tax, diff, recommended])
-        except Exception as exc:
-            frappe.log_error(message=f"Tax Regime comparison error for employee {e.get('name')}: {exc}", title="Tax Regime Report: compute error")
-            data.append([e["name"], e.get("employee_name"), e.get("company"), _("Error"), _("Error"), _("Error"), _("Error")])
-
-    return columns, data
+        for e in employees:
+            try:
+                old_tax = compute_tax_for_employee(e["name"], old_structure, from_date, to_date)
+                new_tax = compute_tax_for_employee(e["name"], new_structure, from_date, to_date)
+                diff = flt(old_tax) - flt(new_tax)
+                recommended = "New Regime" if diff > 0 else "Old Regime"
+                yield [e["name"], e.get("employee_name"), e.get("company"), old_tax, new_tax, diff, recommended]
+            except Exception as exc:
+                frappe.log_error(message=f"Tax Regime comparison error for employee {e.get('name')}: {exc}", title="Tax Regime Report: compute error")
+                yield [e["name"], e.get("employee_name"), e.get("company"), _("Error"), _("Error"), _("Error"), _("Error")]
+
+        produced += len(employees)
+        if len(employees) < page_size:
+            return
+        last_name = employees[-1]["name"]
+
+
+def execute(filters=None):
+    """
+    Script report entrypoint called by ERPNext.
+    Filters required: from_date, to_date
+    Optional filters: company, employee, department
+    """
+    if filters is None:
+        filters = {}
+
+    _validate_dates(filters)
+    # query_report.run has already routed frappe.db to the replica
+    with write_guard():
+        data = list(iter_rows(filters, limit=EMPLOYEE_PAGE_SIZE))
+    return get_columns(), data
+
+
+@frappe.whitelist()
+def export_comparison(filters=None, file_format="CSV"):
+    """
+    Export the comparison as CSV or XLSX without building the full data list.
+
+    CSV is streamed: rows are sent page by page as they are computed. XLSX is not: it is a
+    zip archive that can only be finalised once every row is written, so no byte is sent
+    before the whole workbook exists. Its rows go through a write-only workbook into
+    temporary files on disk rather than memory, and the finished file is sent in blocks.
+    """
+    from werkzeug.wrappers import Response
+
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    file_format = (file_format or "CSV").upper()
+    if file_format not in EXPORT_FORMATS:
+        frappe.throw(_("Unsupported export format: {0}").format(file_format))
+    if not frappe.get_doc("Report", "Tax Regime Comparison").is_permitted():
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+    _validate_dates(filters)
+
+    site, user = frappe.local.site, frappe.session.user
+    headers = [c.split(":")[0] for c in get_columns()]
+    body = _stream_csv if file_format == "CSV" else _stream_xlsx
+    filename = f"tax_regime_comparison_{filters.from_date}_{filters.to_date}.{file_format.lower()}"
+    mimetype = (
+        "text/csv" if file_format == "CSV"
+        else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+    response = Response(_in_site_context(site, user, body, headers, filters), mimetype=mimetype, direct_passthrough=True)
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _in_site_context(site, user, body, *args):
+    """
+    Run body with a site context and database connection.
+
+    Behind the web server the body is iterated after the request's context has been
+    destroyed, so a fresh one is initialised, connected (to the replica when one is
+    configured, as @frappe.read_only() would) and destroyed when the stream ends. When the
+    body is iterated while a context is still live (e.g. in tests or a console), frappe.init
+    would be a no-op, so that context is used as it is and left for its owner to tear down.
+    """
+    owns_context = not getattr(frappe.local, "initialised", False)
+    if owns_context:
+        frappe.init(site=site)
+        frappe.connect()
+        frappe.set_user(user)
+        if frappe.conf.read_from_replica:
+            frappe.connect_replica()
+    try:
+        with write_guard():
+            yield from body(*args)
+    finally:
+        if owns_context:
+            if primary := getattr(frappe.local, "primary_db", None):
+                primary.close()
+            frappe.destroy()
+
+
+def _stream_csv(headers, filters):
+    """Send the header at once, then each page of EMPLOYEE_PAGE_SIZE rows as it is computed."""
+    import csv
+    import io
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def flush():
+        chunk = buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+        return chunk
+
+    writer.writerow(headers)
+    yield flush()
+    for i, row in enumerate(iter_rows(filters), 1):
+        writer.writerow(row)
+        if i % EMPLOYEE_PAGE_SIZE == 0:
+            yield flush()
+    if buf.tell():
+        yield flush()
+
+
+def _stream_xlsx(headers, filters):
+    """Build the whole workbook on disk, then send it in blocks (see export_comparison)."""
+    import tempfile
+
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(_("Tax Regime Comparison"))
+    ws.append(headers)
+    for row in iter_rows(filters):
+        ws.append(row)
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while chunk := tmp.read(64 * 1024):
+            yield chunk
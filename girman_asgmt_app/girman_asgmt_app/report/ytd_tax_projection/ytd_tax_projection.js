@@ -0,0 +1,46 @@
+frappe.query_reports["YTD Tax Projection"] = {
+	filters: [
+		{
+			fieldname: "company",
+			label: __("Company"),
+			fieldtype: "Link",
+			options: "Company",
+			reqd: 1,
+			default: frappe.defaults.get_default("company") || "",
+		},
+		{
+			fieldname: "fiscal_year",
+			label: __("Fiscal Year"),
+			fieldtype: "Link",
+			options: "Fiscal Year",
+		},
+		{
+			fieldname: "as_of_date",
+			label: __("As Of"),
+			fieldtype: "Date",
+			default: frappe.datetime.get_today(),
+		},
+		{
+			fieldname: "department",
+			label: __("Department"),
+			fieldtype: "Link",
+			options: "Department",
+		},
+		{
+			fieldname: "employee",
+			label: __("Employee"),
+			fieldtype: "Link",
+			options: "Employee",
+		},
+	],
+
+	formatter: function (value, row, column, data, default_formatter) {
+		const formatted = default_formatter(value, row, column, data);
+		if ((column.label || "").toLowerCase().includes("shortfall")) {
+			const v = parseFloat(value) || 0;
+			if (v > 0) return `<span style="color: #d9534f; font-weight:600">${formatted}</span>`;
+			if (v < 0) return `<span style="color: #5cb85c; font-weight:600">${formatted}</span>`;
+		}
+		return formatted;
+	},
+};
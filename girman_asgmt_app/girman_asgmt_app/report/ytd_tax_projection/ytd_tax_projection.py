@@ -0,0 +1,56 @@
+import frappe
+from frappe import _
+
+from girman_asgmt_app.replica import write_guard
+from girman_asgmt_app.tax.projection import project_tax
+
+
+def execute(filters=None):
+    """
+    Script report entrypoint.
+    Filters required: company
+    Optional filters: fiscal_year, as_of_date, department, employee
+    """
+    filters = frappe._dict(filters or {})
+    if not filters.get("company"):
+        frappe.throw(_("Please select a Company."))
+
+    columns = [
+        _("Employee") + ":Link/Employee:120",
+        _("Employee Name") + "::160",
+        _("Regime") + "::100",
+        _("YTD Gross") + ":Currency:120",
+        _("Projected Gross") + ":Currency:130",
+        _("Declared Exemptions") + ":Currency:130",
+        _("Projected Tax (Old)") + ":Currency:130",
+        _("Projected Tax (New)") + ":Currency:130",
+        _("Projected Tax") + ":Currency:120",
+        _("YTD TDS") + ":Currency:120",
+        _("Shortfall / (Excess) TDS") + ":Currency:150",
+        _("Remaining Months") + ":Int:90",
+        _("Monthly TDS Needed") + ":Currency:140",
+    ]
+
+    employee_filters = {}
+    if filters.get("department"):
+        employee_filters["department"] = filters.department
+    if filters.get("employee"):
+        employee_filters["name"] = filters.employee
+
+    # query_report.run has already routed frappe.db to the replica
+    with write_guard():
+        rows = project_tax(
+            filters.company,
+            fiscal_year=filters.get("fiscal_year"),
+            as_of=filters.get("as_of_date"),
+            employee_filters=employee_filters,
+        )
+
+    data = [
+        [
+            r.employee, r.employee_name, r.regime, r.ytd_gross, r.projected_gross, r.exemptions,
+            r.tax_old, r.tax_new, r.projected_tax, r.ytd_tds, r.shortfall, r.remaining_months, r.monthly_tds,
+        ]
+        for r in rows
+    ]
+    return columns, data
@@ -10,11 +10,9 @@ app_license = "mit"
 
 required_apps = ["erpnext", "hrms"]
 
-fixtures = [
-    {"dt": "Letter Head"},
-     {"dt": "Salary Component"},
-     {"dt": "Salary Structure", "filters": [["name", "like", "DEMO -%"]]}
-]
+# Letter Head, Salary Component and the "DEMO -" Salary Structures are not framework
+# fixtures: they live in synced_fixtures/ and are re-imported only when their content
+# hash changes (see girman_asgmt_app.fixture_sync).
 
 # Each item in the list will be shown as an app in the apps page
 # add_to_apps_screen = [
@@ -49,7 +47,10 @@ fixtures = [
 # page_js = {"page" : "public/js/file.js"}
 
 # include js in doctype views
-doctype_js = {"Salary Structure Assignment" : "public/js/doctypes/salary_structure_assignment.js"}
+doctype_js = {
+    "Salary Structure Assignment" : "public/js/doctypes/salary_structure_assignment.js",
+    "Payroll Entry" : "public/js/doctypes/payroll_entry.js",
+}
 # doctype_list_js = {"doctype" : "public/js/doctype_list.js"}
 # doctype_tree_js = {"doctype" : "public/js/doctype_tree.js"}
 # doctype_calendar_js = {"doctype" : "public/js/doctype_calendar.js"}
@@ -89,7 +90,16 @@ doctype_js = {"Salary Structure Assignment" : "public/js/doctypes/salary_structu
 # ------------
 
 # before_install = "girman_asgmt_app.install.before_install"
-# after_install = "girman_asgmt_app.install.after_install"
+after_install = [
+    "girman_asgmt_app.fixture_sync.sync_fixtures",
+    "girman_asgmt_app.bootstrap.bootstrap",
+]
+
+after_migrate = [
+    "girman_asgmt_app.fixture_sync.sync_fixtures",
+    "girman_asgmt_app.bootstrap.bootstrap",
+    "girman_asgmt_app.tax.self_service.invalidate_all",
+]
 
 # Uninstallation
 # ------------
@@ -146,7 +156,10 @@ doctype_js = {"Salary Structure Assignment" : "public/js/doctypes/salary_structu
 doc_events = {
     "Employee": {
         "after_insert": "girman_asgmt_app.events.employee.on_employee_after_insert",
-        "on_update": "girman_asgmt_app.events.employee.on_employee_on_update",
+        "on_update": [
+            "girman_asgmt_app.events.employee.on_employee_on_update",
+            "girman_asgmt_app.tax.self_service.invalidate_employee",
+        ],
         "after_save": "girman_asgmt_app.events.employee.on_employee_after_save",
     },
     "Salary Slip": {
@@ -155,35 +168,85 @@ doc_events = {
             "girman_asgmt_app.events.payroll.adjust_salary_slip_with_investments"
         ],
         "before_save": "girman_asgmt_app.events.tax_regime.set_salary_structure_for_employee",
+        "on_submit": "girman_asgmt_app.tax.self_service.invalidate_employee",
+        "on_cancel": "girman_asgmt_app.tax.self_service.invalidate_employee",
+    },
+    "Salary Structure": {
+        "on_update": [
+            "girman_asgmt_app.events.tax_regime.clear_regime_structure_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+        "on_update_after_submit": [
+            "girman_asgmt_app.events.tax_regime.clear_regime_structure_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+        "on_cancel": [
+            "girman_asgmt_app.events.tax_regime.clear_regime_structure_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+        "on_trash": [
+            "girman_asgmt_app.events.tax_regime.clear_regime_structure_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
     },
     "Salary Structure Assignment": {
         "validate": "girman_asgmt_app.events.tax_regime.validate_salary_structure_assignment",
+        "on_submit": "girman_asgmt_app.tax.self_service.invalidate_employee",
+        "on_cancel": "girman_asgmt_app.tax.self_service.invalidate_employee",
+    },
+    "Salary Component": {
+        "on_update": [
+            "girman_asgmt_app.bootstrap.invalidate_master_data",
+            "girman_asgmt_app.tax.components.clear_component_class_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+        "after_rename": [
+            "girman_asgmt_app.tax.components.clear_component_class_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+        "on_trash": [
+            "girman_asgmt_app.bootstrap.invalidate_master_data",
+            "girman_asgmt_app.tax.components.clear_component_class_cache",
+            "girman_asgmt_app.tax.self_service.invalidate_all",
+        ],
+    },
+    "HR Settings": {
+        "on_update": "girman_asgmt_app.bootstrap.invalidate_master_data",
     },
     "Payroll Entry": {
         "before_submit": "girman_asgmt_app.events.tax_regime.ensure_payroll_slips_match_regime",
+    },
+    "Job Applicant": {
+        "after_insert": "girman_asgmt_app.events.job_applicant.on_job_applicant_after_insert",
+        "on_update": "girman_asgmt_app.events.job_applicant.on_job_applicant_on_update",
+        "on_trash": "girman_asgmt_app.events.job_applicant.on_job_applicant_on_trash",
+    },
+    "Employee Investment Declaration": {
+        "on_update": [
+            "girman_asgmt_app.events.payroll.queue_draft_slip_refresh",
+            "girman_asgmt_app.tax.self_service.invalidate_employee",
+        ],
+        "on_trash": [
+            "girman_asgmt_app.events.payroll.queue_draft_slip_refresh",
+            "girman_asgmt_app.tax.self_service.invalidate_employee",
+        ],
     }
 }
 
 # Scheduled Tasks
 # ---------------
 
-# scheduler_events = {
-# 	"all": [
-# 		"girman_asgmt_app.tasks.all"
-# 	],
-# 	"daily": [
-# 		"girman_asgmt_app.tasks.daily"
-# 	],
-# 	"hourly": [
-# 		"girman_asgmt_app.tasks.hourly"
-# 	],
-# 	"weekly": [
-# 		"girman_asgmt_app.tasks.weekly"
-# 	],
-# 	"monthly": [
-# 		"girman_asgmt_app.tasks.monthly"
-# 	],
-# }
+scheduler_events = {
+    "cron": {
+        "* * * * *": [
+            "girman_asgmt_app.events.payroll.process_pending_slip_refreshes",
+            "girman_asgmt_app.events.employee.process_lifecycle_outbox",
+        ]
+    },
+    "hourly": [
+        "girman_asgmt_app.payroll_shards.fail_stale_shard_runs",
+    ],
+}
 
 # Testing
 # -------
@@ -216,12 +279,12 @@ doc_events = {
 # Request Events
 # ----------------
 # before_request = ["girman_asgmt_app.utils.before_request"]
-# after_request = ["girman_asgmt_app.utils.after_request"]
+after_request = ["girman_asgmt_app.events.employee.flush_bulk_probation_updates"]
 
 # Job Events
 # ----------
 # before_job = ["girman_asgmt_app.utils.before_job"]
-# after_job = ["girman_asgmt_app.utils.after_job"]
+after_job = ["girman_asgmt_app.events.employee.flush_bulk_probation_updates"]
 
 # User Data Protection
 # --------------------
@@ -0,0 +1,11 @@
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+    on_doctype_update,
+)
+
+
+def execute():
+    """
+    on_doctype_update only runs when the DocType is re-synced; apply the
+    (employee, fiscal_year) unique constraint and the exemption lookup index on existing sites.
+    """
+    on_doctype_update()
@@ -0,0 +1,69 @@
+import frappe
+
+from girman_asgmt_app.events.employee import _compute_probation_dates, _get_default_probation_days
+
+CHUNK_SIZE = 1000
+CHECKPOINT_KEY = "girman_asgmt_app.backfill_employee_checkpoint"
+DEFAULT_TAX_REGIME = "Old Regime"
+PROBATION_FIELDS = ("probation_start", "probation_end", "final_confirmation_date")
+
+
+def execute():
+    """
+    Populate probation dates and tax_regime_preference for existing Employees.
+
+    Rows are read in name-ordered (keyset) chunks and written with one bulk UPDATE
+    per chunk. The last processed name is committed together with each chunk, so an
+    interrupted migrate resumes where it stopped instead of starting over.
+    """
+    columns = set(frappe.db.get_table_columns("Employee"))
+    probation_fields = [f for f in PROBATION_FIELDS if f in columns]
+    has_regime = "tax_regime_preference" in columns
+    if not (probation_fields or has_regime):
+        return
+
+    missing = [[f, "is", "not set"] for f in probation_fields]
+    if has_regime:
+        missing.append(["tax_regime_preference", "is", "not set"])
+
+    days = _get_default_probation_days()
+    last_name = frappe.db.get_global(CHECKPOINT_KEY) or ""
+
+    while True:
+        rows = frappe.get_all(
+            "Employee",
+            filters=[["name", ">", last_name]],
+            or_filters=missing,
+            fields=["name", "date_of_joining", *probation_fields, *(["tax_regime_preference"] if has_regime else [])],
+            order_by="name asc",
+            limit_page_length=CHUNK_SIZE,
+        )
+        if not rows:
+            break
+
+        updates = {}
+        for row in rows:
+            values = {}
+            if probation_fields and not all(row.get(f) for f in probation_fields):
+                ps, pe, conf = _compute_probation_dates(row.date_of_joining, days)
+                values.update({"probation_start": ps, "probation_end": pe})
+                if not row.get("final_confirmation_date"):
+                    values["final_confirmation_date"] = conf
+                values = {k: v for k, v in values.items() if k in probation_fields}
+            if has_regime and not row.get("tax_regime_preference"):
+                values["tax_regime_preference"] = DEFAULT_TAX_REGIME
+            if values:
+                updates[row.name] = values
+
+        if updates:
+            frappe.db.bulk_update("Employee", updates, chunk_size=CHUNK_SIZE, update_modified=False)
+
+        last_name = rows[-1].name
+        frappe.db.set_global(CHECKPOINT_KEY, last_name)
+        frappe.db.commit()
+
+        if len(rows) < CHUNK_SIZE:
+            break
+
+    frappe.defaults.clear_default(key=CHECKPOINT_KEY, parent="__global")
+    frappe.db.commit()
@@ -0,0 +1,6 @@
+from girman_asgmt_app.events.job_applicant import rebuild_applicant_source_rollup
+
+
+def execute():
+    """Seed Applicant Source Rollup from existing Job Applicants; hooks keep it current afterwards."""
+    rebuild_applicant_source_rollup()
@@ -7,6 +7,7 @@ def execute():
     """
     ensure_hr_setting_field()
     ensure_employee_fields()
+    frappe.db.commit()
 
 def ensure_hr_setting_field():
     doctype = "HR Settings"
@@ -26,7 +27,6 @@ def ensure_hr_setting_field():
             if not hr.get(fieldname):
                 hr.set(fieldname, 90)
                 hr.save(ignore_permissions=True)
-                frappe.db.commit()
         except Exception:
             pass
     else:
@@ -40,21 +40,26 @@ def ensure_employee_fields():
         dict(fieldname="lifecycle_status", label="Lifecycle Status", fieldtype="Select", insert_after="status", options="\nProbation\nConfirmed\nExited"),
         dict(fieldname="experience_letter", label="Experience Letter", fieldtype="Attach", insert_after="leave_encashed"),
     ]
+    existing = get_fieldnames(doctype)
     for f in fields:
-        if not field_exists(doctype, f["fieldname"]):
+        if f["fieldname"] not in existing:
             print(f"Adding field {f['fieldname']} to {doctype}")
             add_field_customize(doctype, f)
         else:
             print(f"{doctype}.{f['fieldname']} exists")
 
 # utility helpers
-def field_exists(doctype, fieldname):
+def get_fieldnames(doctype):
+    """Return the set of fieldnames on doctype, loading meta only once."""
     try:
-        meta = frappe.get_meta(doctype)
-        return any(f.fieldname == fieldname for f in meta.fields)
+        return {f.fieldname for f in frappe.get_meta(doctype).fields}
     except Exception:
-        # fallback: check Customize Form
-        return bool(frappe.db.get_value("Custom Field", {"dt": doctype, "fieldname": fieldname}))
+        # fallback: check Custom Field
+        return set(frappe.get_all("Custom Field", filters={"dt": doctype}, pluck="fieldname"))
+
+
+def field_exists(doctype, fieldname):
+    return fieldname in get_fieldnames(doctype)
 
 def add_field_customize(doctype, field_dict):
     """
@@ -73,7 +78,6 @@ def add_field_customize(doctype, field_dict):
     })
     try:
         cf.save()
-        frappe.db.commit()
     except Exception:
         # fallback: create as Custom Field directly
         frappe.get_doc({
@@ -81,4 +85,3 @@ def add_field_customize(doctype, field_dict):
             "dt": doctype,
             **field_dict
         }).insert(ignore_permissions=True)
-        frappe.db.commit()
@@ -0,0 +1,250 @@
+"""
+Sharded Salary Slip creation for large Payroll Entries.
+
+`create_salary_slips_sharded` resolves every employee's regime-correct salary structure
+with one Employee query and their declared investment totals with one grouped query,
+then splits the employees into shards of SHARD_SIZE and enqueues one background job per
+shard. Workers insert slips with the resolved values attached as document flags, so the
+Salary Slip hooks neither look the regime up again nor wipe and recompute the earnings
+and deductions, and commit every COMMIT_BATCH_SIZE slips.
+
+Shard progress is tracked in a Redis hash per Payroll Entry and an atomic counter of
+finished shards; the shard whose increment reaches the shard count is the one that marks
+the Payroll Entry as having its slips created. Shards that never report (a worker killed
+outright, a lost job) are caught by fail_stale_shard_runs. Employees that already have a
+slip for the entry are skipped, so the whole operation can be re-run after a failure.
+"""
+import time
+
+import frappe
+from frappe import _
+
+from girman_asgmt_app.events.payroll import _fiscal_year_from_date
+from girman_asgmt_app.events.tax_regime import DEFAULT_REGIME, REGIME_TO_STRUCTURE
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+    get_total_exemptions,
+)
+
+SHARD_SIZE = 500
+COMMIT_BATCH_SIZE = 50
+SHARD_JOB_TIMEOUT = 3600
+# a run is given up once no shard has reported for this long
+STALE_SHARD_RUN_SECONDS = 2 * SHARD_JOB_TIMEOUT
+SHARD_STATUS_KEY = "girman_asgmt_app:slip_shards::{0}"
+SHARD_FINISHED_KEY = "girman_asgmt_app:slip_shards_finished::{0}"
+# {payroll entry: time a shard last reported (or the run was queued)} for runs in flight
+SHARD_RUNS_KEY = "girman_asgmt_app:slip_shard_runs"
+PENDING, DONE = "pending", "done"
+
+
+def resolve_structures(employees):
+    """{employee: (regime, salary structure)} for employees, with one query."""
+    if not employees:
+        return {}
+    regimes = frappe.get_all(
+        "Employee",
+        filters={"name": ("in", list(employees))},
+        fields=["name", "tax_regime_preference"],
+        as_list=True,
+    )
+    out = {}
+    for name, regime in regimes:
+        regime = regime or DEFAULT_REGIME
+        out[name] = (regime, REGIME_TO_STRUCTURE.get(regime))
+    return out
+
+
+def _slip_args(payroll_entry):
+    """Salary Slip values shared by every slip of payroll_entry (as HRMS builds them)."""
+    return frappe._dict(
+        salary_slip_based_on_timesheet=payroll_entry.salary_slip_based_on_timesheet,
+        payroll_frequency=payroll_entry.payroll_frequency,
+        start_date=payroll_entry.start_date,
+        end_date=payroll_entry.end_date,
+        company=payroll_entry.company,
+        posting_date=payroll_entry.posting_date,
+        deduct_tax_for_unclaimed_employee_benefits=payroll_entry.deduct_tax_for_unclaimed_employee_benefits,
+        deduct_tax_for_unsubmitted_tax_exemption_proof=payroll_entry.deduct_tax_for_unsubmitted_tax_exemption_proof,
+        payroll_entry=payroll_entry.name,
+        exchange_rate=payroll_entry.exchange_rate,
+        currency=payroll_entry.currency,
+    )
+
+
+@frappe.whitelist()
+def create_salary_slips_sharded(payroll_entry, shard_size=None):
+    """
+    Queue slip creation for a submitted Payroll Entry in parallel shards.
+    Returns {"employees": n, "shards": n}.
+    """
+    doc = frappe.get_doc("Payroll Entry", payroll_entry)
+    doc.check_permission("write")
+    if doc.docstatus != 1:
+        frappe.throw(_("Submit the Payroll Entry before creating Salary Slips"))
+
+    employees = [r.employee for r in doc.get("employees") or [] if r.employee]
+    if not employees:
+        frappe.throw(_("Payroll Entry {0} has no employees").format(doc.name))
+
+    existing = set(frappe.get_all(
+        "Salary Slip",
+        filters={"payroll_entry": doc.name, "employee": ("in", employees), "docstatus": ("!=", 2)},
+        pluck="employee",
+    ))
+    employees = [e for e in employees if e not in existing]
+    if not employees:
+        return {"employees": 0, "shards": 0}
+
+    resolved = resolve_structures(employees)
+    unmapped = sorted({regime for regime, structure in resolved.values() if not structure})
+    if unmapped:
+        frappe.throw(_("No salary structure is mapped for tax regime(s): {0}").format(", ".join(unmapped)))
+
+    totals = get_total_exemptions(employees, _fiscal_year_from_date(doc.start_date))
+    args = _slip_args(doc)
+
+    shard_size = int(shard_size or SHARD_SIZE)
+    shards = [employees[i:i + shard_size] for i in range(0, len(employees), shard_size)]
+    status_key = SHARD_STATUS_KEY.format(doc.name)
+    frappe.cache().delete_value([status_key, SHARD_FINISHED_KEY.format(doc.name)])
+    for i in range(len(shards)):
+        frappe.cache().hset(status_key, str(i), PENDING)
+    frappe.cache().hset(SHARD_RUNS_KEY, doc.name, time.time())
+
+    doc.db_set("status", "Queued")
+    for i, shard in enumerate(shards):
+        frappe.enqueue(
+            "girman_asgmt_app.payroll_shards.create_slip_shard",
+            queue="long",
+            timeout=SHARD_JOB_TIMEOUT,
+            enqueue_after_commit=True,
+            payroll_entry=doc.name,
+            shard=i,
+            slip_args=args,
+            resolved={e: resolved[e] for e in shard if e in resolved},
+            totals={e: totals.get(e, 0.0) for e in shard},
+        )
+    return {"employees": len(employees), "shards": len(shards)}
+
+
+def create_slip_shard(payroll_entry, shard, slip_args, resolved, totals):
+    """
+    Background job: insert the Salary Slips of one shard, committing every
+    COMMIT_BATCH_SIZE slips. A failing employee is rolled back and logged on its own; if the
+    shard itself fails (e.g. the job times out), every employee after the last commit is
+    reported as failed, so the Payroll Entry does not stay Queued.
+    """
+    employees = list(resolved)
+    failed, committed = [], 0
+    try:
+        for i, employee in enumerate(employees, 1):
+            regime, structure = resolved[employee]
+            slip = frappe.get_doc(
+                {**slip_args, "doctype": "Salary Slip", "employee": employee, "salary_structure": structure}
+            )
+            slip.flags.girman_resolved_regime = regime
+            slip.flags.girman_resolved_structure = structure
+            slip.flags.girman_declared_total = totals.get(employee, 0.0)
+
+            frappe.db.savepoint("girman_slip_shard")
+            try:
+                slip.insert()
+            except Exception:
+                frappe.db.rollback(save_point="girman_slip_shard")
+                failed.append(employee)
+                frappe.log_error(message=frappe.get_traceback(), title=f"create_slip_shard: {payroll_entry} / {employee}")
+
+            if i % COMMIT_BATCH_SIZE == 0:
+                frappe.db.commit()
+                committed = i
+
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(message=frappe.get_traceback(), title=f"create_slip_shard: {payroll_entry} / shard {shard}")
+        lost = employees[committed:]
+        unfinished = set(lost)
+        failed = [e for e in failed if e not in unfinished] + lost
+
+    _finish_shard(payroll_entry, shard, failed)
+    return len(resolved) - len(failed)
+
+
+def _finish_shard(payroll_entry, shard, failed):
+    """
+    Record a finished shard; the last one to finish updates the Payroll Entry.
+
+    Each shard writes its status before incrementing the finished counter, so the single
+    shard whose INCR returns the shard count sees every status and finalises; reading the
+    statuses alone would let two shards finishing together both (or neither) see the last.
+    """
+    cache = frappe.cache()
+    status_key = SHARD_STATUS_KEY.format(payroll_entry)
+    if not cache.hexists(status_key, str(shard)):
+        # the run was given up by fail_stale_shard_runs (or re-queued) meanwhile
+        return
+    cache.hset(status_key, str(shard), f"{DONE}:{','.join(failed)}")
+    cache.hset(SHARD_RUNS_KEY, payroll_entry, time.time())
+
+    finished = cache.incr(cache.make_key(SHARD_FINISHED_KEY.format(payroll_entry)))
+    statuses = [frappe.safe_decode(v) for v in (cache.hgetall(status_key) or {}).values()]
+    if finished != len(statuses):
+        return
+
+    failures = [e for s in statuses for e in s.split(":", 1)[1].split(",") if e]
+    values = {"status": "Submitted", "salary_slips_created": 1, "error_message": ""}
+    if failures:
+        # leaves the form's button in place so the missing slips can be created again
+        values.update(
+            status="Failed",
+            salary_slips_created=0,
+            error_message=_("Salary Slips could not be created for: {0}. See Error Log for details.").format(
+                ", ".join(failures)
+            ),
+        )
+    frappe.db.set_value("Payroll Entry", payroll_entry, values)
+    frappe.db.commit()
+    _clear_run(payroll_entry)
+    # the HRMS Payroll Entry form reloads on this event
+    frappe.publish_realtime("completed_salary_slip_creation", user=frappe.session.user)
+
+
+def _clear_run(payroll_entry):
+    frappe.cache().delete_value([SHARD_STATUS_KEY.format(payroll_entry), SHARD_FINISHED_KEY.format(payroll_entry)])
+    frappe.cache().hdel(SHARD_RUNS_KEY, payroll_entry)
+
+
+def fail_stale_shard_runs():
+    """
+    Scheduler (hourly): mark Payroll Entries Failed when none of their pending shards has
+    reported for STALE_SHARD_RUN_SECONDS. A shard job is killed after SHARD_JOB_TIMEOUT, and
+    its except block reports it, so this only catches shards that died without reporting
+    (worker killed, job lost). The slips that were committed stay; the form's button
+    creates the rest.
+    """
+    cache = frappe.cache()
+    cutoff = time.time() - STALE_SHARD_RUN_SECONDS
+    for payroll_entry, last_report in (cache.hgetall(SHARD_RUNS_KEY) or {}).items():
+        payroll_entry = frappe.safe_decode(payroll_entry)
+        if float(last_report) > cutoff:
+            continue
+
+        statuses = cache.hgetall(SHARD_STATUS_KEY.format(payroll_entry)) or {}
+        pending = sorted(
+            int(frappe.safe_decode(shard)) for shard, s in statuses.items() if frappe.safe_decode(s) == PENDING
+        )
+        if frappe.db.get_value("Payroll Entry", payroll_entry, "status") == "Queued":
+            frappe.db.set_value(
+                "Payroll Entry",
+                payroll_entry,
+                {
+                    "status": "Failed",
+                    "salary_slips_created": 0,
+                    "error_message": _(
+                        "Salary Slip creation did not finish: shard(s) {0} stopped reporting. "
+                        "Create the missing Salary Slips again."
+                    ).format(", ".join(str(i) for i in pending) or _("unknown")),
+                },
+            )
+            frappe.db.commit()
+        _clear_run(payroll_entry)
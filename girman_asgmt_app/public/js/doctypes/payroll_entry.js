@@ -0,0 +1,25 @@
+frappe.ui.form.on("Payroll Entry", {
+	refresh: function (frm) {
+		if (frm.doc.docstatus !== 1 || frm.doc.salary_slips_created || frm.doc.status === "Queued") {
+			return;
+		}
+
+		frm.add_custom_button(__("Create Salary Slips (Sharded)"), async function () {
+			const r = await frappe.call({
+				method: "girman_asgmt_app.payroll_shards.create_salary_slips_sharded",
+				args: { payroll_entry: frm.doc.name },
+				freeze: true,
+			});
+			const res = (r && r.message) || {};
+			if (res.shards) {
+				frappe.show_alert({
+					message: __("Creating {0} Salary Slips in {1} background jobs", [res.employees, res.shards]),
+					indicator: "blue",
+				});
+			} else {
+				frappe.show_alert({ message: __("All Salary Slips already exist"), indicator: "green" });
+			}
+			frm.reload_doc();
+		});
+	},
+});
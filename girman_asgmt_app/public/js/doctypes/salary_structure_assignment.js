@@ -5,21 +5,16 @@ frappe.ui.form.on("Salary Structure Assignment", {
 			frm.trigger("set_payroll_cost_centers");
 			frm.trigger("toggle_opening_balances_section");
 
-			const employee_regime = await frappe.db.get_value(
-				"Employee",
-				frm.doc.employee,
-				"tax_regime_preference"
-			);
+			const r = await frappe.call({
+				method: "girman_asgmt_app.events.tax_regime.get_allowed_salary_structures",
+				args: { employee: frm.doc.employee },
+			});
 
-			if (!employee_regime) return;
-			const filter_salary_structure = [
-				"like",
-				"%" + employee_regime.message.tax_regime_preference + "%",
-			];
+			const allowed_structures = (r && r.message) || [];
 			frm.set_query("salary_structure", function () {
 				return {
 					filters: {
-						name: filter_salary_structure,
+						name: ["in", allowed_structures],
 					},
 				};
 			});
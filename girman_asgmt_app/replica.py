@@ -0,0 +1,86 @@
+"""
+Write guard for read-only analytics (reports, dashboard chart sources).
+
+Routing to the read replica is left to the framework: query_report.run is wrapped in
+@frappe.read_only(), which points frappe.db at the replica configured in site_config
+(read_from_replica + replica_host) for the call and falls back to the primary when none
+is configured. write_guard() adds what the framework does not: a guard on frappe.db.sql
+raises ReplicaWriteError for any write statement, and a replica session is additionally
+set READ ONLY so the server rejects writes too. The read_only decorator combines both for
+entry points the framework does not route itself, such as dashboard chart sources.
+"""
+import functools
+import re
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+
+WRITE_QUERY = re.compile(
+    r"^\s*(insert|update|delete|replace|create|alter|drop|truncate|rename|grant|revoke|lock|set\s+global)\b",
+    re.IGNORECASE,
+)
+
+
+class ReplicaWriteError(frappe.ValidationError):
+    pass
+
+
+def on_replica() -> bool:
+    """Whether frappe.db is the replica connection opened by frappe.read_only / frappe.connect_replica."""
+    replica = getattr(frappe.local, "replica_db", None)
+    return replica is not None and frappe.db is replica
+
+
+@contextmanager
+def write_guard():
+    """Forbid writes on frappe.db (replica or primary) for the duration of the block."""
+    if frappe.flags.girman_read_only_depth:
+        # nested call: already guarded
+        frappe.flags.girman_read_only_depth += 1
+        try:
+            yield
+        finally:
+            frappe.flags.girman_read_only_depth -= 1
+        return
+
+    db = frappe.db
+    unguarded_sql = db.sql
+    # an instance-level wrapper (e.g. a query counter) must survive the block
+    instance_sql = db.__dict__.get("sql")
+
+    @functools.wraps(unguarded_sql)
+    def guarded_sql(query, *args, **kwargs):
+        if WRITE_QUERY.match(str(query)):
+            raise ReplicaWriteError(
+                _("Write attempted on a read-only connection: {0}").format(str(query).strip()[:200])
+            )
+        return unguarded_sql(query, *args, **kwargs)
+
+    previous_read_only = frappe.flags.read_only
+    frappe.flags.girman_read_only_depth = 1
+    try:
+        if on_replica():
+            unguarded_sql("set session transaction read only")
+        db.sql = guarded_sql
+        # lets the framework defer its own bookkeeping writes (e.g. Error Log) instead of issuing them here
+        frappe.flags.read_only = True
+        yield
+    finally:
+        frappe.flags.girman_read_only_depth = 0
+        frappe.flags.read_only = previous_read_only
+        db.__dict__.pop("sql", None)
+        if instance_sql is not None:
+            db.sql = instance_sql
+
+
+def read_only(fn):
+    """Route fn to the replica with @frappe.read_only() and run it under write_guard."""
+
+    @frappe.read_only()
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with write_guard():
+            return fn(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,88 @@
+"""
+Per-slip context shared by the Salary Slip hooks.
+
+ensure_salary_structure_matches_regime, adjust_salary_slip_with_investments and
+set_salary_structure_for_employee all need the employee's regime and expected salary
+structure, the slip's fiscal year, the months left in it and the declared investment
+total. `get_slip_context` builds one context per slip and attaches it to the document's
+flags, so every hook (and every re-validate of the same document in the request) reuses
+the values already looked up. The context is rebuilt only when the slip's employee,
+start date or fiscal year change.
+
+`get_lookup_count` / `reset_lookup_count` expose how many contexts were built, for tests
+and benchmarks.
+"""
+from functools import cached_property
+
+_lookups = {"count": 0}
+
+
+def get_lookup_count() -> int:
+    return _lookups["count"]
+
+
+def reset_lookup_count():
+    _lookups["count"] = 0
+
+
+def _key(doc):
+    return (doc.get("employee"), str(doc.get("start_date") or ""), doc.get("fiscal_year"))
+
+
+class SlipContext:
+    """
+    Inputs derived from one slip. Each value is looked up on first access and kept, so a
+    hook only pays for what it reads and no value is looked up twice for the slip.
+    """
+
+    def __init__(self, doc):
+        from girman_asgmt_app.events.payroll import _fiscal_year_from_date, months_remaining_in_fiscal
+
+        self.key = _key(doc)
+        self.employee = doc.get("employee")
+        self.start_date = doc.get("start_date")
+        self.fiscal_year = doc.get("fiscal_year") or _fiscal_year_from_date(self.start_date)
+        self.months_remaining = months_remaining_in_fiscal(self.start_date, self.fiscal_year)
+        # payroll_shards attaches values it resolved in bulk for the whole shard
+        self._resolved = (doc.flags.get("girman_resolved_regime"), doc.flags.get("girman_resolved_structure"))
+        self._declared_total = doc.flags.get("girman_declared_total")
+
+    @cached_property
+    def _regime_and_structure(self):
+        from girman_asgmt_app.events.tax_regime import REGIME_TO_STRUCTURE, get_employee_regime
+
+        if self._resolved[1]:
+            return self._resolved
+        regime = get_employee_regime(self.employee)
+        return regime, REGIME_TO_STRUCTURE.get(regime)
+
+    @property
+    def regime(self):
+        return self._regime_and_structure[0]
+
+    @property
+    def expected_structure(self):
+        return self._regime_and_structure[1]
+
+    @cached_property
+    def declared_total(self) -> float:
+        from girman_asgmt_app.events.payroll import get_total_declarations
+
+        if self._declared_total is not None:
+            return self._declared_total
+        return get_total_declarations(self.employee, self.fiscal_year)
+
+    @cached_property
+    def per_month_investment(self) -> float:
+        from girman_asgmt_app.events.payroll import prorate_investment_total
+
+        return prorate_investment_total(self.declared_total, self.start_date, self.fiscal_year)
+
+
+def get_slip_context(doc):
+    """Return the slip's context, building it on first use (or when its key fields changed)."""
+    ctx = doc.flags.get("girman_slip_context")
+    if ctx is None or ctx.key != _key(doc):
+        _lookups["count"] += 1
+        ctx = doc.flags.girman_slip_context = SlipContext(doc)
+    return ctx
@@ -0,0 +1,250 @@
+"""
+Retroactive TDS reconciliation.
+
+When an employee's tax_regime_preference or investment declaration changes after slips
+have been submitted, the TDS already deducted no longer matches what was due. This module
+replays the submitted months in memory under the current regime/exemptions and turns the
+difference into a draft Additional Salary on the income tax component of the next slip:
+
+- too little withheld: the shortfall is added to the next slip's TDS;
+- too much withheld: the next slip's TDS is overwritten with what is due for that month
+  less the excess (never below zero). The refund only lowers tax, so gross pay is not
+  touched; whatever the next slip cannot absorb shows up again as excess on the next run,
+  because every run replays all submitted months.
+
+Generated drafts reference the reconciled Fiscal Year (ref_doctype / ref_docname), and
+only those are updated or deleted by later runs; drafts entered by hand are left alone.
+"""
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, getdate
+
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+    get_total_exemptions,
+)
+from girman_asgmt_app.tax.projection import fiscal_year_bounds, get_income_tax_components
+from girman_asgmt_app.tax.slabs import OLD_REGIME, tax_for_regime
+
+TAX_COMPONENT = "Income Tax"
+REF_DOCTYPE = "Fiscal Year"
+MIN_ADJUSTMENT = 1.0
+COMMIT_EVERY = 500
+
+
+def _submitted_slips(employees, fy_start, fy_end):
+    """{employee: [slip _dict ordered by start_date]} with gross_pay and the TDS actually deducted."""
+    tax_components = tuple(get_income_tax_components()) or ("",)
+    rows = frappe.db.sql(
+        """
+        select ss.name, ss.employee, ss.company, ss.start_date, ss.end_date, ss.gross_pay,
+            coalesce(sum(case when sd.salary_component in %(tax_components)s then sd.amount end), 0) as tds
+        from `tabSalary Slip` ss
+        left join `tabSalary Detail` sd
+            on sd.parent = ss.name and sd.parenttype = 'Salary Slip' and sd.parentfield = 'deductions'
+        where ss.docstatus = 1
+            and ss.employee in %(employees)s
+            and ss.start_date >= %(fy_start)s
+            and ss.end_date <= %(fy_end)s
+        group by ss.name
+        order by ss.employee, ss.start_date
+        """,
+        {"employees": tuple(employees), "tax_components": tax_components, "fy_start": fy_start, "fy_end": fy_end},
+        as_dict=True,
+    )
+    slips = {}
+    for r in rows:
+        slips.setdefault(r.employee, []).append(r)
+    return slips
+
+
+def compute_arrears(employees, fiscal_year):
+    """
+    Replay the submitted months of fiscal_year for employees under their current regime and
+    declaration. For month k the annual projection is the actual gross so far plus month k's
+    gross for the rest of the year; the TDS due that month spreads the projected tax not yet
+    covered by earlier (replayed) months over the months left.
+
+    All employees are replayed together, one month position at a time, so the slab
+    computation runs once per (month position, regime).
+
+    Returns {employee: _dict(company, regime, months=[_dict(slip, due,
+    deducted, delta)], delta, next_due, next_payroll_date)}, where next_due is the TDS due
+    for the month after the last submitted slip (0 when the fiscal year is over).
+    """
+    employees = list({e for e in employees or [] if e})
+    if not employees:
+        return {}
+    fy_start, fy_end = fiscal_year_bounds(fiscal_year)
+
+    slips = _submitted_slips(employees, fy_start, fy_end)
+    if not slips:
+        return {}
+    regimes = dict(frappe.get_all(
+        "Employee", filters={"name": ("in", list(slips))}, fields=["name", "tax_regime_preference"], as_list=True
+    ))
+    exemptions = get_total_exemptions(list(slips), fiscal_year)
+
+    state = {
+        emp: frappe._dict(
+            company=rows[0].company,
+            regime=regimes.get(emp) or OLD_REGIME,
+            gross_so_far=0.0,
+            due_so_far=0.0,
+            annual=0.0,
+            left=1,
+            months=[],
+        )
+        for emp, rows in slips.items()
+    }
+
+    for k in range(max(len(rows) for rows in slips.values())):
+        batch = {}
+        for emp, rows in slips.items():
+            if k >= len(rows):
+                continue
+            slip = rows[k]
+            st = state[emp]
+            st.gross_so_far += flt(slip.gross_pay)
+            left = _months_left(slip.start_date, fy_end)
+            projected = st.gross_so_far + flt(slip.gross_pay) * (left - 1)
+            batch.setdefault(st.regime, []).append((emp, slip, projected, left))
+
+        for regime, items in batch.items():
+            taxes = tax_for_regime(
+                [projected for _emp, _slip, projected, _left in items],
+                [exemptions.get(emp, 0.0) for emp, _slip, _projected, _left in items],
+                regime,
+            )
+            for (emp, slip, _projected, left), annual in zip(items, taxes, strict=True):
+                st = state[emp]
+                due = flt(max(annual - st.due_so_far, 0.0) / left, 2)
+                st.due_so_far += due
+                st.annual, st.left = annual, left
+                st.months.append(frappe._dict(
+                    slip=slip.name, due=due, deducted=flt(slip.tds, 2), delta=flt(due - flt(slip.tds), 2)
+                ))
+
+    for emp, st in state.items():
+        st.delta = flt(sum(m.delta for m in st.months), 2)
+        st.next_payroll_date = add_days(slips[emp][-1].end_date, 1)
+        st.next_due = flt(max(st.annual - st.due_so_far, 0.0) / (st.left - 1), 2) if st.left > 1 else 0.0
+        for key in ("gross_so_far", "due_so_far", "annual", "left"):
+            del st[key]
+    return state
+
+
+def _months_left(slip_start, fy_end) -> int:
+    """Months from the slip's month to the end of the fiscal year, inclusive (1-12)."""
+    sd = getdate(slip_start)
+    months = (fy_end.year - sd.year) * 12 + (fy_end.month - sd.month) + 1
+    return min(max(months, 1), 12)
+
+
+def _adjustment(st):
+    """
+    (amount, overwrite) of the Additional Salary that settles st.delta on the next slip, or
+    None when nothing is to be settled. See the module docstring for the two directions.
+    """
+    if abs(st.delta) < MIN_ADJUSTMENT:
+        return None
+    if st.delta > 0:
+        return flt(st.delta, 2), 0
+    if not st.next_due:
+        # the fiscal year is over: its excess TDS cannot be netted against its own tax
+        return None
+    return flt(max(st.next_due + st.delta, 0.0), 2), 1
+
+
+def create_adjustment_rows(arrears, fiscal_year, employees=None):
+    """
+    Create, update or delete the draft Additional Salary generated for fiscal_year for each
+    employee so it matches the computed delta. Employees in employees that have no arrears
+    any more lose their generated draft too. Returns the names of the documents created.
+    """
+    employees = set(employees or []) | set(arrears)
+    generated = {}
+    if employees:
+        for r in frappe.get_all(
+            "Additional Salary",
+            filters={
+                "employee": ("in", list(employees)),
+                "ref_doctype": REF_DOCTYPE,
+                "ref_docname": fiscal_year,
+                "docstatus": 0,
+            },
+            fields=["name", "employee"],
+            order_by="creation asc",
+        ):
+            generated.setdefault(r.employee, []).append(r.name)
+
+    created = []
+    written = 0
+    for emp in employees:
+        st = arrears.get(emp)
+        adjustment = _adjustment(st) if st else None
+        drafts = generated.get(emp, [])
+        if not (drafts or adjustment):
+            continue
+        if adjustment is None:
+            stale = drafts
+        else:
+            amount, overwrite = adjustment
+            values = {
+                "company": st.company,
+                "salary_component": TAX_COMPONENT,
+                "amount": amount,
+                "overwrite_salary_structure_amount": overwrite,
+                "payroll_date": st.next_payroll_date,
+            }
+            if drafts:
+                # re-running the job refreshes the draft it created earlier instead of stacking another one
+                frappe.db.set_value("Additional Salary", drafts[0], values)
+            else:
+                doc = frappe.get_doc({
+                    "doctype": "Additional Salary",
+                    "employee": emp,
+                    "ref_doctype": REF_DOCTYPE,
+                    "ref_docname": fiscal_year,
+                    **values,
+                })
+                doc.insert(ignore_permissions=True)
+                created.append(doc.name)
+            stale = drafts[1:]
+
+        for name in stale:
+            frappe.delete_doc("Additional Salary", name, ignore_permissions=True)
+        written += 1
+        if written % COMMIT_EVERY == 0:
+            frappe.db.commit()
+    return created
+
+
+def recompute_arrears(employees, fiscal_year):
+    """Background job: compute arrears for employees in fiscal_year and create draft adjustments."""
+    try:
+        arrears = compute_arrears(employees, fiscal_year)
+        created = create_adjustment_rows(arrears, fiscal_year, employees)
+        frappe.db.commit()
+        return created
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(message=frappe.get_traceback(), title="recompute_arrears")
+        raise
+
+
+@frappe.whitelist()
+def enqueue_arrears_recompute(employees, fiscal_year):
+    """Queue one job that reconciles TDS for all given employees (list or JSON list) in fiscal_year."""
+    frappe.only_for(("HR Manager", "System Manager"))
+    employees = frappe.parse_json(employees) or []
+    if not (employees and fiscal_year):
+        frappe.throw(_("Employees and Fiscal Year are required"))
+
+    frappe.enqueue(
+        "girman_asgmt_app.tax.arrears.recompute_arrears",
+        queue="long",
+        timeout=3600,
+        employees=employees,
+        fiscal_year=fiscal_year,
+    )
+    return len(employees)
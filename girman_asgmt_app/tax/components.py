@@ -0,0 +1,82 @@
+"""
+Salary Component classification registry.
+
+Every Salary Component is mapped once to an integer class code from its metadata
+(type, is_income_tax_component, variable_based_on_taxable_salary, abbreviation), with
+whole-word name matching only as a fallback for components that do not set the flags.
+The {component: class} map is cached in Redis and cleared whenever a Salary Component
+changes, so summing tax out of slip rows is a dictionary lookup per row instead of
+string matching.
+"""
+import re
+
+import frappe
+
+OTHER_DEDUCTION = 0
+EARNING = 1
+INCOME_TAX = 2
+PROFESSIONAL_TAX = 3
+EXEMPTION = 4
+PROVIDENT_FUND = 5
+ESI = 6
+
+COMPONENT_CLASS_CACHE_KEY = "girman_asgmt_app:salary_component_classes"
+
+# (class, phrases matched as whole words in the lowercased name, abbreviations), first match wins
+_NAME_RULES = (
+    (PROFESSIONAL_TAX, ("professional tax",), {"PT", "DPT"}),
+    (PROVIDENT_FUND, ("provident fund", "epf"), {"PF", "DPF", "EPF"}),
+    (ESI, ("esi", "esic"), {"ESI", "ESIC"}),
+    (INCOME_TAX, ("income tax", "tds"), {"IT", "TDS"}),
+)
+
+
+def _has_phrase(name, phrase):
+    return re.search(rf"\b{re.escape(phrase)}\b", name) is not None
+
+
+def classify(component) -> int:
+    """Class code for one Salary Component row (dict with name, type, flags and abbr)."""
+    from girman_asgmt_app.events.payroll import INVESTMENT_COMPONENT
+
+    if component.get("type") == "Earning":
+        return EARNING
+    if component.get("is_income_tax_component"):
+        return INCOME_TAX
+    if component.get("name") == INVESTMENT_COMPONENT:
+        return EXEMPTION
+
+    name = (component.get("name") or "").lower()
+    abbr = (component.get("salary_component_abbr") or "").upper()
+    for code, phrases, abbrs in _NAME_RULES:
+        if abbr in abbrs or any(_has_phrase(name, p) for p in phrases):
+            return code
+    # fallback for tax components that only set this flag and match no name rule
+    if component.get("variable_based_on_taxable_salary"):
+        return INCOME_TAX
+    return OTHER_DEDUCTION
+
+
+def get_component_classes():
+    """Cached {salary component: class code} for every Salary Component."""
+    def build():
+        rows = frappe.get_all(
+            "Salary Component",
+            fields=[
+                "name", "type", "salary_component_abbr",
+                "is_income_tax_component", "variable_based_on_taxable_salary",
+            ],
+        )
+        return {r.name: classify(r) for r in rows}
+
+    return frappe.cache().get_value(COMPONENT_CLASS_CACHE_KEY, generator=build)
+
+
+def clear_component_class_cache(doc=None, method=None):
+    """Hook: Salary Component on_update / after_rename / on_trash."""
+    frappe.cache().delete_value(COMPONENT_CLASS_CACHE_KEY)
+
+
+def components_of_class(*codes):
+    """Names of the components in any of the given classes."""
+    return {name for name, code in get_component_classes().items() if code in codes}
@@ -0,0 +1,190 @@
+"""
+Year-to-date tax projection.
+
+Combines what has actually been paid (submitted Salary Slips, one aggregated query per
+company) with what is still to come (the employee's current salary structure for the
+remaining months) and the declared exemptions, then computes the annual tax under both
+regimes for the whole workforce at once.
+"""
+from datetime import date
+
+import frappe
+from frappe.utils import flt, getdate, today
+
+from girman_asgmt_app.events.payroll import _fiscal_year_from_date, _parse_fiscal_year_start
+from girman_asgmt_app.girman_asgmt_app.doctype.employee_investment_declaration.employee_investment_declaration import (
+    get_total_exemptions,
+)
+from girman_asgmt_app.tax.components import INCOME_TAX, components_of_class
+from girman_asgmt_app.tax.slabs import NEW_REGIME, OLD_REGIME, REGIMES, tax_for_regime
+
+
+def fiscal_year_bounds(fiscal_year):
+    """(first day, last day) of an April-March fiscal year like '2025-2026'."""
+    start_year = _parse_fiscal_year_start(fiscal_year)
+    return date(start_year, 4, 1), date(start_year + 1, 3, 31)
+
+
+def months_remaining(as_of, fy_end) -> int:
+    """Months left in the fiscal year including the month of as_of (1-12)."""
+    months = (fy_end.year - as_of.year) * 12 + (fy_end.month - as_of.month) + 1
+    return min(max(months, 1), 12)
+
+
+def unpaid_months(as_of, fy_end, last_slip_start=None) -> int:
+    """
+    Months still to be paid: the months from as_of's month to the end of the fiscal year,
+    less the current month when a slip covering it is already counted in the YTD totals.
+    """
+    months = months_remaining(as_of, fy_end)
+    if last_slip_start and getdate(last_slip_start) >= as_of.replace(day=1):
+        months -= 1
+    return months
+
+
+def get_income_tax_components():
+    """Names of deduction components that carry TDS (from the component registry)."""
+    return components_of_class(INCOME_TAX)
+
+
+def get_ytd_totals(company, from_date, to_date, employees=None):
+    """
+    {employee: _dict(gross, tds, months, last_start)} from submitted Salary Slips of company
+    whose period starts in [from_date, to_date], so the slip of the month to_date falls in
+    is counted. Single grouped query over slips and their rows.
+    """
+    conditions = ""
+    values = {"company": company, "from_date": from_date, "to_date": to_date}
+    if employees is not None:
+        if not employees:
+            return {}
+        conditions = "and ss.employee in %(employees)s"
+        values["employees"] = tuple(employees)
+
+    rows = frappe.db.sql(
+        f"""
+        select ss.employee, sd.parentfield, sd.salary_component,
+            sum(sd.amount) as amount, count(distinct ss.name) as slips,
+            max(ss.start_date) as last_start
+        from `tabSalary Slip` ss
+        inner join `tabSalary Detail` sd
+            on sd.parent = ss.name and sd.parenttype = 'Salary Slip'
+        where ss.docstatus = 1
+            and ss.company = %(company)s
+            and ss.start_date >= %(from_date)s
+            and ss.start_date <= %(to_date)s
+            {conditions}
+        group by ss.employee, sd.parentfield, sd.salary_component
+        """,
+        values,
+        as_dict=True,
+    )
+
+    tax_components = get_income_tax_components()
+    totals = {}
+    for r in rows:
+        t = totals.setdefault(r.employee, frappe._dict(gross=0.0, tds=0.0, months=0, last_start=None))
+        t.months = max(t.months, r.slips)
+        if r.last_start and (not t.last_start or r.last_start > t.last_start):
+            t.last_start = r.last_start
+        if r.parentfield == "earnings":
+            t.gross += flt(r.amount)
+        elif r.salary_component in tax_components:
+            t.tds += flt(r.amount)
+    return totals
+
+
+def get_monthly_structure_gross(employees, as_of):
+    """
+    {employee: monthly gross} from the latest submitted Salary Structure Assignment on or
+    before as_of. Uses the structure's fixed earnings, falling back to the assignment base.
+    """
+    if not employees:
+        return {}
+    assignments = {}
+    for r in frappe.get_all(
+        "Salary Structure Assignment",
+        filters={"employee": ("in", list(employees)), "docstatus": 1, "from_date": ("<=", as_of)},
+        fields=["employee", "salary_structure", "base"],
+        order_by="from_date asc",
+    ):
+        assignments[r.employee] = r
+
+    structures = {a.salary_structure for a in assignments.values() if a.salary_structure}
+    structure_gross = dict(frappe.get_all(
+        "Salary Detail",
+        filters={"parenttype": "Salary Structure", "parentfield": "earnings", "parent": ("in", list(structures))},
+        fields=["parent", "sum(amount) as amount"],
+        group_by="parent",
+        as_list=True,
+    )) if structures else {}
+
+    return {
+        emp: flt(structure_gross.get(a.salary_structure)) or flt(a.base)
+        for emp, a in assignments.items()
+    }
+
+
+def project_tax(company, fiscal_year=None, as_of=None, employee_filters=None):
+    """
+    Project each employee's annual tax under both regimes for fiscal_year as of as_of.
+
+    Returns a list of _dicts with: employee, employee_name, regime, ytd_gross,
+    projected_gross, exemptions, ytd_tds, tax_old, tax_new, projected_tax,
+    shortfall (positive: TDS still to deduct, negative: excess already deducted),
+    remaining_months and monthly_tds.
+    """
+    as_of = getdate(as_of or today())
+    fiscal_year = fiscal_year or _fiscal_year_from_date(as_of)
+    fy_start, fy_end = fiscal_year_bounds(fiscal_year)
+    as_of = min(max(as_of, fy_start), fy_end)
+
+    filters = {"company": company, "status": "Active"}
+    filters.update(employee_filters or {})
+    employees = frappe.get_all(
+        "Employee",
+        filters=filters,
+        fields=["name", "employee_name", "tax_regime_preference"],
+        order_by="name asc",
+    )
+    if not employees:
+        return []
+    names = [e.name for e in employees]
+
+    ytd = get_ytd_totals(company, fy_start, as_of, names)
+    monthly = get_monthly_structure_gross(names, as_of)
+    exemptions = get_total_exemptions(names, fiscal_year)
+
+    blank = frappe._dict(gross=0.0, tds=0.0, months=0, last_start=None)
+    ytd_rows = [ytd.get(n, blank) for n in names]
+    remaining = [unpaid_months(as_of, fy_end, t.last_start) for t in ytd_rows]
+    future = []
+    for n, t, months in zip(names, ytd_rows, remaining, strict=True):
+        per_month = monthly.get(n) or (t.gross / t.months if t.months else 0.0)
+        future.append(per_month * months)
+
+    gross = [flt(t.gross + f, 2) for t, f in zip(ytd_rows, future, strict=True)]
+    declared = [exemptions.get(n, 0.0) for n in names]
+    tax = {regime: tax_for_regime(gross, declared, regime) for regime in REGIMES}
+
+    result = []
+    for i, e in enumerate(employees):
+        regime = e.tax_regime_preference or OLD_REGIME
+        projected = tax[regime][i]
+        shortfall = flt(projected - ytd_rows[i].tds, 2)
+        result.append(frappe._dict(
+            employee=e.name,
+            employee_name=e.employee_name,
+            regime=regime,
+            ytd_gross=flt(ytd_rows[i].gross, 2),
+            projected_gross=gross[i],
+            exemptions=declared[i],
+            ytd_tds=flt(ytd_rows[i].tds, 2),
+            tax_old=tax[OLD_REGIME][i],
+            tax_new=tax[NEW_REGIME][i],
+            projected_tax=projected,
+            shortfall=shortfall,
+            remaining_months=remaining[i],
+            monthly_tds=flt(shortfall / remaining[i], 2) if remaining[i] and shortfall > 0 else 0.0,
+        ))
+    return result
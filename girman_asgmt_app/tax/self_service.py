@@ -0,0 +1,104 @@
+"""
+Per-employee regime comparison for the self-service portal page.
+
+Uses the projection engine for a single employee (a handful of aggregate queries, no
+in-memory Salary Slips) and caches the result in Redis per employee. Each entry records
+the version token it was computed under: the global data version (bumped when salary
+structures, salary components or the slabs change) and the employee's own version
+(bumped by hooks on the documents it depends on). Both are atomic Redis counters bumped
+only once the change commits, and an entry is served only while both still match, so a
+comparison computed from the old data is never served even if a request writes it to
+the cache after the invalidation ran.
+"""
+import frappe
+from frappe.utils import cint, flt, today
+
+from girman_asgmt_app.events.payroll import _fiscal_year_from_date
+from girman_asgmt_app.tax.projection import project_tax
+from girman_asgmt_app.tax.slabs import NEW_REGIME, OLD_REGIME
+
+CACHE_KEY = "girman_asgmt_app:regime_portal"
+DATA_VERSION_KEY = "girman_asgmt_app:regime_portal_data_version"
+EMPLOYEE_VERSION_KEY = "girman_asgmt_app:regime_portal_employee_version"
+
+
+def _employee_version_key(employee):
+    return frappe.cache().make_key(f"{EMPLOYEE_VERSION_KEY}:{employee}")
+
+
+def _version(employee):
+    """Current (data version, employee version) token; plain counters, so read without unpickling."""
+    cache = frappe.cache()
+    data_version, employee_version = cache.mget(
+        [cache.make_key(DATA_VERSION_KEY), _employee_version_key(employee)]
+    )
+    return [cint(data_version), cint(employee_version)]
+
+
+def _bump_data_version():
+    frappe.cache().incr(frappe.cache().make_key(DATA_VERSION_KEY))
+
+
+def invalidate_all(doc=None, method=None):
+    """
+    Invalidate every cached comparison.
+
+    As a document hook (salary structures, salary components) this runs after commit.
+    Called without a document (after_migrate, where code changes such as the slabs land)
+    there is no pending change to wait for, so the version is bumped right away.
+    """
+    if doc is None:
+        _bump_data_version()
+    else:
+        frappe.db.after_commit.add(_bump_data_version)
+
+
+def invalidate_employee(doc, method=None):
+    """Hook: drop the cached comparison of the employee a document belongs to."""
+    employee = doc.name if doc.doctype == "Employee" else doc.get("employee")
+    if employee:
+        invalidate_employees([employee])
+
+
+def invalidate_employees(employees):
+    """Bump the employees' versions after commit (used by paths that bypass document hooks)."""
+    employees = {e for e in employees or [] if e}
+    if not employees:
+        return
+
+    def _bump():
+        cache = frappe.cache()
+        for employee in employees:
+            cache.incr(_employee_version_key(employee))
+            cache.hdel(CACHE_KEY, employee)
+
+    frappe.db.after_commit.add(_bump)
+
+
+def get_regime_comparison(employee, company):
+    """Return the cached (or freshly computed) Old vs New comparison for employee this fiscal year."""
+    fiscal_year = _fiscal_year_from_date(today())
+    version = _version(employee)
+
+    cached = frappe.cache().hget(CACHE_KEY, employee)
+    if cached and cached.get("version") == version and cached.get("fiscal_year") == fiscal_year:
+        return cached["data"]
+
+    rows = project_tax(company, fiscal_year=fiscal_year, employee_filters={"name": employee})
+    data = None
+    if rows:
+        r = rows[0]
+        data = frappe._dict(
+            fiscal_year=fiscal_year,
+            current_regime=r.regime,
+            projected_gross=r.projected_gross,
+            exemptions=r.exemptions,
+            ytd_tds=r.ytd_tds,
+            tax_old=r.tax_old,
+            tax_new=r.tax_new,
+            difference=flt(r.tax_old - r.tax_new, 2),
+            recommended=NEW_REGIME if r.tax_old > r.tax_new else OLD_REGIME,
+        )
+
+    frappe.cache().hset(CACHE_KEY, employee, {"version": version, "fiscal_year": fiscal_year, "data": data})
+    return data
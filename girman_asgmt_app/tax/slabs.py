@@ -0,0 +1,75 @@
+"""
+Annual income tax under the Old and New regimes.
+
+Slabs are expressed as (lower, upper, rate) bands on annual taxable income. The
+functions take a list of incomes and return a list of taxes so a whole workforce
+is computed band-by-band in one pass.
+"""
+from frappe.utils import flt
+
+OLD_REGIME = "Old Regime"
+NEW_REGIME = "New Regime"
+REGIMES = (OLD_REGIME, NEW_REGIME)
+
+CESS_RATE = 0.04
+
+SLABS = {
+    OLD_REGIME: (
+        (0, 250000, 0.0),
+        (250000, 500000, 0.05),
+        (500000, 1000000, 0.20),
+        (1000000, None, 0.30),
+    ),
+    NEW_REGIME: (
+        (0, 400000, 0.0),
+        (400000, 800000, 0.05),
+        (800000, 1200000, 0.10),
+        (1200000, 1600000, 0.15),
+        (1600000, 2000000, 0.20),
+        (2000000, 2400000, 0.25),
+        (2400000, None, 0.30),
+    ),
+}
+
+STANDARD_DEDUCTION = {OLD_REGIME: 50000, NEW_REGIME: 75000}
+
+# section 87A: full rebate while taxable income stays within the limit
+REBATE_LIMIT = {OLD_REGIME: 500000, NEW_REGIME: 1200000}
+
+# declared exemptions (80C/80D/other) are only allowed under the Old regime
+EXEMPTIONS_ALLOWED = {OLD_REGIME: True, NEW_REGIME: False}
+
+
+def taxable_incomes(gross, exemptions, regime):
+    """Annual taxable income per employee for regime, from annual gross and declared exemptions."""
+    std = STANDARD_DEDUCTION[regime]
+    if EXEMPTIONS_ALLOWED[regime]:
+        return [max(flt(g) - std - flt(e), 0.0) for g, e in zip(gross, exemptions, strict=True)]
+    return [max(flt(g) - std, 0.0) for g in gross]
+
+
+def annual_tax(incomes, regime):
+    """Annual tax (including cess, after 87A rebate) for each taxable income in incomes."""
+    taxes = [0.0] * len(incomes)
+    for lower, upper, rate in SLABS[regime]:
+        if not rate:
+            continue
+        width = None if upper is None else upper - lower
+        for i, income in enumerate(incomes):
+            band = income - lower
+            if band <= 0:
+                continue
+            if width is not None and band > width:
+                band = width
+            taxes[i] += band * rate
+
+    limit = REBATE_LIMIT[regime]
+    return [
+        0.0 if income <= limit else flt(tax * (1 + CESS_RATE), 2)
+        for income, tax in zip(incomes, taxes, strict=True)
+    ]
+
+
+def tax_for_regime(gross, exemptions, regime):
+    """Shortcut: annual tax per employee for regime from annual gross and exemptions."""
+    return annual_tax(taxable_incomes(gross, exemptions, regime), regime)
@@ -0,0 +1,21 @@
+import frappe
+from frappe import _
+
+from girman_asgmt_app.tax.self_service import get_regime_comparison
+
+no_cache = 1
+
+
+def get_context(context):
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Log in to view your tax regime comparison."), frappe.PermissionError)
+
+    context.title = _("Old vs New Tax Regime")
+    context.show_sidebar = True
+
+    employee = frappe.db.get_value(
+        "Employee", {"user_id": frappe.session.user}, ["name", "employee_name", "company"], as_dict=True
+    )
+    context.employee = employee
+    context.comparison = get_regime_comparison(employee.name, employee.company) if employee else None
+    return context
@@ -0,0 +1,192 @@
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import patch
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_months, get_last_day
+
+from girman_asgmt_app.tax import arrears
+from girman_asgmt_app.tax.arrears import (
+	REF_DOCTYPE,
+	TAX_COMPONENT,
+	_months_left,
+	compute_arrears,
+	create_adjustment_rows,
+)
+from girman_asgmt_app.tax.slabs import NEW_REGIME, OLD_REGIME
+from girman_asgmt_app.tests.test_tax_projection import COMPANY, make_assignment, make_tax_component
+
+FISCAL_YEAR = "2025-2026"
+EMPLOYEE = "_T-Arrears-Employee"
+MONTHLY_GROSS = 100000
+# Old regime on 1200000: (1200000 - 50000) taxable -> 157500 + 4% cess
+ANNUAL_OLD_TAX = 163800
+MONTHLY_OLD_TAX = ANNUAL_OLD_TAX / 12
+
+
+def make_slips(months, tds, first=date(2025, 4, 1), gross=MONTHLY_GROSS):
+	slips = []
+	for k in range(months):
+		start = add_months(first, k)
+		slips.append(
+			frappe._dict(
+				name=f"SAL-{k}",
+				employee=EMPLOYEE,
+				company="_Test Company",
+				start_date=start,
+				end_date=get_last_day(start),
+				gross_pay=gross,
+				tds=tds,
+			)
+		)
+	return {EMPLOYEE: slips}
+
+
+@contextmanager
+def replay(slips, regime=OLD_REGIME, exemptions=None):
+	with (
+		patch.object(arrears, "_submitted_slips", return_value=slips),
+		patch.object(arrears, "get_total_exemptions", return_value=exemptions or {}),
+		patch.object(arrears.frappe, "get_all", return_value=[(EMPLOYEE, regime)]),
+	):
+		yield
+
+
+class TestComputeArrears(FrappeTestCase):
+	def test_under_deduction_gives_positive_delta(self):
+		with replay(make_slips(3, tds=0)):
+			st = compute_arrears([EMPLOYEE], FISCAL_YEAR)[EMPLOYEE]
+
+		self.assertEqual([m.due for m in st.months], [MONTHLY_OLD_TAX] * 3)
+		self.assertEqual(st.delta, 3 * MONTHLY_OLD_TAX)
+		self.assertEqual(st.next_due, MONTHLY_OLD_TAX)
+
+	def test_over_deduction_gives_negative_delta(self):
+		with replay(make_slips(3, tds=20000)):
+			st = compute_arrears([EMPLOYEE], FISCAL_YEAR)[EMPLOYEE]
+
+		self.assertEqual([m.delta for m in st.months], [MONTHLY_OLD_TAX - 20000] * 3)
+		self.assertEqual(st.delta, 3 * (MONTHLY_OLD_TAX - 20000))
+
+	def test_regime_switch_refunds_tax_deducted_under_old_regime(self):
+		# 1200000 under the new regime is within the 87A rebate
+		with replay(make_slips(3, tds=MONTHLY_OLD_TAX), regime=NEW_REGIME):
+			st = compute_arrears([EMPLOYEE], FISCAL_YEAR)[EMPLOYEE]
+
+		self.assertEqual(st.regime, NEW_REGIME)
+		self.assertEqual(st.delta, -3 * MONTHLY_OLD_TAX)
+
+	def test_full_year_dues_add_up_to_annual_tax(self):
+		with replay(make_slips(12, tds=MONTHLY_OLD_TAX)):
+			st = compute_arrears([EMPLOYEE], FISCAL_YEAR)[EMPLOYEE]
+
+		self.assertEqual(len(st.months), 12)
+		self.assertAlmostEqual(sum(m.due for m in st.months), ANNUAL_OLD_TAX, places=2)
+		self.assertEqual(st.delta, 0)
+		self.assertEqual(st.next_due, 0)
+		self.assertEqual(str(st.next_payroll_date), "2026-04-01")
+
+	def test_mid_year_joiner_spreads_tax_over_remaining_months(self):
+		# joins in October: 6 months of 200000 -> same annual gross as a full year of 100000
+		with replay(make_slips(6, tds=0, first=date(2025, 10, 1), gross=2 * MONTHLY_GROSS)):
+			st = compute_arrears([EMPLOYEE], FISCAL_YEAR)[EMPLOYEE]
+
+		self.assertEqual([m.due for m in st.months], [ANNUAL_OLD_TAX / 6] * 6)
+		self.assertEqual(str(st.next_payroll_date), "2026-04-01")
+
+	def test_no_slips(self):
+		with replay({}):
+			self.assertEqual(compute_arrears([EMPLOYEE], FISCAL_YEAR), {})
+		self.assertEqual(compute_arrears([], FISCAL_YEAR), {})
+
+
+class TestMonthsLeft(FrappeTestCase):
+	fy_end = date(2026, 3, 31)
+
+	def test_fiscal_year_boundaries(self):
+		self.assertEqual(_months_left(date(2025, 4, 1), self.fy_end), 12)
+		self.assertEqual(_months_left(date(2025, 12, 31), self.fy_end), 4)
+		self.assertEqual(_months_left(date(2026, 1, 1), self.fy_end), 3)
+		self.assertEqual(_months_left(date(2026, 3, 31), self.fy_end), 1)
+
+	def test_clamped_outside_fiscal_year(self):
+		self.assertEqual(_months_left(date(2025, 3, 1), self.fy_end), 12)
+		self.assertEqual(_months_left(date(2026, 4, 1), self.fy_end), 1)
+
+
+class TestAdjustmentRows(FrappeTestCase):
+	next_payroll_date = "2025-07-01"
+
+	def setUp(self):
+		make_tax_component(TAX_COMPONENT)
+		self.employee = make_employee("arrears-adjustment@example.com", company=COMPANY)
+		make_assignment(self.employee, MONTHLY_GROSS)
+		# entered by HR for the same component and date: never touched by the reconciliation
+		self.manual = frappe.get_doc(
+			{
+				"doctype": "Additional Salary",
+				"employee": self.employee,
+				"company": COMPANY,
+				"salary_component": TAX_COMPONENT,
+				"amount": 111,
+				"payroll_date": self.next_payroll_date,
+			}
+		).insert()
+
+	def reconcile(self, delta, next_due=MONTHLY_OLD_TAX):
+		st = frappe._dict(
+			company=COMPANY,
+			regime=OLD_REGIME,
+			delta=delta,
+			next_due=next_due,
+			next_payroll_date=self.next_payroll_date,
+		)
+		return create_adjustment_rows({self.employee: st}, FISCAL_YEAR)
+
+	def generated(self):
+		return [
+			(r.amount, r.overwrite_salary_structure_amount)
+			for r in frappe.get_all(
+				"Additional Salary",
+				filters={
+					"employee": self.employee,
+					"ref_doctype": REF_DOCTYPE,
+					"ref_docname": FISCAL_YEAR,
+					"docstatus": 0,
+				},
+				fields=["amount", "overwrite_salary_structure_amount"],
+			)
+		]
+
+	def assert_manual_untouched(self):
+		self.assertEqual(frappe.db.get_value("Additional Salary", self.manual.name, "amount"), 111)
+
+	def test_rerun_follows_the_delta(self):
+		self.assertEqual(len(self.reconcile(5000)), 1)
+		self.assertEqual(self.generated(), [(5000, 0)])
+
+		# the delta changed sign: next month's TDS is lowered by the excess instead
+		self.assertEqual(self.reconcile(-3000), [])
+		self.assertEqual(self.generated(), [(MONTHLY_OLD_TAX - 3000, 1)])
+
+		# settled: the generated draft goes away
+		self.reconcile(0.4)
+		self.assertEqual(self.generated(), [])
+		self.assert_manual_untouched()
+
+	def test_refund_never_makes_tax_negative(self):
+		self.reconcile(-2 * MONTHLY_OLD_TAX)
+		self.assertEqual(self.generated(), [(0, 1)])
+		self.assert_manual_untouched()
+
+	def test_refund_after_fiscal_year_end_is_not_booked(self):
+		self.reconcile(-3000, next_due=0)
+		self.assertEqual(self.generated(), [])
+
+	def test_employee_without_arrears_loses_generated_draft(self):
+		self.reconcile(5000)
+		create_adjustment_rows({}, FISCAL_YEAR, [self.employee])
+		self.assertEqual(self.generated(), [])
+		self.assert_manual_untouched()
@@ -0,0 +1,29 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.bootstrap import bootstrap, get_master_data, invalidate_master_data
+
+
+class TestMasterDataBootstrap(FrappeTestCase):
+	def setUp(self):
+		bootstrap()
+
+	def test_steady_state_makes_no_queries(self):
+		get_master_data()
+		queries = []
+		original = frappe.db.sql
+		frappe.db.sql = lambda *args, **kwargs: queries.append(args) or original(*args, **kwargs)
+		try:
+			data = get_master_data()
+		finally:
+			frappe.db.sql = original
+
+		self.assertEqual(queries, [])
+		self.assertTrue(data.investment_component_exists)
+		self.assertIn("Old Regime", data.regime_to_structure)
+
+	def test_invalidation_publishes_new_snapshot(self):
+		before = get_master_data().version
+		invalidate_master_data()
+		frappe.db.after_commit.run()
+		self.assertNotEqual(get_master_data().version, before)
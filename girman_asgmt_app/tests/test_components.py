@@ -0,0 +1,40 @@
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.tax.components import (
+	EARNING,
+	EXEMPTION,
+	INCOME_TAX,
+	PROFESSIONAL_TAX,
+	PROVIDENT_FUND,
+	classify,
+)
+
+
+def fixture_components():
+	"""The Salary Component records shipped in synced_fixtures, by name."""
+	path = frappe.get_app_path("girman_asgmt_app", "synced_fixtures", "salary_component.json")
+	with open(path) as f:
+		return {c["name"]: frappe._dict(c) for c in json.load(f)}
+
+
+class TestComponentClassification(FrappeTestCase):
+	def test_shipped_tax_components(self):
+		components = fixture_components()
+		self.assertEqual(classify(components["Professional Tax"]), PROFESSIONAL_TAX)
+		self.assertEqual(classify(components["DEMO - Professional Tax"]), PROFESSIONAL_TAX)
+		self.assertEqual(classify(components["Income Tax"]), INCOME_TAX)
+		self.assertEqual(classify(components["DEMO - Income Tax (Old Regime)"]), INCOME_TAX)
+		self.assertEqual(classify(components["DEMO - Income Tax (New Regime)"]), INCOME_TAX)
+
+	def test_flag_wins_over_name(self):
+		tds = {"name": "Monthly Withholding", "type": "Deduction", "is_income_tax_component": 1}
+		self.assertEqual(classify(tds), INCOME_TAX)
+
+	def test_name_fallback(self):
+		self.assertEqual(classify({"name": "DEMO - Income Tax (New Regime)", "type": "Deduction"}), INCOME_TAX)
+		self.assertEqual(classify({"name": "DEMO - Provident Fund", "type": "Deduction"}), PROVIDENT_FUND)
+		self.assertEqual(classify({"name": "Investment Exemption", "type": "Deduction"}), EXEMPTION)
+		self.assertEqual(classify({"name": "Income Tax Refund", "type": "Earning"}), EARNING)
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from girman_asgmt_app.events.employee import (
+	_flush_pending_probation,
+	_get_default_probation_days,
+	_queue_probation_update,
+)
+
+
+class TestBulkProbationUpdates(FrappeTestCase):
+	def tearDown(self):
+		frappe.flags.in_import = False
+		frappe.flags.girman_pending_probation = None
+		frappe.flags.girman_uncommitted_probation = None
+		frappe.flags.girman_bulk_probation_days = None
+
+	def test_bulk_import_writes_one_batched_update(self):
+		frappe.flags.in_import = True
+		with patch.object(frappe.db, "bulk_update", wraps=frappe.db.bulk_update) as bulk_update:
+			employees = [
+				make_employee(f"bulk-probation-{i}@example.com", date_of_joining="2025-01-01") for i in range(3)
+			]
+			self.assertEqual(bulk_update.call_count, 0)
+			self.assertEqual(_flush_pending_probation(), 3)
+
+		self.assertEqual(bulk_update.call_count, 1)
+		self.assertEqual(set(bulk_update.call_args.args[1]), set(employees))
+		days = _get_default_probation_days()
+		for employee in employees:
+			self.assertEqual(
+				getdate(frappe.db.get_value("Employee", employee, "probation_end")),
+				getdate(add_days("2025-01-01", days - 1)),
+			)
+
+	def test_rollback_discards_queued_rows(self):
+		frappe.flags.in_import = True
+		doc = frappe.get_doc({"doctype": "Employee", "name": "_T-Probation-Rollback", "date_of_joining": "2025-01-01"})
+		_queue_probation_update(doc)
+		self.assertIn(doc.name, frappe.flags.girman_pending_probation)
+
+		frappe.db.rollback()
+		self.assertEqual(frappe.flags.girman_pending_probation, {})
@@ -0,0 +1,172 @@
+import time
+from unittest.mock import patch
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.events import payroll
+from girman_asgmt_app.events.payroll import (
+	CLAIMED_SLIP_REFRESH_KEY,
+	INVESTMENT_COMPONENT,
+	PENDING_SLIP_REFRESH_KEY,
+	_set_slip_investment_amount,
+	mark_draft_slips_stale,
+	months_remaining_in_fiscal,
+	process_pending_slip_refreshes,
+	prorate_investment_total,
+)
+
+
+class TestInvestmentProration(FrappeTestCase):
+	def test_months_remaining_include_slip_month(self):
+		self.assertEqual(months_remaining_in_fiscal("2025-04-01", "2025-2026"), 12)
+		self.assertEqual(months_remaining_in_fiscal("2025-10-01", "2025-2026"), 6)
+		self.assertEqual(months_remaining_in_fiscal("2026-03-01", "2025-2026"), 1)
+
+	def test_months_remaining_are_clamped(self):
+		self.assertEqual(months_remaining_in_fiscal("2026-05-01", "2025-2026"), 1)
+		self.assertEqual(months_remaining_in_fiscal("2024-01-01", "2025-2026"), 12)
+		self.assertEqual(months_remaining_in_fiscal(None), 12)
+
+	def test_prorate_spreads_total_over_remaining_months(self):
+		self.assertEqual(prorate_investment_total(120000, "2025-04-01", "2025-2026"), 10000)
+		self.assertEqual(prorate_investment_total(120000, "2025-10-01", "2025-2026"), 20000)
+		self.assertEqual(prorate_investment_total(100, "2025-11-01", "2025-2026"), 20)
+		self.assertEqual(prorate_investment_total(1000, "2025-12-01", "2025-2026"), 250)
+		self.assertEqual(prorate_investment_total(0, "2025-10-01", "2025-2026"), 0)
+		self.assertEqual(prorate_investment_total(-5, "2025-10-01", "2025-2026"), 0)
+
+
+class TestDraftSlipRefreshQueue(FrappeTestCase):
+	employee = "_T-Stale-Slip-Employee"
+
+	def setUp(self):
+		frappe.cache().hdel(PENDING_SLIP_REFRESH_KEY, self.employee)
+		frappe.cache().delete_value(CLAIMED_SLIP_REFRESH_KEY)
+
+	def tearDown(self):
+		frappe.cache().hdel(PENDING_SLIP_REFRESH_KEY, self.employee)
+		frappe.cache().delete_value(CLAIMED_SLIP_REFRESH_KEY)
+
+	def due(self):
+		return time.time() - payroll.SLIP_REFRESH_DEBOUNCE_SECONDS - 1
+
+	def pending(self):
+		return {frappe.safe_decode(k) for k in frappe.cache().hgetall(PENDING_SLIP_REFRESH_KEY) or {}}
+
+	def test_marked_only_after_commit(self):
+		mark_draft_slips_stale([self.employee])
+		self.assertNotIn(self.employee, self.pending())
+		frappe.db.after_commit.run()
+		self.assertIn(self.employee, self.pending())
+
+	def test_stale_employee_is_refreshed_once_debounce_elapsed(self):
+		frappe.cache().hset(PENDING_SLIP_REFRESH_KEY, self.employee, time.time())
+		with (
+			patch.object(payroll, "refresh_draft_slip_investments") as refresh,
+			patch.object(frappe.db, "commit"),
+		):
+			process_pending_slip_refreshes()
+			refresh.assert_not_called()
+			self.assertIn(self.employee, self.pending())
+
+			frappe.cache().hset(PENDING_SLIP_REFRESH_KEY, self.employee, self.due())
+			process_pending_slip_refreshes()
+
+		refresh.assert_called_once()
+		self.assertIn(self.employee, refresh.call_args.args[0])
+		self.assertNotIn(self.employee, self.pending())
+
+	def test_edit_marked_during_refresh_is_kept(self):
+		frappe.cache().hset(PENDING_SLIP_REFRESH_KEY, self.employee, self.due())
+
+		def edit_again(employees):
+			frappe.cache().hset(PENDING_SLIP_REFRESH_KEY, self.employee, time.time())
+
+		with (
+			patch.object(payroll, "refresh_draft_slip_investments", side_effect=edit_again) as refresh,
+			patch.object(frappe.db, "commit"),
+		):
+			process_pending_slip_refreshes()
+
+		refresh.assert_called_once()
+		self.assertIn(self.employee, self.pending())
+
+	def test_claim_left_by_a_dead_worker_is_finished(self):
+		frappe.cache().hset(CLAIMED_SLIP_REFRESH_KEY, self.employee, self.due())
+		with (
+			patch.object(payroll, "refresh_draft_slip_investments") as refresh,
+			patch.object(frappe.db, "commit"),
+		):
+			process_pending_slip_refreshes()
+
+		self.assertIn(self.employee, refresh.call_args.args[0])
+		self.assertFalse(frappe.cache().hgetall(CLAIMED_SLIP_REFRESH_KEY))
+
+
+class TestDraftSlipInvestmentAmount(FrappeTestCase):
+	def setUp(self):
+		employee = make_employee("slip-investment-refresh@example.com", company="_Test Company")
+		slip = frappe.get_doc(
+			{
+				"doctype": "Salary Slip",
+				"employee": employee,
+				"company": "_Test Company",
+				"currency": "INR",
+				"exchange_rate": 1,
+				"payroll_frequency": "Monthly",
+				"posting_date": "2025-10-31",
+				"start_date": "2025-10-01",
+				"end_date": "2025-10-31",
+				"earnings": [{"salary_component": "Basic Salary", "abbr": "BS", "amount": 50000}],
+				"deductions": [{"salary_component": "Professional Tax", "abbr": "PT", "amount": 200}],
+				"gross_pay": 50000,
+				"base_gross_pay": 50000,
+			}
+		)
+		# a draft as HRMS would have saved it, without running the slip's validate
+		slip.set_new_name()
+		slip.set_parent_in_children()
+		slip.db_insert()
+		for row in slip.get_all_children():
+			row.db_insert()
+		self.slip = slip.name
+
+	def totals(self):
+		return frappe.db.get_value(
+			"Salary Slip",
+			self.slip,
+			["total_deduction", "net_pay", "rounded_total", "base_net_pay", "base_rounded_total", "total_in_words"],
+			as_dict=True,
+		)
+
+	def investment_rows(self):
+		return frappe.get_all(
+			"Salary Detail",
+			filters={"parent": self.slip, "salary_component": INVESTMENT_COMPONENT},
+			pluck="amount",
+		)
+
+	def test_amount_change_recomputes_derived_totals(self):
+		self.assertTrue(_set_slip_investment_amount(self.slip, 1000))
+		self.assertEqual(self.investment_rows(), [1000])
+		totals = self.totals()
+		self.assertEqual(totals.total_deduction, 1200)
+		self.assertEqual((totals.net_pay, totals.rounded_total), (48800, 48800))
+		self.assertEqual((totals.base_net_pay, totals.base_rounded_total), (48800, 48800))
+		self.assertIn("Forty Eight Thousand", totals.total_in_words)
+
+		self.assertTrue(_set_slip_investment_amount(self.slip, 1500))
+		self.assertEqual(self.investment_rows(), [1500])
+		self.assertEqual(self.totals().net_pay, 48300)
+
+	def test_unchanged_amount_is_not_written(self):
+		_set_slip_investment_amount(self.slip, 1000)
+		self.assertFalse(_set_slip_investment_amount(self.slip, 1000))
+
+	def test_zero_amount_removes_the_row(self):
+		_set_slip_investment_amount(self.slip, 1000)
+		self.assertTrue(_set_slip_investment_amount(self.slip, 0))
+		self.assertEqual(self.investment_rows(), [])
+		self.assertEqual((self.totals().total_deduction, self.totals().net_pay), (200, 49800))
@@ -0,0 +1,115 @@
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app import payroll_shards
+from girman_asgmt_app.payroll_shards import (
+	DONE,
+	PENDING,
+	SHARD_RUNS_KEY,
+	SHARD_STATUS_KEY,
+	STALE_SHARD_RUN_SECONDS,
+	_clear_run,
+	_finish_shard,
+	create_slip_shard,
+	fail_stale_shard_runs,
+)
+
+PAYROLL_ENTRY = "_T-Sharded-Payroll"
+
+
+class TestSlipShards(FrappeTestCase):
+	def setUp(self):
+		_clear_run(PAYROLL_ENTRY)
+
+	def tearDown(self):
+		_clear_run(PAYROLL_ENTRY)
+
+	def queue_run(self, shards, queued_at=None):
+		status_key = SHARD_STATUS_KEY.format(PAYROLL_ENTRY)
+		for i in range(shards):
+			frappe.cache().hset(status_key, str(i), PENDING)
+		frappe.cache().hset(SHARD_RUNS_KEY, PAYROLL_ENTRY, queued_at or time.time())
+		return status_key
+
+	def test_crashed_shard_reports_its_unfinished_employees(self):
+		resolved = {f"_T-Emp-{i}": ("Old Regime", "Structure") for i in range(3)}
+		with (
+			patch.object(payroll_shards.frappe, "get_doc", side_effect=frappe.QueryTimeoutError),
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe.db, "rollback"),
+			patch.object(payroll_shards, "_finish_shard") as finish,
+		):
+			created = create_slip_shard(PAYROLL_ENTRY, 0, {}, resolved, {})
+
+		self.assertEqual(created, 0)
+		finish.assert_called_once_with(PAYROLL_ENTRY, 0, list(resolved))
+
+	def test_last_shard_marks_entry_failed_and_allows_rerun(self):
+		status_key = self.queue_run(2)
+
+		with (
+			patch.object(frappe.db, "set_value") as set_value,
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe, "publish_realtime"),
+		):
+			_finish_shard(PAYROLL_ENTRY, 0, [])
+			set_value.assert_not_called()
+			_finish_shard(PAYROLL_ENTRY, 1, ["_T-Emp-1"])
+
+		values = set_value.call_args.args[2]
+		self.assertEqual(values["status"], "Failed")
+		self.assertEqual(values["salary_slips_created"], 0)
+		self.assertIn("_T-Emp-1", values["error_message"])
+		self.assertFalse(frappe.cache().hgetall(status_key))
+
+	def test_only_the_last_increment_finalises(self):
+		status_key = self.queue_run(2)
+		# shard 1 has written its status but not yet incremented when shard 0 reads them all
+		frappe.cache().hset(status_key, "1", f"{DONE}:")
+
+		with (
+			patch.object(frappe.db, "set_value") as set_value,
+			patch.object(frappe.db, "commit"),
+			patch.object(frappe, "publish_realtime"),
+		):
+			_finish_shard(PAYROLL_ENTRY, 0, [])
+			set_value.assert_not_called()
+			_finish_shard(PAYROLL_ENTRY, 1, [])
+
+		set_value.assert_called_once()
+		self.assertEqual(set_value.call_args.args[2]["status"], "Submitted")
+
+	def test_stale_run_is_failed(self):
+		status_key = self.queue_run(2, queued_at=time.time() - STALE_SHARD_RUN_SECONDS - 60)
+		frappe.cache().hset(status_key, "0", f"{DONE}:")
+
+		with (
+			patch.object(frappe.db, "get_value", return_value="Queued"),
+			patch.object(frappe.db, "set_value") as set_value,
+			patch.object(frappe.db, "commit"),
+		):
+			fail_stale_shard_runs()
+
+		values = set_value.call_args.args[2]
+		self.assertEqual(values["status"], "Failed")
+		self.assertEqual(values["salary_slips_created"], 0)
+		self.assertIn("1", values["error_message"])
+		self.assertFalse(frappe.cache().hgetall(status_key))
+		self.assertFalse(frappe.cache().hexists(SHARD_RUNS_KEY, PAYROLL_ENTRY))
+
+		# the lost shard turning up later does not overwrite the outcome
+		with patch.object(frappe.db, "set_value") as set_value:
+			_finish_shard(PAYROLL_ENTRY, 1, [])
+		set_value.assert_not_called()
+
+	def test_recent_run_is_left_alone(self):
+		status_key = self.queue_run(2)
+
+		with patch.object(frappe.db, "set_value") as set_value:
+			fail_stale_shard_runs()
+
+		set_value.assert_not_called()
+		self.assertEqual(len(frappe.cache().hgetall(status_key)), 2)
@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.girman_asgmt_app.dashboard_chart_source.applicants_per_source_rollup.applicants_per_source_rollup import (
+	get_rollup_data,
+)
+from girman_asgmt_app.replica import ReplicaWriteError, on_replica, read_only, write_guard
+
+TOUCH_TODO = "update `tabToDo` set description = description where 1 = 0"
+
+
+class TestWriteGuard(FrappeTestCase):
+	def test_reads_are_allowed(self):
+		with write_guard():
+			self.assertTrue(frappe.db.sql("select 1"))
+
+	def test_writes_fail_loudly(self):
+		with write_guard():
+			with self.assertRaises(ReplicaWriteError):
+				frappe.db.sql(TOUCH_TODO)
+
+	def test_guard_is_removed_after_block(self):
+		with write_guard():
+			pass
+		frappe.db.sql(TOUCH_TODO)
+
+	def test_nested_block_keeps_guard(self):
+		with write_guard():
+			with write_guard():
+				pass
+			with self.assertRaises(ReplicaWriteError):
+				frappe.db.sql(TOUCH_TODO)
+		frappe.db.sql(TOUCH_TODO)
+
+	def test_decorator_guards_the_call(self):
+		@read_only
+		def touch():
+			frappe.db.sql(TOUCH_TODO)
+
+		self.assertRaises(ReplicaWriteError, touch)
+		frappe.db.sql(TOUCH_TODO)
+
+
+class FakeReplica:
+	"""Stands in for the replica connection: records every query and answers reads from the primary."""
+
+	def __init__(self, primary):
+		self.primary = primary
+		self.queries = []
+
+	def sql(self, query, *args, **kwargs):
+		self.queries.append(str(query))
+		if str(query).startswith("set session"):
+			# must not reach the primary: it would make the test transaction read only
+			return ()
+		return self.primary.sql(query, *args, **kwargs)
+
+	def close(self):
+		pass
+
+	def __getattr__(self, name):
+		return getattr(self.primary, name)
+
+
+class TestReplicaRouting(FrappeTestCase):
+	def setUp(self):
+		self.primary = frappe.local.db
+		self.replica = None
+
+	def tearDown(self):
+		frappe.local.db = self.primary
+		for attr in ("primary_db", "replica_db"):
+			if hasattr(frappe.local, attr):
+				delattr(frappe.local, attr)
+
+	def connect_replica(self):
+		# what frappe.connect_replica does, minus the second database server
+		self.replica = FakeReplica(frappe.local.db)
+		frappe.local.primary_db = frappe.local.db
+		frappe.local.replica_db = self.replica
+		frappe.local.db = self.replica
+		return True
+
+	def route(self, read_from_replica):
+		return (
+			patch.dict(frappe.conf, {"read_from_replica": read_from_replica}),
+			patch("frappe.connect_replica", side_effect=self.connect_replica),
+		)
+
+	def test_chart_source_reads_from_replica(self):
+		conf, connect = self.route(1)
+		with conf, connect:
+			get_rollup_data({})
+
+		self.assertEqual(self.replica.queries[0], "set session transaction read only")
+		self.assertTrue(any("tabApplicant Source Rollup" in q for q in self.replica.queries))
+		# the primary is back once the call returns
+		self.assertIs(frappe.local.db, self.primary)
+		self.assertFalse(on_replica())
+
+	def test_writes_on_replica_raise(self):
+		@read_only
+		def touch():
+			self.assertTrue(on_replica())
+			frappe.db.sql(TOUCH_TODO)
+
+		conf, connect = self.route(1)
+		with conf, connect:
+			self.assertRaises(ReplicaWriteError, touch)
+
+		self.assertNotIn(TOUCH_TODO, self.replica.queries)
+		self.assertIs(frappe.local.db, self.primary)
+
+	def test_without_replica_reads_stay_on_primary(self):
+		conf, connect = self.route(0)
+		with conf, connect as connect_replica:
+			get_rollup_data({})
+
+		connect_replica.assert_not_called()
+		self.assertIsNone(self.replica)
+		self.assertIs(frappe.local.db, self.primary)
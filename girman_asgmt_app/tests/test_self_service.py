@@ -0,0 +1,90 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from girman_asgmt_app.tax.self_service import (
+	CACHE_KEY,
+	get_regime_comparison,
+	invalidate_all,
+	invalidate_employees,
+)
+from girman_asgmt_app.tests.test_tax_projection import COMPANY, make_tax_component
+
+EMPLOYEE = "_Test Portal Employee"
+
+
+def projection_row(tax_old=1000, tax_new=500):
+	return frappe._dict(
+		regime="New Regime",
+		projected_gross=1200000,
+		exemptions=0,
+		ytd_tds=0,
+		tax_old=tax_old,
+		tax_new=tax_new,
+	)
+
+
+class TestRegimeComparisonCache(FrappeTestCase):
+	def setUp(self):
+		frappe.cache().hdel(CACHE_KEY, EMPLOYEE)
+
+	def compute(self, *rows):
+		"""Patch the projection to return rows in turn; returns the mock to count the calls."""
+		return patch(
+			"girman_asgmt_app.tax.self_service.project_tax", side_effect=[[row] for row in rows]
+		)
+
+	def commit_callbacks(self):
+		frappe.db.after_commit.run()
+
+	def test_cached_until_employee_is_invalidated(self):
+		with self.compute(projection_row(1000), projection_row(2000)) as project:
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 1000)
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 1000)
+			self.assertEqual(project.call_count, 1)
+
+			invalidate_employees([EMPLOYEE])
+			# nothing changes until the invalidating transaction commits
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 1000)
+			self.commit_callbacks()
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 2000)
+			self.assertEqual(project.call_count, 2)
+
+	def test_write_after_invalidation_is_not_served(self):
+		def stale_projection(*args, **kwargs):
+			# the employee's data changes and commits while this request is computing
+			invalidate_employees([EMPLOYEE])
+			self.commit_callbacks()
+			return [projection_row(1000)]
+
+		with patch("girman_asgmt_app.tax.self_service.project_tax", side_effect=stale_projection):
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 1000)
+
+		with self.compute(projection_row(2000)) as project:
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 2000)
+			self.assertEqual(project.call_count, 1)
+
+	def test_invalidate_all(self):
+		with self.compute(projection_row(1000), projection_row(2000), projection_row(3000)):
+			get_regime_comparison(EMPLOYEE, COMPANY)
+
+			# without a document (after_migrate) the bump is immediate
+			invalidate_all()
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 2000)
+
+			# as a document hook it waits for the commit
+			invalidate_all(frappe._dict(doctype="Salary Component"))
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 2000)
+			self.commit_callbacks()
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 3000)
+
+	def test_salary_component_change_invalidates(self):
+		component = make_tax_component()
+		self.commit_callbacks()
+		with self.compute(projection_row(1000), projection_row(2000)) as project:
+			get_regime_comparison(EMPLOYEE, COMPANY)
+			frappe.get_doc("Salary Component", component).save()
+			self.commit_callbacks()
+			self.assertEqual(get_regime_comparison(EMPLOYEE, COMPANY).tax_old, 2000)
+			self.assertEqual(project.call_count, 2)
@@ -0,0 +1,37 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import get_first_day, today
+
+from girman_asgmt_app.events.payroll import adjust_salary_slip_with_investments
+from girman_asgmt_app.events.tax_regime import (
+	ensure_salary_structure_matches_regime,
+	set_salary_structure_for_employee,
+)
+from girman_asgmt_app.slip_context import get_lookup_count, reset_lookup_count
+
+
+class TestSlipContext(FrappeTestCase):
+	def setUp(self):
+		employee = frappe.db.get_value("Employee", {"status": "Active"}, "name")
+		if not employee:
+			self.skipTest("needs an active Employee")
+		self.slip = frappe.get_doc(
+			{"doctype": "Salary Slip", "employee": employee, "start_date": get_first_day(today())}
+		)
+		reset_lookup_count()
+
+	def run_hooks(self):
+		ensure_salary_structure_matches_regime(self.slip)
+		adjust_salary_slip_with_investments(self.slip)
+		set_salary_structure_for_employee(self.slip)
+
+	def test_one_lookup_per_slip(self):
+		self.run_hooks()
+		self.run_hooks()
+		self.assertEqual(get_lookup_count(), 1)
+
+	def test_rebuilt_when_period_changes(self):
+		self.run_hooks()
+		self.slip.start_date = frappe.utils.add_months(self.slip.start_date, -1)
+		self.run_hooks()
+		self.assertEqual(get_lookup_count(), 2)
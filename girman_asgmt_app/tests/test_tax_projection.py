@@ -0,0 +1,180 @@
+from datetime import date
+
+import frappe
+from erpnext.setup.doctype.employee.test_employee import make_employee
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_months, get_last_day
+
+from girman_asgmt_app.tax.components import clear_component_class_cache
+from girman_asgmt_app.tax.projection import (
+	fiscal_year_bounds,
+	get_ytd_totals,
+	months_remaining,
+	project_tax,
+	unpaid_months,
+)
+from girman_asgmt_app.tax.slabs import NEW_REGIME, OLD_REGIME, annual_tax, tax_for_regime, taxable_incomes
+
+COMPANY = "_Test Company"
+FISCAL_YEAR = "2025-2026"
+TAX_COMPONENT = "Income Tax"
+MONTHLY_GROSS = 100000
+# Old regime on 1200000 a year: (1200000 - 50000) taxable -> 157500 + 4% cess
+ANNUAL_OLD_TAX = 163800
+MONTHLY_OLD_TAX = ANNUAL_OLD_TAX / 12
+
+
+class TestTaxSlabs(FrappeTestCase):
+	def test_exemptions_only_reduce_old_regime_income(self):
+		self.assertEqual(taxable_incomes([1000000], [150000], OLD_REGIME), [800000])
+		self.assertEqual(taxable_incomes([1000000], [150000], NEW_REGIME), [925000])
+		self.assertEqual(taxable_incomes([40000], [0], OLD_REGIME), [0.0])
+
+	def test_old_regime_bands_and_cess(self):
+		# 250000 at 5% + 300000 at 20%, plus 4% cess
+		self.assertEqual(annual_tax([800000], OLD_REGIME), [75400])
+		self.assertEqual(annual_tax([510000], OLD_REGIME), [15080])
+
+	def test_new_regime_bands_and_cess(self):
+		# 400000 at 5% + 400000 at 10% + 325000 at 15%, plus 4% cess
+		self.assertEqual(annual_tax([1525000], NEW_REGIME), [113100])
+
+	def test_rebate_up_to_limit(self):
+		self.assertEqual(annual_tax([500000, 1200000], OLD_REGIME), [0.0, 179400])
+		self.assertEqual(annual_tax([500000, 1200000], NEW_REGIME), [0.0, 0.0])
+
+	def test_tax_for_regime_is_elementwise(self):
+		self.assertEqual(
+			tax_for_regime([1000000, 1600000], [150000, 0], OLD_REGIME),
+			annual_tax([800000], OLD_REGIME) + annual_tax([1550000], OLD_REGIME),
+		)
+
+
+class TestProjectionMonths(FrappeTestCase):
+	fy_end = date(2026, 3, 31)
+
+	def test_fiscal_year_bounds(self):
+		self.assertEqual(fiscal_year_bounds("2025-2026"), (date(2025, 4, 1), self.fy_end))
+
+	def test_months_remaining_include_current_month(self):
+		self.assertEqual(months_remaining(date(2025, 4, 1), self.fy_end), 12)
+		self.assertEqual(months_remaining(date(2025, 10, 19), self.fy_end), 6)
+		self.assertEqual(months_remaining(date(2026, 3, 31), self.fy_end), 1)
+
+	def test_current_month_counted_once(self):
+		as_of = date(2025, 10, 19)
+		# October's slip not yet submitted: October is still to be paid
+		self.assertEqual(unpaid_months(as_of, self.fy_end), 6)
+		self.assertEqual(unpaid_months(as_of, self.fy_end, date(2025, 9, 1)), 6)
+		# October's slip is in the YTD totals: only November-March remain
+		self.assertEqual(unpaid_months(as_of, self.fy_end, date(2025, 10, 1)), 5)
+		self.assertEqual(unpaid_months(date(2026, 3, 31), self.fy_end, date(2026, 3, 1)), 0)
+
+
+def make_tax_component(name="Income Tax"):
+	if not frappe.db.exists("Salary Component", name):
+		frappe.get_doc(
+			{
+				"doctype": "Salary Component",
+				"salary_component": name,
+				"salary_component_abbr": "IT",
+				"type": "Deduction",
+				"is_income_tax_component": 1,
+			}
+		).insert()
+	clear_component_class_cache()
+	return name
+
+
+def make_submitted_slip(employee, start, gross, tds, docstatus=1):
+	"""A submitted slip as HRMS stores it (written directly, the slip's own validate is not under test)."""
+	slip = frappe.get_doc(
+		{
+			"doctype": "Salary Slip",
+			"employee": employee,
+			"company": COMPANY,
+			"posting_date": get_last_day(start),
+			"start_date": start,
+			"end_date": get_last_day(start),
+			"gross_pay": gross,
+			"docstatus": docstatus,
+			"earnings": [{"salary_component": "Basic Salary", "abbr": "BS", "amount": gross}],
+			"deductions": [{"salary_component": TAX_COMPONENT, "abbr": "IT", "amount": tds}],
+		}
+	)
+	slip.set_new_name()
+	slip.set_parent_in_children()
+	slip.db_insert()
+	for row in slip.get_all_children():
+		row.docstatus = docstatus
+		row.db_insert()
+	return slip.name
+
+
+def make_assignment(employee, base, from_date="2025-04-01"):
+	doc = frappe.get_doc(
+		{
+			"doctype": "Salary Structure Assignment",
+			"employee": employee,
+			"company": COMPANY,
+			"salary_structure": "_T-Projection Structure",
+			"from_date": from_date,
+			"base": base,
+			"docstatus": 1,
+		}
+	)
+	doc.set_new_name()
+	doc.db_insert()
+
+
+class TestProjectTax(FrappeTestCase):
+	def setUp(self):
+		make_tax_component()
+		# switched to the New regime in October after six months of Old-regime TDS
+		self.switched = make_employee("projection-switched@example.com", company=COMPANY)
+		self.old = make_employee("projection-old@example.com", company=COMPANY)
+		frappe.db.set_value("Employee", self.switched, "tax_regime_preference", NEW_REGIME)
+		frappe.db.set_value("Employee", self.old, "tax_regime_preference", OLD_REGIME)
+		for employee in (self.switched, self.old):
+			make_assignment(employee, MONTHLY_GROSS)
+			for k in range(6):
+				make_submitted_slip(employee, add_months("2025-04-01", k), MONTHLY_GROSS, MONTHLY_OLD_TAX)
+		# October: paid for the switched employee, cancelled for the other one
+		make_submitted_slip(self.switched, "2025-10-01", MONTHLY_GROSS, 0)
+		make_submitted_slip(self.old, "2025-10-01", MONTHLY_GROSS, MONTHLY_OLD_TAX, docstatus=2)
+
+	def project(self):
+		rows = project_tax(
+			COMPANY,
+			fiscal_year=FISCAL_YEAR,
+			as_of="2025-10-19",
+			employee_filters={"name": ("in", [self.switched, self.old])},
+		)
+		return {r.employee: r for r in rows}
+
+	def test_ytd_totals_count_submitted_slips_up_to_as_of(self):
+		totals = get_ytd_totals(COMPANY, "2025-04-01", "2025-10-19", [self.switched, self.old])
+		self.assertEqual((totals[self.switched].gross, totals[self.switched].months), (7 * MONTHLY_GROSS, 7))
+		self.assertEqual(totals[self.switched].tds, 6 * MONTHLY_OLD_TAX)
+		self.assertEqual((totals[self.old].gross, totals[self.old].months), (6 * MONTHLY_GROSS, 6))
+		self.assertEqual(str(totals[self.switched].last_start), "2025-10-01")
+
+	def test_projection_after_mid_year_regime_switch(self):
+		row = self.project()[self.switched]
+		self.assertEqual(row.remaining_months, 5)
+		self.assertEqual(row.projected_gross, 12 * MONTHLY_GROSS)
+		self.assertEqual((row.tax_old, row.tax_new), (ANNUAL_OLD_TAX, 0))
+		# the New regime falls within the 87A rebate: the Old-regime TDS was all excess
+		self.assertEqual(row.regime, NEW_REGIME)
+		self.assertEqual(row.projected_tax, 0)
+		self.assertEqual(row.shortfall, -6 * MONTHLY_OLD_TAX)
+		self.assertEqual(row.monthly_tds, 0)
+
+	def test_projection_spreads_shortfall_over_unpaid_months(self):
+		row = self.project()[self.old]
+		self.assertEqual(row.remaining_months, 6)
+		self.assertEqual(row.projected_gross, 12 * MONTHLY_GROSS)
+		self.assertEqual(row.projected_tax, ANNUAL_OLD_TAX)
+		self.assertEqual(row.ytd_tds, 6 * MONTHLY_OLD_TAX)
+		self.assertEqual(row.shortfall, 6 * MONTHLY_OLD_TAX)
+		self.assertEqual(row.monthly_tds, MONTHLY_OLD_TAX)